@@ -0,0 +1,45 @@
+"""Shared bootstrap for the standalone benchmark scripts.
+
+Each script runs against a throwaway test database so it never touches
+db.sqlite3. Point DATABASE_URL + USE_REMOTE_DB at a local Postgres to
+benchmark there instead.
+"""
+import os
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "expense_tracker.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db import connection  # noqa: E402
+from django.test.utils import CaptureQueriesContext, setup_test_environment  # noqa: E402
+
+
+@contextmanager
+def benchmark_database():
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+@contextmanager
+def measure():
+    """Collect wall time and query count for the enclosed block."""
+    result = {}
+    with CaptureQueriesContext(connection) as ctx:
+        started = time.perf_counter()
+        yield result
+        result["seconds"] = round(time.perf_counter() - started, 4)
+    result["queries"] = len(ctx.captured_queries)
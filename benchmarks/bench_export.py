@@ -0,0 +1,128 @@
+"""Throughput and peak RSS of the transactions CSV export.
+
+    python benchmarks/bench_export.py [--rows 10000 100000 1000000] [--buffered]
+
+``--buffered`` also runs the previous implementation (model instances,
+get_*_display() per row, whole body in one HttpResponse) for comparison.
+"""
+import argparse
+import csv
+import gc
+import json
+import resource
+import time
+from datetime import date, timedelta
+
+from _setup import benchmark_database
+
+from django.contrib.auth.models import User
+from django.http import HttpResponse
+from django.test import Client
+
+from tracker.models import Transaction
+from tracker.services.money import format_rupees
+
+SEED_BATCH = 5000
+
+
+def _reset_peak_rss() -> None:
+    # Linux only: lets each run report its own high-water mark.
+    try:
+        with open("/proc/self/clear_refs", "w") as handle:
+            handle.write("5")
+    except OSError:
+        pass
+
+
+def _peak_rss_mb() -> float:
+    try:
+        with open("/proc/self/status") as handle:
+            for line in handle:
+                if line.startswith("VmHWM:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+def seed(user, rows: int) -> None:
+    start = date(2015, 1, 1)
+    categories = [choice[0] for choice in Transaction.CATEGORY_CHOICES]
+    for offset in range(0, rows, SEED_BATCH):
+        Transaction.objects.bulk_create([
+            Transaction(
+                user=user,
+                type="expense" if idx % 5 else "income",
+                amount=100 + idx % 90000,
+                category=categories[idx % len(categories)],
+                payment_mode="cash" if idx % 3 == 0 else "online",
+                date=start + timedelta(days=idx % 4000),
+                description=f"Synthetic row {idx}",
+            )
+            for idx in range(offset, min(offset + SEED_BATCH, rows))
+        ])
+
+
+def buffered_export(user) -> HttpResponse:
+    response = HttpResponse(content_type="text/csv")
+    writer = csv.writer(response)
+    writer.writerow(["Date", "Type", "Category", "Payment", "Description", "Amount"])
+    for item in Transaction.objects.filter(user=user).order_by("date", "id"):
+        writer.writerow([
+            item.date.isoformat(),
+            item.get_type_display(),
+            item.get_category_display(),
+            item.get_payment_mode_display(),
+            item.description,
+            format_rupees(item.amount),
+        ])
+    return response
+
+
+def _timed(rows: int, mode: str, consume) -> dict:
+    gc.collect()
+    _reset_peak_rss()
+    started = time.perf_counter()
+    size = consume()
+    seconds = time.perf_counter() - started
+    return {
+        "mode": mode,
+        "rows": rows,
+        "seconds": round(seconds, 3),
+        "rows_per_second": round(rows / seconds),
+        "bytes": size,
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+def run(rows: int, buffered: bool) -> list:
+    user = User.objects.create_user(username=f"bench-export-{rows}", password="x")
+    seed(user, rows)
+    client = Client()
+    client.force_login(user)
+
+    def streamed():
+        response = client.get("/export/transactions/")
+        return sum(len(chunk) for chunk in response.streaming_content)
+
+    results = [_timed(rows, "streaming", streamed)]
+    if buffered:
+        results.append(_timed(rows, "buffered", lambda: len(buffered_export(user).content)))
+    Transaction.objects.filter(user=user).delete()
+    user.delete()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--buffered", action="store_true")
+    args = parser.parse_args()
+
+    with benchmark_database():
+        results = [result for count in args.rows for result in run(count, args.buffered)]
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
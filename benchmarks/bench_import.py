@@ -0,0 +1,82 @@
+"""Throughput and peak RSS of the streaming CSV import.
+
+    python benchmarks/bench_import.py [--rows 10000 100000 1000000] [--chunk-size 2000]
+
+Writes a synthetic export-format file to a temp directory (a third of the
+rows with blank categories, so auto-categorization is exercised) and
+imports it through ``import_transactions``.
+"""
+import argparse
+import csv
+import gc
+import json
+import os
+import tempfile
+import time
+from datetime import date, timedelta
+
+from _setup import benchmark_database
+from bench_export import _peak_rss_mb, _reset_peak_rss
+
+from django.contrib.auth.models import User
+from django.test import override_settings
+
+from tracker.services.exports import TRANSACTION_CSV_HEADER
+from tracker.services.imports import import_transactions, text_lines
+
+MERCHANTS = ["Swiggy", "Uber", "Amazon", "Landlord", "Corner store", "Metro card", "Payroll", "Chai point"]
+CATEGORIES = ["Food", "Transport", "Shopping", "Rent", "Other", "Transport", "Salary", "Food"]
+
+
+def write_csv(path: str, rows: int) -> None:
+    start = date(2015, 1, 1)
+    with open(path, "w", newline="", encoding="utf-8") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(TRANSACTION_CSV_HEADER)
+        for idx in range(rows):
+            pick = idx % len(MERCHANTS)
+            writer.writerow([
+                (start + timedelta(days=idx % 4000)).isoformat(),
+                "Income" if pick == 6 else "Expense",
+                "" if idx % 3 == 0 else CATEGORIES[pick],
+                "Cash Money" if idx % 4 == 0 else "Online Money",
+                f"{MERCHANTS[pick]} {idx % 997}",
+                f"{100 + idx % 9000}.{idx % 100:02d}",
+            ])
+
+
+def run(rows: int, chunk_size: int, directory: str) -> dict:
+    path = os.path.join(directory, f"import-{rows}.csv")
+    write_csv(path, rows)
+    user = User.objects.create(username=f"bench-import-{rows}")
+    gc.collect()
+    _reset_peak_rss()
+    started = time.perf_counter()
+    # DEBUG keeps the SQL of the last 9000 queries (each bulk INSERT is ~8 KB).
+    with open(path, "rb") as handle, override_settings(DEBUG=False):
+        result = import_transactions(user, text_lines(handle), chunk_size=chunk_size)
+    seconds = time.perf_counter() - started
+    return {
+        "rows": rows,
+        "created": result.created,
+        "auto_categorized": result.auto_categorized,
+        "seconds": round(seconds, 3),
+        "rows_per_second": round(rows / seconds),
+        "file_mb": round(os.path.getsize(path) / 1e6, 1),
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--chunk-size", type=int, default=2000)
+    args = parser.parse_args()
+
+    with benchmark_database(), tempfile.TemporaryDirectory() as directory:
+        results = [run(count, args.chunk_size, directory) for count in args.rows]
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
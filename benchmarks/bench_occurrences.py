@@ -0,0 +1,46 @@
+"""Stepwise vs vectorized occurrence generation (no database access).
+
+    python benchmarks/bench_occurrences.py [--years 10] [--repeat 20]
+"""
+import argparse
+import json
+import timeit
+from datetime import date
+
+from _setup import ROOT  # noqa: F401  (bootstraps Django)
+
+from tracker.models import RecurringTransaction
+from tracker.services.recurring import _stepwise_occurrence_dates, iter_occurrence_dates
+
+CASES = {
+    "daily": RecurringTransaction(start_date=date(2000, 1, 1), repeat="daily"),
+    "weekdays": RecurringTransaction(start_date=date(2000, 1, 1), repeat="weekly", weekdays="0,1,2,3,4"),
+    "monthly": RecurringTransaction(start_date=date(1990, 1, 31), repeat="monthly"),
+}
+
+
+def run(name: str, years: int, repeat: int) -> dict:
+    series = CASES[name]
+    start, end = date(2026 - years, 1, 1), date(2025, 12, 31)
+    stepwise = min(timeit.repeat(lambda: list(_stepwise_occurrence_dates(series, start, end)), number=1, repeat=repeat))
+    vectorized = min(timeit.repeat(lambda: iter_occurrence_dates(series, start, end), number=1, repeat=repeat))
+    return {
+        "case": name,
+        "years": years,
+        "occurrences": len(iter_occurrence_dates(series, start, end)),
+        "stepwise_ms": round(stepwise * 1000, 3),
+        "vectorized_ms": round(vectorized * 1000, 3),
+        "speedup": round(stepwise / vectorized, 1) if vectorized else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--years", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    print(json.dumps([run(name, args.years, args.repeat) for name in CASES], indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Cost of catching up recurring series after a one-year gap.
+
+    python benchmarks/bench_recurring.py [--series 1 10 100] [--days 365]
+"""
+import argparse
+import json
+from datetime import date, timedelta
+
+from _setup import benchmark_database, measure
+
+from django.contrib.auth.models import User
+
+from tracker.models import RecurringTransaction, Transaction
+from tracker.services.recurring import generate_recurring_transactions
+
+
+def run(series_count: int, days: int) -> dict:
+    user = User.objects.create_user(username=f"bench-recurring-{series_count}", password="x")
+    start = date(2025, 1, 1)
+    RecurringTransaction.objects.bulk_create([
+        RecurringTransaction(
+            user=user,
+            type="expense",
+            amount=10 + idx,
+            category="food",
+            start_date=start,
+            repeat="daily",
+        )
+        for idx in range(series_count)
+    ])
+    with measure() as result:
+        created = generate_recurring_transactions(user, start + timedelta(days=days - 1))
+    result.update({"series": series_count, "days": days, "created": created})
+    Transaction.objects.filter(user=user).delete()
+    user.delete()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--series", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--days", type=int, default=365)
+    args = parser.parse_args()
+
+    with benchmark_database():
+        results = [run(count, args.days) for count in args.series]
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""SendGrid request and connection counts per batch of emails, against a local stub.
+
+    python benchmarks/bench_sendgrid.py [--emails 1000]
+
+Modes: ``per_message_new_connection`` (the old behaviour: a fresh client
+per email), ``per_message_pooled`` (send_app_email on the shared keep-alive
+client) and ``bulk`` (send_bulk_email with personalizations).
+"""
+import argparse
+import json
+import time
+
+from _setup import ROOT  # noqa: F401  (bootstraps Django)
+
+import requests
+from django.test import override_settings
+
+from tracker.services.email_sender import BulkEmail, send_app_email, send_bulk_email
+from tracker.stub_servers import StubSendGridServer
+
+
+def _fresh_connection_send(url: str, to_email: str) -> None:
+    payload = {"personalizations": [{"to": [{"email": to_email}]}], "subject": "S", "content": []}
+    with requests.Session() as session:
+        session.post(url, json=payload, timeout=10)
+
+
+def run(mode: str, emails: int) -> dict:
+    recipients = [f"user{idx}@example.com" for idx in range(emails)]
+    with StubSendGridServer() as stub, override_settings(
+        SENDGRID_API_URL=stub.url, SENDGRID_API_KEY="bench", DEFAULT_FROM_EMAIL="bench@example.org", USE_GMAIL_SMTP=False,
+    ):
+        started = time.perf_counter()
+        if mode == "per_message_new_connection":
+            for to_email in recipients:
+                _fresh_connection_send(stub.url, to_email)
+        elif mode == "per_message_pooled":
+            for to_email in recipients:
+                send_app_email(to_email, "Your month", "Body")
+        else:
+            send_bulk_email([BulkEmail(to_email, "Your month", "Spent -amount-", {"-amount-": "₹1.00"}) for to_email in recipients])
+        seconds = time.perf_counter() - started
+    return {
+        "mode": mode,
+        "emails": emails,
+        "requests": stub.requests,
+        "connections": stub.connections,
+        "requests_saved_per_1000": round((emails - stub.requests) * 1000 / emails),
+        "seconds": round(seconds, 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--emails", type=int, default=1000)
+    args = parser.parse_args()
+    modes = ["per_message_new_connection", "per_message_pooled", "bulk"]
+    print(json.dumps([run(mode, args.emails) for mode in modes], indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""SMTP messages per second, per-message connections vs one persistent session.
+
+    python benchmarks/bench_smtp.py [--emails 500]
+
+Runs against the local plain-text stub (no TLS, no AUTH), so it only
+measures the TCP/SMTP handshake saved; against a real relay the per-message
+STARTTLS + login makes the gap considerably wider.
+"""
+import argparse
+import json
+import time
+
+from _setup import ROOT  # noqa: F401  (bootstraps Django)
+
+from django.test import override_settings
+
+from tracker.services.email_sender import BulkEmail, SMTPSession, _send_via_smtp, send_bulk_email
+from tracker.stub_servers import StubSMTPServer
+
+
+def run(mode: str, emails: int) -> dict:
+    recipients = [f"user{idx}@example.com" for idx in range(emails)]
+    with StubSMTPServer() as stub, override_settings(
+        EMAIL_BACKEND="django.core.mail.backends.smtp.EmailBackend",
+        EMAIL_HOST="127.0.0.1",
+        EMAIL_PORT=stub.port,
+        EMAIL_USE_TLS=False,
+        EMAIL_USE_SSL=False,
+        EMAIL_HOST_USER="",
+        EMAIL_HOST_PASSWORD="",
+        DEFAULT_FROM_EMAIL="bench@example.org",
+        USE_GMAIL_SMTP=True,
+        SENDGRID_API_KEY="",
+    ):
+        started = time.perf_counter()
+        if mode == "per_message_send_mail":
+            errors = [_send_via_smtp(to_email, "Your month", "Body") for to_email in recipients]
+        elif mode == "session":
+            with SMTPSession() as session:
+                errors = [session.send(to_email, "Your month", "Body") for to_email in recipients]
+        else:
+            errors = send_bulk_email([BulkEmail(to_email, "Your month", "Body") for to_email in recipients])
+        seconds = time.perf_counter() - started
+    return {
+        "mode": mode,
+        "emails": emails,
+        "failed": sum(1 for error in errors if error),
+        "connections": stub.connections,
+        "seconds": round(seconds, 3),
+        "per_second": round(emails / seconds, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--emails", type=int, default=500)
+    args = parser.parse_args()
+    modes = ["per_message_send_mail", "session", "bulk"]
+    print(json.dumps([run(mode, args.emails) for mode in modes], indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+"""Hot-path benchmark suite over deterministic synthetic data.
+
+    python benchmarks/suite.py [--users 10] [--years 2] [--seed 0] [--repeat 5]
+                               [--only dashboard_cold export_summary ...]
+                               [--output results.json] [--compare baseline.json]
+
+Seeds ``seed_synthetic_data`` users in a throwaway database, then times
+each case for one user (the first) ``--repeat`` times and reports the
+median wall time and query count, plus peak Python memory from a separate
+tracemalloc pass (tracing slows the code down, so it is not timed). Run it
+on two commits with the same arguments and pass the first JSON file to
+``--compare`` on the second to get per-case time ratios. Set DATABASE_URL
++ USE_REMOTE_DB to run against a local Postgres instead of SQLite.
+"""
+import argparse
+import gc
+import json
+import platform
+import statistics
+import subprocess
+import time
+import tracemalloc
+from datetime import date, timedelta
+from io import StringIO
+from unittest import mock
+
+from _setup import ROOT, benchmark_database
+
+import django
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client, RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from tracker.models import EmailLog, RecurringTransaction, SpendingPrediction, Transaction
+from tracker.services.dashboard_cache import dashboard_cache
+from tracker.services.recurring import generate_recurring_transactions
+from tracker.services.rollups import rebuild_user_rollups
+from tracker.services.synthetic import seed_synthetic_data
+from tracker.views import _build_dashboard_context
+
+# Recurring occurrences re-generated by the generate_recurring case.
+RECURRING_GAP_DAYS = 90
+
+
+class Cases:
+    """Each case is a ``run_<name>`` method with an optional untimed ``setup_<name>``."""
+
+    def __init__(self, user, today: date):
+        self.user = user
+        self.today = today
+        self.client = Client()
+        self.client.force_login(user)
+        self.series = RecurringTransaction.objects.filter(user=user).order_by("id").first()
+        self.edits = 0
+
+    def setup_dashboard_cold(self):
+        dashboard_cache.clear()
+
+    def run_dashboard_cold(self):
+        request = RequestFactory().get("/")
+        request.user = self.user
+        return _build_dashboard_context(request)
+
+    def setup_dashboard_warm(self):
+        self.run_dashboard_cold()
+
+    def run_dashboard_warm(self):
+        return self.run_dashboard_cold()
+
+    def setup_dashboard_sections(self):
+        dashboard_cache.clear()
+
+    def run_dashboard_sections(self):
+        # The three deferred JSON sections the page fetches after first paint.
+        return [
+            self.client.get(reverse("dashboard_section", args=[section])).status_code
+            for section in ("charts", "insights", "prediction")
+        ]
+
+    def _download(self, name: str) -> int:
+        response = self.client.get(reverse(name))
+        if response.streaming:
+            return sum(len(chunk) for chunk in response.streaming_content)
+        return len(response.content)
+
+    def run_export_transactions(self):
+        return self._download("export_transactions")
+
+    def run_export_summary(self):
+        return self._download("export_summary")
+
+    def setup_generate_recurring(self):
+        since = self.today - timedelta(days=RECURRING_GAP_DAYS)
+        Transaction.objects.filter(user=self.user, recurring_source__isnull=False, date__gt=since).delete()
+        RecurringTransaction.objects.filter(user=self.user).update(last_generated_on=since)
+        rebuild_user_rollups(self.user)
+
+    def run_generate_recurring(self):
+        return generate_recurring_transactions(self.user, self.today)
+
+    def run_edit_recurring(self):
+        # Alternate the amount so every run rewrites the series' occurrences.
+        self.edits += 1
+        series = self.series
+        return self.client.post(reverse("edit_recurring", args=[series.id]), {
+            "amount": str(series.amount / 100 + self.edits % 2),
+            "repeat": series.repeat,
+            "category": series.category,
+            "payment_mode": series.payment_mode,
+            "type": series.type,
+            "start_date": series.start_date.isoformat(),
+            "end_date": series.end_date.isoformat() if series.end_date else "",
+            "description": series.description,
+            "weekdays": series.weekdays.split(",") if series.weekdays else [],
+        }).status_code
+
+    def setup_send_behavior_emails(self):
+        EmailLog.objects.all().delete()
+        SpendingPrediction.objects.all().delete()
+
+    def run_send_behavior_emails(self):
+        # Every seeded user, with a no-op transport: measures prediction and dedup, not the network.
+        with override_settings(USE_GMAIL_SMTP=False, SENDGRID_API_KEY="", PREDICTION_FIRST_WEEK_DAYS=31), \
+                mock.patch("tracker.services.email_dispatch.send_app_email", return_value=None):
+            call_command("send_behavior_emails", rate=0, stdout=StringIO())
+
+
+CASES = [
+    "dashboard_cold",
+    "dashboard_warm",
+    "dashboard_sections",
+    "export_transactions",
+    "export_summary",
+    "generate_recurring",
+    "edit_recurring",
+    "send_behavior_emails",
+]
+
+
+def run_case(cases: Cases, name: str, repeat: int) -> dict:
+    setup = getattr(cases, f"setup_{name}", lambda: None)
+    run = getattr(cases, f"run_{name}")
+    timings, queries = [], []
+    for _ in range(repeat):
+        setup()
+        gc.collect()
+        with CaptureQueriesContext(connection) as ctx:
+            started = time.perf_counter()
+            run()
+            timings.append(time.perf_counter() - started)
+        queries.append(len(ctx.captured_queries))
+
+    setup()
+    gc.collect()
+    tracemalloc.start()
+    run()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {
+        "seconds": round(statistics.median(timings), 4),
+        "min_seconds": round(min(timings), 4),
+        "queries": int(statistics.median(queries)),
+        "peak_mb": round(peak / 1e6, 2),
+    }
+
+
+def _git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(results: dict, baseline: dict) -> dict:
+    ratios = {}
+    for name, result in results.items():
+        before = baseline.get("cases", {}).get(name)
+        if before and before["seconds"]:
+            ratios[name] = {
+                "seconds_ratio": round(result["seconds"] / before["seconds"], 3),
+                "queries_delta": result["queries"] - before["queries"],
+            }
+    return ratios
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--years", type=float, default=2)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--today", default="2026-06-15", help="Fixed so runs on different days compare.")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", nargs="+", choices=CASES, default=CASES)
+    parser.add_argument("--output", help="Also write the JSON report to this file.")
+    parser.add_argument("--compare", help="Earlier report to compute time ratios against.")
+    args = parser.parse_args()
+    today = date.fromisoformat(args.today)
+
+    with benchmark_database(), override_settings(DEBUG=False), \
+            mock.patch("django.utils.timezone.localdate", return_value=today):
+        started = time.perf_counter()
+        summary = seed_synthetic_data(users=args.users, years=args.years, seed=args.seed, prefix="bench", today=today)
+        seed_seconds = round(time.perf_counter() - started, 2)
+        user = User.objects.get(username="bench-0")
+        cases = Cases(user, today)
+        results = {name: run_case(cases, name, args.repeat) for name in args.only}
+        report = {
+            "meta": {
+                "git": _git_revision(),
+                "database": connection.vendor,
+                "python": platform.python_version(),
+                "django": django.get_version(),
+                "seed": args.seed,
+                "users": args.users,
+                "years": args.years,
+                "today": args.today,
+                "repeat": args.repeat,
+                "rows": vars(summary),
+                "user_transactions": Transaction.objects.filter(user=user).count(),
+                "seed_seconds": seed_seconds,
+            },
+            "cases": results,
+        }
+
+    if args.compare:
+        with open(args.compare) as handle:
+            report["compare"] = compare(results, json.load(handle))
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as handle:
+            handle.write(output + "\n")
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -77,12 +77,15 @@ if USE_CLOUDINARY:
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
+    "tracker.middleware.QueryInstrumentationMiddleware",
+    "tracker.middleware.SpanTimingMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "tracker.middleware.ProfilerMiddleware",
 ]
 
 # ======================
@@ -135,6 +138,9 @@ else:
         "default": {
             "ENGINE": "django.db.backends.sqlite3",
             "NAME": BASE_DIR / "db.sqlite3",
+            # File-backed test DB: the in-memory shared cache fails concurrent
+            # writers with "table is locked" instead of waiting for the lock.
+            "TEST": {"NAME": BASE_DIR / "test_db.sqlite3"},
         }
     }
 
@@ -221,6 +227,7 @@ DEFAULT_FROM_EMAIL = os.getenv(
     "DEFAULT_FROM_EMAIL",
     ""
 )
+SENDGRID_API_URL = os.getenv("SENDGRID_API_URL", "https://api.sendgrid.com/v3/mail/send")
 
 # ======================
 # DJANGO EMAIL BACKEND
@@ -234,6 +241,22 @@ EMAIL_HOST_PASSWORD = os.getenv("EMAIL_HOST_PASSWORD", SENDGRID_API_KEY or "")
 EMAIL_USE_TLS = _env_bool("EMAIL_USE_TLS", True)
 EMAIL_TIMEOUT = int(os.getenv("EMAIL_TIMEOUT", "10"))
 
+# Behavior email dispatch (send_behavior_emails --workers).
+EMAIL_RATE_LIMIT = float(os.getenv("EMAIL_RATE_LIMIT", "10"))  # sends/second, 0 = unlimited
+EMAIL_RATE_BURST = int(os.getenv("EMAIL_RATE_BURST", "10"))
+EMAIL_SEND_RETRIES = int(os.getenv("EMAIL_SEND_RETRIES", "3"))
+EMAIL_RETRY_BACKOFF = float(os.getenv("EMAIL_RETRY_BACKOFF", "1.0"))
+EMAIL_PROVIDER_CONCURRENCY = {
+    "sendgrid": int(os.getenv("EMAIL_SENDGRID_CONCURRENCY", "8")),
+    "smtp": int(os.getenv("EMAIL_SMTP_CONCURRENCY", "2")),
+}
+
+# Durable outbox: OTP views enqueue and `manage.py drain_email_outbox` sends.
+# Off by default so deployments without a worker process keep sending inline.
+EMAIL_USE_OUTBOX = _env_bool("EMAIL_USE_OUTBOX", False)
+EMAIL_OUTBOX_MAX_ATTEMPTS = int(os.getenv("EMAIL_OUTBOX_MAX_ATTEMPTS", "5"))
+EMAIL_OUTBOX_LEASE_SECONDS = int(os.getenv("EMAIL_OUTBOX_LEASE_SECONDS", "60"))
+
 # ======================
 # GMAIL SMTP (DEV/ALT)
 # ======================
@@ -253,6 +276,17 @@ if USE_GMAIL_SMTP:
     if EMAIL_HOST_USER:
         DEFAULT_FROM_EMAIL = EMAIL_HOST_USER
 
+# ======================
+# CATEGORIZATION
+# ======================
+
+# Optional CSV of extra merchant keywords: keyword,category[,priority[,word_boundary]].
+CATEGORY_KEYWORDS_FILE = os.getenv("CATEGORY_KEYWORDS_FILE", "")
+# Per-user learned categorizer: vocabulary cap per user and in-process LRU size.
+CATEGORIZER_MAX_VOCAB = int(os.getenv("CATEGORIZER_MAX_VOCAB", "2000"))
+CATEGORIZER_CACHE_MAX_ENTRIES = int(os.getenv("CATEGORIZER_CACHE_MAX_ENTRIES", "1024"))
+CATEGORIZER_CACHE_TTL = int(os.getenv("CATEGORIZER_CACHE_TTL", "600"))
+
 # ======================
 # PREDICTION THRESHOLDS
 # ======================
@@ -263,6 +297,39 @@ PREDICTION_UNDER_THRESHOLD = float(os.getenv("PREDICTION_UNDER_THRESHOLD", "0.60
 PREDICTION_STABLE_THRESHOLD = float(os.getenv("PREDICTION_STABLE_THRESHOLD", "0.10"))
 PREDICTION_FIRST_WEEK_DAYS = int(os.getenv("PREDICTION_FIRST_WEEK_DAYS", "7"))
 
+# ======================
+# DASHBOARD
+# ======================
+
+DASHBOARD_CACHE_MAX_ENTRIES = int(os.getenv("DASHBOARD_CACHE_MAX_ENTRIES", "512"))
+DASHBOARD_CACHE_TTL = int(os.getenv("DASHBOARD_CACHE_TTL", "300"))
+TRANSACTION_PAGE_SIZE = int(os.getenv("TRANSACTION_PAGE_SIZE", "50"))
+# Set to False once materialize_recurring runs on a schedule.
+RECURRING_GENERATE_ON_VIEW = _env_bool("RECURRING_GENERATE_ON_VIEW", True)
+# Rows fetched per round trip by the streaming CSV export.
+EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", "2000"))
+# Rows validated and bulk-inserted per batch by the CSV import.
+IMPORT_CHUNK_SIZE = int(os.getenv("IMPORT_CHUNK_SIZE", "2000"))
+
+# ======================
+# INSTRUMENTATION
+# ======================
+
+# Per-request query count/DB time, Server-Timing headers and N+1 warnings.
+SQL_INSTRUMENTATION = _env_bool("SQL_INSTRUMENTATION", False)
+SQL_SLOW_REQUEST_MS = float(os.getenv("SQL_SLOW_REQUEST_MS", "500"))
+# Same SQL shape this many times in one request is logged as a likely N+1.
+SQL_REPEAT_THRESHOLD = int(os.getenv("SQL_REPEAT_THRESHOLD", "5"))
+# Per-stage span timings as Server-Timing entries and one INFO log line per request.
+REQUEST_SPANS = _env_bool("REQUEST_SPANS", False)
+# Recent requests' spans kept in memory for /staff/spans/ (0 = none).
+SPAN_BUFFER_SIZE = int(os.getenv("SPAN_BUFFER_SIZE", "200"))
+# Staff can profile a request with ?_profile=1 (or =mem) / X-Profile header.
+PROFILE_REQUESTS = _env_bool("PROFILE_REQUESTS", True)
+# Where .pstats/.collapsed files are kept (default: <tmp>/tracker-profiles), pruned oldest-first.
+PROFILE_DIR = os.getenv("PROFILE_DIR", "")
+PROFILE_DIR_MAX_MB = float(os.getenv("PROFILE_DIR_MAX_MB", "50"))
+
 # ======================
 # DEFAULT PK
 # ======================
@@ -293,5 +360,10 @@ LOGGING = {
             "level": "INFO",
             "propagate": False,
         },
+        "tracker": {
+            "handlers": ["console"],
+            "level": os.getenv("TRACKER_LOG_LEVEL", "WARNING"),
+            "propagate": False,
+        },
     },
 }
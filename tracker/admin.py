@@ -8,6 +8,7 @@ from .models import (
     SavingsGoal,
     SpendingPrediction,
     Transaction,
+    UserMonthRollup,
 )
 
 
@@ -49,6 +50,12 @@ class SpendingPredictionAdmin(admin.ModelAdmin):
     list_filter = ("risk_level", "month")
 
 
+@admin.register(UserMonthRollup)
+class UserMonthRollupAdmin(admin.ModelAdmin):
+    list_display = ("user", "month", "type", "category", "payment_mode", "total", "count")
+    list_filter = ("type", "category", "month")
+
+
 @admin.register(EmailLog)
 class EmailLogAdmin(admin.ModelAdmin):
     list_display = ("user", "email_type", "related_month", "sent_at")
@@ -0,0 +1,50 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from tracker.models import EmailOutbox
+from tracker.services.outbox import drain_outbox, outbox_metrics
+
+
+class Command(BaseCommand):
+    help = "Send queued emails from the EmailOutbox, retrying transient failures."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Drain what is due now and exit.")
+        parser.add_argument("--otp-only", action="store_true", help="Only send OTP mail (for a dedicated OTP worker).")
+        parser.add_argument("--batch-size", type=int, default=20, help="Rows claimed before re-checking priorities.")
+        parser.add_argument("--poll-interval", type=float, default=2.0, help="Seconds to sleep when the queue is empty.")
+        parser.add_argument("--rate", type=float, help="Max sends per second (default EMAIL_RATE_LIMIT, 0 = unlimited).")
+
+    def handle(self, *args, **options):
+        max_priority = EmailOutbox.PRIORITY_OTP if options["otp_only"] else None
+        totals = {"sent": 0, "failed": 0, "retries": 0}
+        try:
+            while True:
+                stats = drain_outbox(
+                    batch_size=options["batch_size"],
+                    max_priority=max_priority,
+                    rate=options["rate"],
+                )
+                for key in totals:
+                    totals[key] += getattr(stats, key)
+                if stats.sent or stats.failed or stats.retries:
+                    self._report(outbox_metrics())
+                if options["once"]:
+                    break
+                if not (stats.sent or stats.failed or stats.retries):
+                    time.sleep(options["poll_interval"])
+        except KeyboardInterrupt:
+            pass
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Outbox emails sent: {totals['sent']}, failed: {totals['failed']}, retries scheduled: {totals['retries']}"
+        ))
+        self._report(outbox_metrics())
+
+    def _report(self, metrics):
+        depth = ", ".join(f"{name}={count}" for name, count in metrics["depth"].items())
+        self.stdout.write(
+            f"queue depth {depth} (oldest {metrics['oldest_seconds']}s), failed total: {metrics['failed']}, "
+            f"delivery latency p50/p90/p99: {metrics['p50_ms']}/{metrics['p90_ms']}/{metrics['p99_ms']} ms"
+        )
@@ -0,0 +1,51 @@
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from tracker.services.imports import ImportFormatError, import_transactions, text_lines
+
+
+class Command(BaseCommand):
+    help = "Import a transactions CSV (the export format) into one user's history."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV file to import.")
+        parser.add_argument("--user", required=True, help="Username or id of the owner.")
+        parser.add_argument("--chunk-size", type=int, help="Rows per batch (default IMPORT_CHUNK_SIZE).")
+        parser.add_argument("--dry-run", action="store_true", help="Validate and categorize without saving.")
+
+    def handle(self, *args, **options):
+        ref = options["user"]
+        user = User.objects.filter(id=int(ref)).first() if ref.isdigit() else User.objects.filter(username=ref).first()
+        if user is None:
+            raise CommandError(f"No user {ref!r}.")
+
+        started = time.perf_counter()
+
+        def progress(result):
+            elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f"{result.rows} rows read, {result.created} imported, {result.skipped} skipped "
+                f"({result.rows / elapsed if elapsed else 0:.0f} rows/s)"
+            )
+
+        try:
+            with open(options["path"], "rb") as handle:
+                result = import_transactions(
+                    user,
+                    text_lines(handle),
+                    chunk_size=options["chunk_size"],
+                    progress=progress,
+                    dry_run=options["dry_run"],
+                )
+        except (OSError, ImportFormatError, UnicodeDecodeError) as exc:
+            raise CommandError(str(exc))
+
+        for line, message in result.errors:
+            self.stdout.write(f"line {line}: {message}")
+        verb = "Would import" if options["dry_run"] else "Imported"
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} {result.created} transactions ({result.auto_categorized} auto-categorized), "
+            f"skipped {result.skipped} of {result.rows} rows"
+        ))
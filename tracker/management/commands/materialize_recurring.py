@@ -0,0 +1,33 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from tracker.services.recurring import materialize_recurring
+
+
+class Command(BaseCommand):
+    help = "Materialize due recurring transactions for all users (run daily)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--date", help="Generate occurrences up to this ISO date (default: today).")
+        parser.add_argument("--chunk-size", type=int, default=500, help="Series fetched per batch.")
+        parser.add_argument("--user", type=int, help="Only process the user with this id.")
+
+    def handle(self, *args, **options):
+        up_to_date = timezone.localdate()
+        if options["date"]:
+            try:
+                up_to_date = date.fromisoformat(options["date"])
+            except ValueError:
+                raise CommandError("--date must be YYYY-MM-DD")
+
+        stats = materialize_recurring(
+            up_to_date,
+            chunk_size=max(1, options["chunk_size"]),
+            user_id=options["user"],
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Recurring series processed: {stats['series']}, users: {stats['users']}, "
+            f"transactions created: {stats['created']}"
+        ))
@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand
+from django.contrib.auth.models import User
+
+from tracker.services.rollups import rebuild_user_rollups, verify_user_rollups
+
+
+class Command(BaseCommand):
+    help = "Rebuild or verify the per-user monthly analytics rollups."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", type=int, help="Only process the user with this id.")
+        parser.add_argument(
+            "--verify",
+            action="store_true",
+            help="Compare rollups against transactions without changing anything.",
+        )
+
+    def handle(self, *args, **options):
+        users = User.objects.order_by("id")
+        if options["user"]:
+            users = users.filter(id=options["user"])
+
+        processed = 0
+        drifted = 0
+        rows = 0
+
+        for user in users.iterator():
+            processed += 1
+            if options["verify"]:
+                mismatches = verify_user_rollups(user)
+                if mismatches:
+                    drifted += 1
+                    for key, stored, expected in mismatches:
+                        self.stdout.write(f"user={user.id} {key}: stored={stored} expected={expected}")
+                continue
+            rows += rebuild_user_rollups(user)
+
+        if options["verify"]:
+            style = self.style.SUCCESS if not drifted else self.style.ERROR
+            self.stdout.write(style(f"Users checked: {processed}, with drift: {drifted}"))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Users rebuilt: {processed}, rollup rows: {rows}"))
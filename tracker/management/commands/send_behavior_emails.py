@@ -3,45 +3,64 @@ from django.contrib.auth.models import User
 from django.utils import timezone
 from django.conf import settings
 
-from tracker.services.prediction_service import build_prediction_summary
-from tracker.services.email_service import build_email_content, send_behavior_email
+from tracker.services.prediction_service import iter_prediction_summaries
+from tracker.services.email_dispatch import EmailDispatcher
+from tracker.services.email_service import build_email_content
+from tracker.services.outbox import enqueue_behavior_emails
 
 
 class Command(BaseCommand):
     help = "Send predictive spending behavior emails."
 
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=500, help="Users predicted per batch.")
+        parser.add_argument("--workers", type=int, default=1, help="Concurrent sender threads.")
+        parser.add_argument("--rate", type=float, help="Max sends per second (default EMAIL_RATE_LIMIT, 0 = unlimited).")
+        parser.add_argument("--burst", type=int, help="Token bucket size (default EMAIL_RATE_BURST).")
+        parser.add_argument("--retries", type=int, help="Retries per email on transient errors (default EMAIL_SEND_RETRIES).")
+        parser.add_argument(
+            "--outbox",
+            action="store_true",
+            help="Queue emails in the EmailOutbox for drain_email_outbox instead of sending them here.",
+        )
+
     def handle(self, *args, **options):
         today = timezone.localdate()
         first_week_days = int(getattr(settings, "PREDICTION_FIRST_WEEK_DAYS", 7))
 
-        sent = 0
-        skipped = 0
-
-        for user in User.objects.filter(is_active=True):
-            if not user.email:
-                skipped += 1
-                continue
-
-            prediction = build_prediction_summary(user, today)
-            if prediction.risk_level == "insufficient":
-                skipped += 1
-                continue
+        active = User.objects.filter(is_active=True)
+        skipped = active.filter(email="").count()
 
-            if prediction.risk_level in ("high", "under"):
-                content = build_email_content(user, prediction, prediction.risk_level, today)
-                if send_behavior_email(user, content):
-                    sent += 1
-                else:
+        def jobs():
+            nonlocal skipped
+            for user, prediction in iter_prediction_summaries(active.exclude(email=""), today, options["chunk_size"]):
+                if prediction.risk_level == "insufficient":
                     skipped += 1
-                continue
-
-            if today.day <= first_week_days:
-                content = build_email_content(user, prediction, "healthy", today, force_type="prediction")
-                if send_behavior_email(user, content):
-                    sent += 1
+                elif prediction.risk_level in ("high", "under"):
+                    yield user, build_email_content(user, prediction, prediction.risk_level, today)
+                elif today.day <= first_week_days:
+                    yield user, build_email_content(user, prediction, "healthy", today, force_type="prediction")
                 else:
                     skipped += 1
-            else:
-                skipped += 1
 
-        self.stdout.write(self.style.SUCCESS(f"Behavior emails sent: {sent}, skipped: {skipped}"))
+        if options["outbox"]:
+            # Rate limits and retries apply when the outbox worker sends.
+            stats = enqueue_behavior_emails(jobs(), chunk_size=options["chunk_size"])
+        else:
+            dispatcher = EmailDispatcher(
+                workers=options["workers"],
+                rate=options["rate"],
+                burst=options["burst"],
+                retries=options["retries"],
+            )
+            stats = dispatcher.run(jobs(), chunk_size=options["chunk_size"])
+        summary = stats.summary()
+        skipped += summary["skipped"]
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Behavior emails sent: {summary['sent']}, skipped: {skipped}, failed: {summary['failed']}"
+        ))
+        self.stdout.write(
+            f"{summary['per_second']} emails/s over {summary['seconds']}s, retries: {summary['retries']}, "
+            f"latency p50/p90/p99: {summary['p50_ms']}/{summary['p90_ms']}/{summary['p99_ms']} ms"
+        )
@@ -0,0 +1,187 @@
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+from typing import List, Tuple
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.utils import timezone
+
+from tracker.services.instrumentation import (
+    add_server_timing,
+    record_request,
+    start_collecting,
+    stop_collecting,
+    summarize,
+)
+from tracker.services.profiling import RequestProfiler
+
+logger = logging.getLogger(__name__)
+
+# "IN (%s, %s, %s)" of any length is one shape.
+_IN_LIST = re.compile(r"IN \((?:%s(?:, )?)+\)")
+# Keep the examples in a log line readable.
+SHAPE_LOG_CHARS = 200
+
+
+def sql_shape(sql: str) -> str:
+    """Normalize parameterized SQL so the same query with other values compares equal."""
+    return _IN_LIST.sub("IN (...)", sql)
+
+
+class QueryStats:
+    """Query count, DB time and repeated SQL shapes for one request."""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.shapes = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.seconds += time.perf_counter() - started
+            self.count += 1
+            self.shapes[sql_shape(sql)] += 1
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """Shapes run at least ``threshold`` times: likely N+1 loops."""
+        return [(shape, count) for shape, count in self.shapes.most_common() if count >= threshold]
+
+
+class QueryInstrumentationMiddleware:
+    """Count queries and DB time per request via ``connection.execute_wrapper``.
+
+    Adds ``Server-Timing: db`` and ``total`` metrics, warns about SQL shapes
+    repeated ``SQL_REPEAT_THRESHOLD`` times and about requests slower than
+    ``SQL_SLOW_REQUEST_MS``. With ``SQL_INSTRUMENTATION`` off, Django drops
+    the middleware at startup, so it costs nothing.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, "SQL_INSTRUMENTATION", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.slow_ms = float(getattr(settings, "SQL_SLOW_REQUEST_MS", 500))
+        self.repeat_threshold = int(getattr(settings, "SQL_REPEAT_THRESHOLD", 5))
+
+    def __call__(self, request):
+        stats = QueryStats()
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(stats))
+            response = self.get_response(request)
+        total_ms = (time.perf_counter() - started) * 1000
+        db_ms = stats.seconds * 1000
+
+        add_server_timing(response, "db", db_ms, f"{stats.count} queries")
+        add_server_timing(response, "total", total_ms)
+
+        repeated = stats.repeated(self.repeat_threshold)
+        for shape, count in repeated:
+            logger.warning(
+                "Repeated query on %s %s: %s times: %s",
+                request.method, request.path, count, shape[:SHAPE_LOG_CHARS],
+            )
+        if total_ms >= self.slow_ms:
+            logger.warning(
+                "Slow request %s %s: %s in %.0f ms, %s queries in %.0f ms, %s repeated shapes",
+                request.method, request.path, response.status_code, total_ms, stats.count, db_ms, len(repeated),
+            )
+        return response
+
+
+class SpanTimingMiddleware:
+    """Collect ``instrumentation.span`` timings for each request.
+
+    Every span name becomes a ``Server-Timing`` metric (nested spans are
+    reported separately, not subtracted). One INFO line per request carries
+    the breakdown, and with ``SPAN_BUFFER_SIZE`` > 0 the most recent requests
+    are kept for the staff ``/staff/spans/`` view. Off unless
+    ``REQUEST_SPANS`` is set.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, "REQUEST_SPANS", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = start_collecting()
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            spans = summarize(stop_collecting(token))
+        if not spans:
+            return response
+        total_ms = round((time.perf_counter() - started) * 1000, 2)
+
+        for entry in spans:
+            add_server_timing(response, entry["name"], entry["ms"], f"x{entry['count']}" if entry["count"] > 1 else "")
+        user = getattr(request, "user", None)
+        record = {
+            "at": timezone.now().isoformat(),
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            "user_id": user.pk if user is not None and user.is_authenticated else None,
+            "total_ms": total_ms,
+            "spans": spans,
+        }
+        logger.info(
+            "Spans %s %s %s in %.0f ms: %s",
+            request.method, request.path, response.status_code, total_ms,
+            ", ".join(f"{entry['name']}={entry['ms']:.1f}" for entry in spans),
+            extra={"request_spans": record},
+        )
+        record_request(record)
+        return response
+
+
+class ProfilerMiddleware:
+    """Run one staff request under cProfile on demand.
+
+    ``?_profile=1`` or an ``X-Profile: 1`` header profiles the request
+    (``mem`` also tracks allocations with tracemalloc). A streamed body is
+    consumed inside the profile so export generation is included. The
+    response names the stored profile in ``X-Profile-Id``; files are
+    listed and downloaded under ``/staff/profiles/``. Set
+    ``PROFILE_REQUESTS`` to False to remove the switch.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, "PROFILE_REQUESTS", True):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        mode = request.GET.get("_profile") or request.headers.get("X-Profile")
+        if not mode or not request.user.is_staff:
+            return self.get_response(request)
+
+        profiler = RequestProfiler.acquire(f"{request.method}-{request.path}", memory=mode == "mem")
+        if profiler is None:
+            response = self.get_response(request)
+            response["X-Profile-Id"] = "busy"
+            return response
+
+        profiler.start()  # Releases the profiler slot itself if it fails.
+        try:
+            response = self.get_response(request)
+            if response.streaming:
+                response.streaming_content = [b"".join(response.streaming_content)]
+        finally:
+            result = profiler.stop()
+        logger.info(
+            "Profiled %s %s in %.3f s (%s samples): %s",
+            request.method, request.path, result.seconds, result.samples, result.profile_id,
+        )
+        response["X-Profile-Id"] = result.profile_id
+        return response
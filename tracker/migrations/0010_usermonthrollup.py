@@ -0,0 +1,65 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:26
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncMonth
+
+
+def backfill_rollups(apps, schema_editor):
+    Transaction = apps.get_model("tracker", "Transaction")
+    UserMonthRollup = apps.get_model("tracker", "UserMonthRollup")
+    rows = (
+        Transaction.objects.annotate(month=TruncMonth("date"))
+        .values("user_id", "month", "category", "type", "payment_mode")
+        .annotate(total=Sum("amount"), count=Count("id"))
+        .order_by()
+    )
+    batch = []
+    for item in rows.iterator():
+        month = item["month"]
+        if hasattr(month, "date"):
+            month = month.date()
+        batch.append(UserMonthRollup(
+            user_id=item["user_id"],
+            month=month,
+            category=item["category"],
+            type=item["type"],
+            payment_mode=item["payment_mode"],
+            total=item["total"] or 0,
+            count=item["count"],
+        ))
+        if len(batch) >= 1000:
+            UserMonthRollup.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        UserMonthRollup.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0009_emaillog_spendingprediction'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserMonthRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField()),
+                ('category', models.CharField(choices=[('food', 'Food'), ('transport', 'Transport'), ('rent', 'Rent'), ('shopping', 'Shopping'), ('salary', 'Salary'), ('other', 'Other')], max_length=20)),
+                ('type', models.CharField(choices=[('income', 'Income'), ('expense', 'Expense')], max_length=10)),
+                ('payment_mode', models.CharField(choices=[('online', 'Online Money'), ('cash', 'Cash Money')], max_length=10)),
+                ('total', models.FloatField(default=0)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('user', 'month', 'category', 'type', 'payment_mode')},
+            },
+        ),
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
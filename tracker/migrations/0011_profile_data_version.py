@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0010_usermonthrollup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='data_version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,49 @@
+from django.db import migrations, models
+from django.db.models import F
+from django.db.models.functions import Round
+
+
+# (model, field) pairs that move from float rupees to integer paise.
+MONEY_FIELDS = [
+    ("Transaction", "amount"),
+    ("MonthlyBudget", "total_amount"),
+    ("CategoryBudget", "amount"),
+    ("RecurringTransaction", "amount"),
+    ("SavingsGoal", "target_amount"),
+    ("UserMonthRollup", "total"),
+    ("SpendingPrediction", "predicted_expense"),
+]
+
+
+def rupees_to_paise(apps, schema_editor):
+    # Runs while the columns are still floats (and, when reversing, after they
+    # are floats again), so the AlterFields only ever see integral values.
+    for model_name, field in MONEY_FIELDS:
+        apps.get_model("tracker", model_name).objects.update(**{field: Round(F(field) * 100)})
+
+
+def paise_to_rupees(apps, schema_editor):
+    for model_name, field in MONEY_FIELDS:
+        apps.get_model("tracker", model_name).objects.update(**{field: F(field) / 100.0})
+
+
+def _alter(model_name, field, new_field):
+    return migrations.AlterField(model_name=model_name.lower(), name=field, field=new_field)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0012_transaction_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(rupees_to_paise, paise_to_rupees),
+        _alter('Transaction', 'amount', models.BigIntegerField(help_text='Amount in paise.')),
+        _alter('MonthlyBudget', 'total_amount', models.BigIntegerField(help_text='Amount in paise.')),
+        _alter('CategoryBudget', 'amount', models.BigIntegerField(help_text='Amount in paise.')),
+        _alter('RecurringTransaction', 'amount', models.BigIntegerField(help_text='Amount in paise.')),
+        _alter('SavingsGoal', 'target_amount', models.BigIntegerField(help_text='Amount in paise.')),
+        _alter('UserMonthRollup', 'total', models.BigIntegerField(default=0, help_text='Sum in paise.')),
+        _alter('SpendingPrediction', 'predicted_expense', models.BigIntegerField(help_text='Amount in paise.')),
+    ]
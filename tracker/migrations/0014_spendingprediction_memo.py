@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0013_amounts_in_paise'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='spendingprediction',
+            name='computed_on',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='spendingprediction',
+            name='data_version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='spendingprediction',
+            name='explanation',
+            field=models.CharField(blank=True, max_length=255),
+        ),
+    ]
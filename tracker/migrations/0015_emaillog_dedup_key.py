@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0014_spendingprediction_memo'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='emaillog',
+            name='dedup_key',
+            field=models.CharField(blank=True, max_length=64, null=True, unique=True),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:03
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0016_emailoutbox'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='emaillog',
+            index=models.Index(fields=['user', 'email_type', 'related_month', 'sent_at'], name='tracker_emaillog_dedup_idx'),
+        ),
+    ]
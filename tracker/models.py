@@ -1,12 +1,15 @@
 import os
 
 from django.db import models
+from django.utils import timezone
 from django.contrib.auth.models import User
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 from django.conf import settings
 from django.contrib.staticfiles.storage import staticfiles_storage
 
+from tracker.services.money import format_rupees
+
 class Transaction(models.Model):
     TYPE_CHOICES = (
         ('income', 'Income'),
@@ -29,7 +32,7 @@ class Transaction(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
 
     type = models.CharField(max_length=10, choices=TYPE_CHOICES)
-    amount = models.FloatField()
+    amount = models.BigIntegerField(help_text="Amount in paise.")
     category = models.CharField(max_length=20, choices=CATEGORY_CHOICES)
     payment_mode = models.CharField(max_length=10, choices=PAYMENT_CHOICES, default='online')
     date = models.DateField()
@@ -42,14 +45,21 @@ class Transaction(models.Model):
         related_name="generated_transactions",
     )
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "date"], name="tracker_txn_user_date_idx"),
+            models.Index(fields=["user", "type", "date"], name="tracker_txn_user_type_date_idx"),
+            models.Index(fields=["user", "recurring_source", "date"], name="tracker_txn_user_rec_date_idx"),
+        ]
+
     def __str__(self):
-        return f"{self.user.username} - {self.category} - {self.amount}"
+        return f"{self.user.username} - {self.category} - {format_rupees(self.amount)}"
 
 
 class MonthlyBudget(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     month = models.DateField()
-    total_amount = models.FloatField()
+    total_amount = models.BigIntegerField(help_text="Amount in paise.")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -57,14 +67,14 @@ class MonthlyBudget(models.Model):
         unique_together = ("user", "month")
 
     def __str__(self):
-        return f"{self.user.username} - {self.month:%Y-%m} - {self.total_amount}"
+        return f"{self.user.username} - {self.month:%Y-%m} - {format_rupees(self.total_amount)}"
 
 
 class CategoryBudget(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     month = models.DateField()
     category = models.CharField(max_length=20, choices=Transaction.CATEGORY_CHOICES)
-    amount = models.FloatField()
+    amount = models.BigIntegerField(help_text="Amount in paise.")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -84,7 +94,7 @@ class RecurringTransaction(models.Model):
 
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     type = models.CharField(max_length=10, choices=Transaction.TYPE_CHOICES)
-    amount = models.FloatField()
+    amount = models.BigIntegerField(help_text="Amount in paise.")
     category = models.CharField(max_length=20, choices=Transaction.CATEGORY_CHOICES)
     payment_mode = models.CharField(max_length=10, choices=Transaction.PAYMENT_CHOICES, default="online")
     description = models.CharField(max_length=255, blank=True)
@@ -104,7 +114,7 @@ class RecurringTransaction(models.Model):
 class SavingsGoal(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     name = models.CharField(max_length=120)
-    target_amount = models.FloatField()
+    target_amount = models.BigIntegerField(help_text="Amount in paise.")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -112,6 +122,34 @@ class SavingsGoal(models.Model):
         return f"{self.user.username} - {self.name}"
 
 
+class UserMonthRollup(models.Model):
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    month = models.DateField()
+    category = models.CharField(max_length=20, choices=Transaction.CATEGORY_CHOICES)
+    type = models.CharField(max_length=10, choices=Transaction.TYPE_CHOICES)
+    payment_mode = models.CharField(max_length=10, choices=Transaction.PAYMENT_CHOICES)
+    total = models.BigIntegerField(default=0, help_text="Sum in paise.")
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ("user", "month", "category", "type", "payment_mode")
+
+    def __str__(self):
+        return f"{self.user.username} - {self.month:%Y-%m} - {self.type} - {self.category}"
+
+
+class UserCategorizer(models.Model):
+    """Naive Bayes counts learned from one user's categorized transactions."""
+
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True)
+    # {"docs": {category: n}, "tokens": {token: {category: n}}}
+    counts = models.JSONField(default=dict)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.user.username} - categorizer"
+
+
 class SpendingPrediction(models.Model):
     RISK_CHOICES = (
         ("high", "High Risk"),
@@ -122,8 +160,12 @@ class SpendingPrediction(models.Model):
 
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     month = models.DateField()
-    predicted_expense = models.FloatField()
+    predicted_expense = models.BigIntegerField(help_text="Amount in paise.")
     risk_level = models.CharField(max_length=20, choices=RISK_CHOICES, default="insufficient")
+    explanation = models.CharField(max_length=255, blank=True)
+    # Inputs the stored result was computed from; see build_prediction_summary.
+    computed_on = models.DateField(null=True, blank=True)
+    data_version = models.PositiveIntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
@@ -145,15 +187,64 @@ class EmailLog(models.Model):
     email_type = models.CharField(max_length=20, choices=EMAIL_TYPES)
     sent_at = models.DateTimeField(auto_now_add=True)
     related_month = models.DateField(null=True, blank=True)
+    # One row per (user, type, month, week) claims the send before it happens,
+    # so concurrent senders cannot both deliver the same email.
+    dedup_key = models.CharField(max_length=64, unique=True, null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["user", "email_type", "related_month", "sent_at"],
+                name="tracker_emaillog_dedup_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - {self.email_type} - {self.sent_at:%Y-%m-%d}"
 
+class EmailOutbox(models.Model):
+    """An email waiting for ``drain_email_outbox``; lower priority goes first."""
+
+    PRIORITY_OTP = 0
+    PRIORITY_BULK = 10
+
+    STATUS_CHOICES = (
+        ("pending", "Pending"),
+        ("sending", "Sending"),
+        ("sent", "Sent"),
+        ("failed", "Failed"),
+    )
+
+    to_email = models.EmailField()
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    priority = models.PositiveSmallIntegerField(default=PRIORITY_BULK)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="pending")
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.CharField(max_length=255, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    # Next time a worker may pick the row up: retry backoff for pending rows,
+    # lease expiry for rows a worker has claimed ("sending").
+    available_at = models.DateTimeField(default=timezone.now)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    # EmailLog claim of a queued behavior email, released if the send fails
+    # for good so the next run can try again.
+    dedup_key = models.CharField(max_length=64, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "priority", "available_at"], name="tracker_outbox_next_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.to_email} - {self.subject} - {self.status}"
+
 class Profile(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE)
     full_name = models.CharField(max_length=100)
     image = models.ImageField(upload_to="profiles/", default="profiles/default.png")
     last_username_change_at = models.DateTimeField(null=True, blank=True)
+    data_version = models.PositiveIntegerField(default=0)
 
     def _default_avatar_url(self):
         try:
@@ -1,37 +1,201 @@
-from calendar import monthrange
-from dataclasses import dataclass
-from datetime import date
-from typing import Dict, Iterable, List, Tuple
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
 
 from django.db.models import Q, Sum
-from django.db.models.functions import TruncMonth
 from django.utils import timezone
 
-from tracker.models import CategoryBudget, MonthlyBudget, Transaction
+from tracker.models import CategoryBudget, MonthlyBudget, Transaction, UserMonthRollup
+from tracker.services.instrumentation import span
+from tracker.services.money import format_currency, rupees_float
 
 
 CATEGORY_LABELS = dict(Transaction.CATEGORY_CHOICES)
 
+# (month, category, type, payment_mode)
+CubeKey = Tuple[date, str, str, str]
 
+
+# Money values below are integer paise (see tracker.services.money).
 @dataclass
 class Totals:
-    total_income: float
-    total_expense: float
-    balance: float
-    online_balance: float
-    cash_balance: float
+    total_income: int
+    total_expense: int
+    balance: int
+    online_balance: int
+    cash_balance: int
 
 
 @dataclass
 class BudgetSummary:
-    total_budget: float
-    spent: float
-    remaining: float
+    total_budget: int
+    spent: int
+    remaining: int
     used_percent: float
     display_percent: float
     status: str  # ok | warning | over | unset
 
 
+@dataclass
+class AnalyticsCube:
+    """In-memory month x category x type x payment_mode sums for one user.
+
+    ``cells`` covers the user's whole history. ``window`` holds the same sums
+    (without the month axis) restricted to the dashboard date filters, or is
+    ``None`` when no date filter is active.
+    """
+
+    cells: Dict[CubeKey, int] = field(default_factory=dict)
+    window: Optional[Dict[Tuple[str, str, str], int]] = None
+
+    def _iter(self, windowed: bool, category: Optional[str], payment_mode: Optional[str]):
+        if windowed and self.window is not None:
+            items = self.window.items()
+        else:
+            items = (((cat, kind, mode), total) for (_, cat, kind, mode), total in self.cells.items())
+        for (cat, kind, mode), total in items:
+            if category and cat != category:
+                continue
+            if payment_mode and mode != payment_mode:
+                continue
+            yield cat, kind, mode, total
+
+    def totals(self, category: Optional[str] = None, payment_mode: Optional[str] = None, windowed: bool = False) -> Totals:
+        sums = {}
+        for _, kind, mode, total in self._iter(windowed, category, payment_mode):
+            sums[(kind, mode)] = sums.get((kind, mode), 0) + total
+
+        online_income = sums.get(("income", "online"), 0)
+        online_expense = sums.get(("expense", "online"), 0)
+        cash_income = sums.get(("income", "cash"), 0)
+        cash_expense = sums.get(("expense", "cash"), 0)
+        total_income = sum(value for (kind, _), value in sums.items() if kind == "income")
+        total_expense = sum(value for (kind, _), value in sums.items() if kind == "expense")
+
+        return Totals(
+            total_income=total_income,
+            total_expense=total_expense,
+            balance=total_income - total_expense,
+            online_balance=online_income - online_expense,
+            cash_balance=cash_income - cash_expense,
+        )
+
+    def category_expenses(self, category: Optional[str] = None, payment_mode: Optional[str] = None, windowed: bool = False) -> Dict[str, int]:
+        spent = {}
+        for cat, kind, _, total in self._iter(windowed, category, payment_mode):
+            if kind == "expense":
+                spent[cat] = spent.get(cat, 0) + total
+        return spent
+
+    def month_totals(self, month: date) -> Tuple[int, int]:
+        income = expense = 0
+        for (cell_month, _, kind, _), total in self.cells.items():
+            if cell_month != month:
+                continue
+            if kind == "income":
+                income += total
+            elif kind == "expense":
+                expense += total
+        return income, expense
+
+    def month_category_expenses(self, month: date) -> Dict[str, int]:
+        spent = {}
+        for (cell_month, cat, kind, _), total in self.cells.items():
+            if cell_month == month and kind == "expense":
+                spent[cat] = spent.get(cat, 0) + total
+        return spent
+
+    def monthly_expenses(self, category: Optional[str] = None, payment_mode: Optional[str] = None) -> Dict[date, int]:
+        totals = {}
+        for (cell_month, cat, kind, mode), total in self.cells.items():
+            if kind != "expense":
+                continue
+            if category and cat != category:
+                continue
+            if payment_mode and mode != payment_mode:
+                continue
+            totals[cell_month] = totals.get(cell_month, 0) + total
+        return totals
+
+
+def _window_bounds(filters) -> Optional[Tuple[Optional[date], Optional[date]]]:
+    if filters is None:
+        return None
+    low = high = None
+    if filters.month:
+        low = filters.month
+        high = month_delta(filters.month, 1) - timedelta(days=1)
+    if filters.start_date:
+        low = max(low, filters.start_date) if low else filters.start_date
+    if filters.end_date:
+        high = min(high, filters.end_date) if high else filters.end_date
+    if low is None and high is None:
+        return None
+    return low, high
+
+
+def _partial_month_ranges(low: Optional[date], high: Optional[date]) -> List[Tuple[date, date]]:
+    """Date ranges of the window that do not cover a whole calendar month."""
+    if low and high and (low.year, low.month) == (high.year, high.month):
+        if low.day == 1 and high == month_delta(high, 1) - timedelta(days=1):
+            return []
+        return [(low, high)]
+    ranges = []
+    if low and low.day != 1:
+        ranges.append((low, month_delta(low, 1) - timedelta(days=1)))
+    if high and high != month_delta(high, 1) - timedelta(days=1):
+        ranges.append((date(high.year, high.month, 1), high))
+    return ranges
+
+
+@span("analytics.load_cube")
+def load_analytics_cube(user, filters=None) -> AnalyticsCube:
+    """Build the analytics cube for ``user`` from the monthly rollup table.
+
+    Whole months come straight from ``UserMonthRollup``. Only when the date
+    filters cut a month in half is ``Transaction`` queried, and then just for
+    the partial days at the edges of the window.
+    """
+    cube = AnalyticsCube()
+    rollups = UserMonthRollup.objects.filter(user=user).values_list(
+        "month", "category", "type", "payment_mode", "total"
+    )
+    for month_value, category, kind, payment_mode, total in rollups:
+        cube.cells[(month_value, category, kind, payment_mode)] = total or 0
+
+    bounds = _window_bounds(filters)
+    if bounds is None:
+        return cube
+
+    low, high = bounds
+    cube.window = {}
+    if low and high and low > high:
+        return cube
+
+    for (month_value, category, kind, payment_mode), total in cube.cells.items():
+        month_last = month_delta(month_value, 1) - timedelta(days=1)
+        if (low is None or low <= month_value) and (high is None or month_last <= high):
+            window_key = (category, kind, payment_mode)
+            cube.window[window_key] = cube.window.get(window_key, 0) + total
+
+    partial_ranges = _partial_month_ranges(low, high)
+    if partial_ranges:
+        condition = Q()
+        for range_start, range_end in partial_ranges:
+            condition |= Q(date__gte=range_start, date__lt=range_end + timedelta(days=1))
+        edges = (
+            Transaction.objects.filter(condition, user=user)
+            .values("category", "type", "payment_mode")
+            .annotate(total=Sum("amount"))
+            .order_by()
+        )
+        for item in edges:
+            window_key = (item["category"], item["type"], item["payment_mode"])
+            cube.window[window_key] = cube.window.get(window_key, 0) + (item["total"] or 0)
+    return cube
+
+
+@span("analytics.aggregate_totals")
 def aggregate_totals(queryset) -> Totals:
     agg = queryset.aggregate(
         total_income=Sum("amount", filter=Q(type="income")),
@@ -57,22 +221,16 @@ def aggregate_totals(queryset) -> Totals:
     )
 
 
-def category_expense_breakdown(queryset) -> List[Dict[str, float]]:
-    expenses = (
-        queryset.filter(type="expense")
-        .values("category")
-        .annotate(total=Sum("amount"))
-        .order_by("-total")
-    )
-    total_expense = sum(item["total"] or 0 for item in expenses)
+@span("analytics.category_expense_breakdown")
+def category_expense_breakdown(cube: AnalyticsCube, category: Optional[str] = None, payment_mode: Optional[str] = None) -> List[Dict[str, float]]:
+    expenses = cube.category_expenses(category=category, payment_mode=payment_mode, windowed=True)
+    total_expense = sum(expenses.values())
     breakdown = []
-    for item in expenses:
-        category = item["category"]
-        amount = item["total"] or 0
+    for category_key, amount in sorted(expenses.items(), key=lambda item: -item[1]):
         percent = (amount / total_expense * 100) if total_expense else 0
         breakdown.append({
-            "category": category,
-            "label": CATEGORY_LABELS.get(category, category.title()),
+            "category": category_key,
+            "label": CATEGORY_LABELS.get(category_key, category_key.title()),
             "amount": amount,
             "percent": percent,
         })
@@ -81,18 +239,10 @@ def category_expense_breakdown(queryset) -> List[Dict[str, float]]:
 
 def build_category_chart_data(breakdown: Iterable[Dict[str, float]]):
     labels = [item["label"] for item in breakdown]
-    values = [float(item["amount"]) for item in breakdown]
+    values = [rupees_float(item["amount"]) for item in breakdown]
     return {"labels": labels, "values": values}
 
 
-def _month_start(value: date) -> date:
-    return date(value.year, value.month, 1)
-
-
-def _month_end(value: date) -> date:
-    return date(value.year, value.month, monthrange(value.year, value.month)[1])
-
-
 def last_n_months(anchor: date, count: int = 6) -> List[date]:
     months = []
     year = anchor.year
@@ -106,46 +256,33 @@ def last_n_months(anchor: date, count: int = 6) -> List[date]:
     return list(reversed(months))
 
 
-def build_monthly_trend(queryset, anchor: date, count: int = 6) -> Dict[str, List]:
+@span("analytics.monthly_trend")
+def build_monthly_trend(
+    cube: AnalyticsCube,
+    anchor: date,
+    count: int = 6,
+    category: Optional[str] = None,
+    payment_mode: Optional[str] = None,
+) -> Dict[str, List]:
     months = last_n_months(anchor, count=count)
-    start = _month_start(months[0])
-    end = _month_end(months[-1])
-
-    data = (
-        queryset.filter(type="expense", date__gte=start, date__lte=end)
-        .annotate(month=TruncMonth("date"))
-        .values("month")
-        .annotate(total=Sum("amount"))
-        .order_by("month")
-    )
-
-    totals_by_month = {}
-    for item in data:
-        month_value = item["month"]
-        if hasattr(month_value, "date"):
-            month_value = month_value.date()
-        totals_by_month[month_value] = float(item["total"] or 0)
+    totals_by_month = cube.monthly_expenses(category=category, payment_mode=payment_mode)
     labels = [m.strftime("%b %Y") for m in months]
-    values = [totals_by_month.get(m, 0) for m in months]
+    values = [rupees_float(totals_by_month.get(m, 0)) for m in months]
     return {"labels": labels, "values": values}
 
 
 def build_income_expense_chart(totals: Totals) -> Dict[str, List]:
     return {
         "labels": ["Income", "Expense"],
-        "values": [float(totals.total_income), float(totals.total_expense)],
+        "values": [rupees_float(totals.total_income), rupees_float(totals.total_expense)],
     }
 
 
-def build_budget_summary(user, month: date) -> BudgetSummary:
+@span("analytics.budget_summary")
+def build_budget_summary(user, month: date, cube: AnalyticsCube) -> BudgetSummary:
     budget = MonthlyBudget.objects.filter(user=user, month=month).first()
     total_budget = budget.total_amount if budget else 0
-    spent = (
-        Transaction.objects.filter(user=user, type="expense", date__year=month.year, date__month=month.month)
-        .aggregate(total=Sum("amount"))
-        .get("total")
-        or 0
-    )
+    _, spent = cube.month_totals(month)
     remaining = total_budget - spent
     used_percent = (spent / total_budget * 100) if total_budget else 0
 
@@ -168,17 +305,13 @@ def build_budget_summary(user, month: date) -> BudgetSummary:
     )
 
 
-def build_category_budget_rows(user, month: date) -> List[Dict]:
+@span("analytics.category_budget_rows")
+def build_category_budget_rows(user, month: date, cube: AnalyticsCube) -> List[Dict]:
     budgets = {
         item["category"]: item["amount"]
         for item in CategoryBudget.objects.filter(user=user, month=month).values("category", "amount")
     }
-    expenses = (
-        Transaction.objects.filter(user=user, type="expense", date__year=month.year, date__month=month.month)
-        .values("category")
-        .annotate(total=Sum("amount"))
-    )
-    spent_map = {item["category"]: item["total"] or 0 for item in expenses}
+    spent_map = cube.month_category_expenses(month)
 
     rows = []
     for category, label in CATEGORY_LABELS.items():
@@ -198,15 +331,8 @@ def build_category_budget_rows(user, month: date) -> List[Dict]:
     return rows
 
 
-def compute_month_totals(user, month: date) -> Tuple[float, float]:
-    totals = (
-        Transaction.objects.filter(user=user, date__year=month.year, date__month=month.month)
-        .aggregate(
-            income=Sum("amount", filter=Q(type="income")),
-            expense=Sum("amount", filter=Q(type="expense")),
-        )
-    )
-    return (totals["income"] or 0, totals["expense"] or 0)
+def compute_month_totals(cube: AnalyticsCube, month: date) -> Tuple[int, int]:
+    return cube.month_totals(month)
 
 
 def compute_savings_rate(income: float, expense: float) -> float:
@@ -215,10 +341,6 @@ def compute_savings_rate(income: float, expense: float) -> float:
     return (income - expense) / income * 100
 
 
-def _format_currency(amount: float) -> str:
-    return f"₹{amount:,.2f}"
-
-
 def month_delta(month: date, delta: int = -1) -> date:
     year = month.year
     month_num = month.month + delta
@@ -231,10 +353,11 @@ def month_delta(month: date, delta: int = -1) -> date:
     return date(year, month_num, 1)
 
 
-def build_insights(user, month: date) -> List[Dict[str, str]]:
-    current_income, current_expense = compute_month_totals(user, month)
+@span("analytics.insights")
+def build_insights(cube: AnalyticsCube, month: date) -> List[Dict[str, str]]:
+    current_income, current_expense = compute_month_totals(cube, month)
     previous_month = month_delta(month, -1)
-    prev_income, prev_expense = compute_month_totals(user, previous_month)
+    prev_income, prev_expense = compute_month_totals(cube, previous_month)
 
     def pct_change(current: float, previous: float):
         if previous == 0:
@@ -245,20 +368,10 @@ def build_insights(user, month: date) -> List[Dict[str, str]]:
     income_change = pct_change(current_income, prev_income)
     savings_rate = compute_savings_rate(current_income, current_expense)
 
-    top_category = (
-        Transaction.objects.filter(
-            user=user,
-            type="expense",
-            date__year=month.year,
-            date__month=month.month,
-        )
-        .values("category")
-        .annotate(total=Sum("amount"))
-        .order_by("-total")
-        .first()
-    )
+    month_spent = cube.month_category_expenses(month)
+    top_category = max(month_spent, key=month_spent.get) if month_spent else None
 
-    top_label = CATEGORY_LABELS.get(top_category["category"], top_category["category"].title()) if top_category else None
+    top_label = CATEGORY_LABELS.get(top_category, top_category.title()) if top_category else None
 
     insights = []
     if prev_expense == 0 and current_expense == 0:
@@ -266,7 +379,7 @@ def build_insights(user, month: date) -> List[Dict[str, str]]:
     elif prev_expense == 0 and current_expense > 0:
         insights.append({
             "tone": "negative",
-            "text": f"You spent {_format_currency(current_expense)} this month; no expenses last month.",
+            "text": f"You spent {format_currency(current_expense)} this month; no expenses last month.",
         })
     else:
         direction = "more" if expense_change > 0 else "less"
@@ -280,7 +393,7 @@ def build_insights(user, month: date) -> List[Dict[str, str]]:
     elif prev_income == 0 and current_income > 0:
         insights.append({
             "tone": "positive",
-            "text": f"You earned {_format_currency(current_income)} this month; no income last month.",
+            "text": f"You earned {format_currency(current_income)} this month; no income last month.",
         })
     else:
         direction = "more" if income_change > 0 else "less"
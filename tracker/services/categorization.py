@@ -1,4 +1,13 @@
-from typing import Optional
+import csv
+import logging
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
 
 
 KEYWORD_CATEGORY_MAP = {
@@ -11,11 +20,169 @@ KEYWORD_CATEGORY_MAP = {
 }
 
 
+@dataclass(frozen=True)
+class KeywordRule:
+    keyword: str
+    category: str
+    # Lower wins; ties go to the rule loaded first.
+    priority: int = 0
+    # Only match when not surrounded by letters/digits ("bus" vs "business").
+    word_boundary: bool = False
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum()
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton over lowercase keywords.
+
+    ``match`` scans the text once, whatever the number of keywords, and
+    returns the category of the best matching rule: lowest ``priority``,
+    then earliest loaded. With the built-in map that is exactly the old
+    first-category-with-any-substring behaviour.
+    """
+
+    def __init__(self, rules: Iterable[KeywordRule]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # Per node: (rank, keyword length, category, word_boundary, keyword), best first.
+        self._out: List[List[Tuple[Tuple[int, int], int, str, bool, str]]] = [[]]
+        self.size = 0
+        for order, rule in enumerate(rules):
+            keyword = rule.keyword.strip().lower()
+            if not keyword:
+                continue
+            node = 0
+            for ch in keyword:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                node = nxt
+            self._out[node].append(((rule.priority, order), len(keyword), rule.category, rule.word_boundary, keyword))
+            self.size += 1
+        self._build_failure_links()
+        ranks = [outs[0][0] for outs in self._out if outs]
+        self._best_rank = min(ranks) if ranks else None
+
+    def _build_failure_links(self) -> None:
+        pending = deque(self._goto[0].values())
+        while pending:
+            node = pending.popleft()
+            for ch, child in self._goto[node].items():
+                pending.append(child)
+                fallback = self._fail[node]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(ch, 0)
+                self._fail[child] = target if target != child else 0
+                # Keywords ending here include those ending at the failure node.
+                self._out[child] = sorted(self._out[child] + self._out[self._fail[child]])
+        for node, outs in enumerate(self._out):
+            self._out[node] = sorted(outs)
+
+    def match(self, text: str) -> Optional[str]:
+        found = self.match_keyword(text)
+        return found[1] if found else None
+
+    def match_keyword(self, text: str) -> Optional[Tuple[str, str]]:
+        """``(keyword, category)`` of the winning rule, or None."""
+        if not text or self._best_rank is None:
+            return None
+        value = text.lower()
+        goto, fail, out = self._goto, self._fail, self._out
+        best = None
+        node = 0
+        for idx, ch in enumerate(value):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            for rank, length, category, word_boundary, keyword in out[node]:
+                if best is not None and rank >= best[0]:
+                    break
+                if word_boundary:
+                    start = idx - length + 1
+                    if (start > 0 and _is_word_char(value[start - 1])) or (
+                        idx + 1 < len(value) and _is_word_char(value[idx + 1])
+                    ):
+                        continue
+                best = (rank, keyword, category)
+                break
+            if best is not None and best[0] == self._best_rank:
+                break
+        return best[1:] if best else None
+
+    def match_many(self, texts: Iterable[str]) -> List[Optional[str]]:
+        seen: Dict[str, Optional[str]] = {}
+        results = []
+        for text in texts:
+            key = (text or "").lower()
+            if key not in seen:
+                seen[key] = self.match(key)
+            results.append(seen[key])
+        return results
+
+
+def builtin_rules() -> List[KeywordRule]:
+    return [
+        KeywordRule(keyword, category)
+        for category, keywords in KEYWORD_CATEGORY_MAP.items()
+        for keyword in keywords
+    ]
+
+
+def load_keyword_file(path: str) -> List[KeywordRule]:
+    """Read ``keyword,category[,priority[,word_boundary]]`` rows; ``#`` lines are comments."""
+    from tracker.models import Transaction
+
+    valid = {value for value, _ in Transaction.CATEGORY_CHOICES}
+    rules = []
+    with open(path, newline="", encoding="utf-8") as handle:
+        for line_no, row in enumerate(csv.reader(handle), start=1):
+            if not row or not row[0].strip() or row[0].lstrip().startswith("#"):
+                continue
+            if len(row) < 2 or row[1].strip() not in valid:
+                logger.warning("Skipping keyword file %s line %s: %r", path, line_no, row)
+                continue
+            try:
+                priority = int(row[2]) if len(row) > 2 and row[2].strip() else 0
+            except ValueError:
+                logger.warning("Skipping keyword file %s line %s: bad priority %r", path, line_no, row[2])
+                continue
+            word_boundary = len(row) > 3 and row[3].strip().lower() in ("1", "true", "yes", "word")
+            rules.append(KeywordRule(row[0], row[1].strip(), priority, word_boundary))
+    return rules
+
+
+_matcher_lock = threading.Lock()
+_matcher: Optional[KeywordMatcher] = None
+_matcher_source: Optional[str] = None
+
+
+def get_matcher() -> KeywordMatcher:
+    """Process-wide matcher over the built-in map plus CATEGORY_KEYWORDS_FILE."""
+    global _matcher, _matcher_source
+    path = getattr(settings, "CATEGORY_KEYWORDS_FILE", "") or ""
+    with _matcher_lock:
+        if _matcher is None or _matcher_source != path:
+            rules = builtin_rules()
+            if path:
+                try:
+                    rules += load_keyword_file(path)
+                except OSError:
+                    logger.exception("Could not read CATEGORY_KEYWORDS_FILE %s", path)
+            _matcher, _matcher_source = KeywordMatcher(rules), path
+        return _matcher
+
+
 def suggest_category(description: str) -> Optional[str]:
-    if not description:
-        return None
-    value = description.lower()
-    for category, keywords in KEYWORD_CATEGORY_MAP.items():
-        if any(keyword in value for keyword in keywords):
-            return category
-    return None
+    return get_matcher().match(description)
+
+
+def suggest_categories(descriptions: Iterable[str]) -> List[Optional[str]]:
+    """``suggest_category`` for many descriptions; repeats are matched once."""
+    return get_matcher().match_many(descriptions)
@@ -0,0 +1,117 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import replace
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db.models import F
+
+from tracker.models import Profile
+
+
+class DashboardCache:
+    """Bounded in-process LRU for computed dashboard context parts.
+
+    Keys carry the user's data version, so a write never needs to find and
+    delete entries: it bumps the version and stale entries simply age out.
+    """
+
+    def __init__(self, max_entries: int = 512, ttl: float = 300):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.ttl > 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        if not self.enabled:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at <= now:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_build(self, key: Hashable, builder: Callable[[], Any]) -> Any:
+        value = self.get(key)
+        if value is None:
+            value = builder()
+            self.set(key, value)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": (self.hits / lookups) if lookups else 0,
+            }
+
+
+dashboard_cache = DashboardCache(
+    max_entries=int(getattr(settings, "DASHBOARD_CACHE_MAX_ENTRIES", 512)),
+    ttl=float(getattr(settings, "DASHBOARD_CACHE_TTL", 300)),
+)
+
+
+def get_data_version(user) -> int:
+    try:
+        return user.profile.data_version
+    except Profile.DoesNotExist:
+        return 0
+
+
+def bump_data_version(user) -> None:
+    """Invalidate every cached dashboard entry for ``user`` (a User or its id)."""
+    Profile.objects.filter(user_id=getattr(user, "pk", user)).update(data_version=F("data_version") + 1)
+    if not isinstance(user, User):
+        return
+    try:
+        user.profile.refresh_from_db(fields=["data_version"])
+    except Profile.DoesNotExist:
+        pass
+
+
+def dashboard_cache_key(user, filters, today) -> tuple:
+    # The sort order only affects the transaction list, which is never cached.
+    return (user.pk, get_data_version(user), today, replace(filters, sort=""))
@@ -0,0 +1,244 @@
+import logging
+import math
+import queue
+import random
+import threading
+import time
+from itertools import islice
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import connections
+
+from tracker.services.email_sender import SMTPSession, active_provider, is_retryable_error, send_app_email
+from tracker.services.email_service import EmailContent, claim_emails, release_claims
+
+logger = logging.getLogger(__name__)
+
+Sender = Callable[[str, str, str], Optional[str]]
+
+
+class TokenBucket:
+    """Blocking token bucket: ``rate`` tokens per second, up to ``burst`` saved.
+
+    A ``rate`` of 0 (or None) disables limiting.
+    """
+
+    def __init__(self, rate: Optional[float], burst: Optional[int] = None, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate or 0
+        self.capacity = max(1, burst or int(self.rate) or 1)
+        self._tokens = float(self.capacity)
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Take one token, sleeping until it is available. Returns seconds waited."""
+        if not self.rate:
+            return 0.0
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) / self.rate
+            self._sleep(delay)
+            waited += delay
+
+
+def _percentile(ordered: List[float], pct: float) -> float:
+    if not ordered:
+        return 0.0
+    # Nearest-rank percentile.
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+@dataclass
+class DispatchStats:
+    sent: int = 0
+    skipped: int = 0
+    failed: int = 0
+    retries: int = 0
+    elapsed: float = 0.0
+    latencies: List[float] = field(default_factory=list)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def record(self, outcome: str, latency: Optional[float] = None) -> None:
+        with self._lock:
+            setattr(self, outcome, getattr(self, outcome) + 1)
+            if latency is not None:
+                self.latencies.append(latency)
+
+    def add_retry(self) -> None:
+        with self._lock:
+            self.retries += 1
+
+    def summary(self) -> Dict[str, float]:
+        ordered = sorted(self.latencies)
+        return {
+            "sent": self.sent,
+            "skipped": self.skipped,
+            "failed": self.failed,
+            "retries": self.retries,
+            "seconds": round(self.elapsed, 3),
+            "per_second": round(self.sent / self.elapsed, 2) if self.elapsed else 0.0,
+            "p50_ms": round(_percentile(ordered, 50) * 1000, 1),
+            "p90_ms": round(_percentile(ordered, 90) * 1000, 1),
+            "p99_ms": round(_percentile(ordered, 99) * 1000, 1),
+        }
+
+
+class EmailDispatcher:
+    """Deliver behavior emails from a pool of worker threads.
+
+    Every attempt takes a token from the shared bucket and a slot from the
+    active provider's concurrency cap. Transient failures are retried with
+    exponential backoff and jitter. Jobs are claimed a chunk at a time
+    with ``claim_emails`` (safe across threads and processes), and the
+    claims of emails that failed are released in bulk as chunks complete.
+    """
+
+    def __init__(
+        self,
+        workers: int = 1,
+        rate: Optional[float] = None,
+        burst: Optional[int] = None,
+        retries: Optional[int] = None,
+        backoff: Optional[float] = None,
+        provider_caps: Optional[Dict[str, int]] = None,
+        sender: Optional[Sender] = None,
+        sleep=time.sleep,
+    ):
+        self.workers = max(1, workers)
+        self.bucket = TokenBucket(
+            rate if rate is not None else getattr(settings, "EMAIL_RATE_LIMIT", 0),
+            burst if burst is not None else getattr(settings, "EMAIL_RATE_BURST", None),
+            sleep=sleep,
+        )
+        self.retries = retries if retries is not None else int(getattr(settings, "EMAIL_SEND_RETRIES", 3))
+        self.backoff = backoff if backoff is not None else float(getattr(settings, "EMAIL_RETRY_BACKOFF", 1.0))
+        caps = provider_caps if provider_caps is not None else getattr(settings, "EMAIL_PROVIDER_CONCURRENCY", {})
+        self._slots = {name: threading.BoundedSemaphore(max(1, cap)) for name, cap in caps.items()}
+        self.sender = sender
+        self._sleep = sleep
+        self.stats = DispatchStats()
+        self._local = threading.local()
+        self._sessions: List[SMTPSession] = []
+        self._sessions_lock = threading.Lock()
+        self._failed_keys: List[str] = []
+        self._failed_lock = threading.Lock()
+
+    def _smtp_session(self) -> SMTPSession:
+        session = getattr(self._local, "smtp", None)
+        if session is None:
+            session = self._local.smtp = SMTPSession()
+            with self._sessions_lock:
+                self._sessions.append(session)
+        return session
+
+    def _transport(self, provider: Optional[str]) -> Sender:
+        if self.sender is not None:
+            return self.sender
+        if provider == "smtp":
+            # One persistent connection per worker thread for the whole run.
+            return self._smtp_session().send
+        return send_app_email
+
+    def deliver(self, to_email: str, subject: str, body: str) -> Optional[str]:
+        """``send_app_email`` with rate limiting, provider caps and retries."""
+        provider = active_provider()
+        send = self._transport(provider)
+        slot = self._slots.get(provider)
+        attempt = 0
+        while True:
+            self.bucket.acquire()
+            if slot is None:
+                error = send(to_email, subject, body)
+            else:
+                with slot:
+                    error = send(to_email, subject, body)
+            if not error or not is_retryable_error(error) or attempt >= self.retries:
+                return error
+            attempt += 1
+            self.stats.add_retry()
+            delay = self.backoff * (2 ** (attempt - 1))
+            self._sleep(delay + random.uniform(0, delay / 2))
+
+    def _send_one(self, job: Tuple[object, EmailContent, str]) -> None:
+        user, content, key = job
+        started = time.perf_counter()
+        try:
+            error = self.deliver(user.email, content.subject, content.body)
+        except Exception as exc:
+            logger.exception("Behavior email to user %s failed", user.pk)
+            error = str(exc) or exc.__class__.__name__
+        if error:
+            logger.warning("Behavior email to user %s failed: %s", user.pk, error)
+            self.stats.record("failed")
+            with self._failed_lock:
+                self._failed_keys.append(key)
+        else:
+            self.stats.record("sent", time.perf_counter() - started)
+
+    def _release_failed(self) -> None:
+        with self._failed_lock:
+            keys, self._failed_keys = self._failed_keys, []
+        release_claims(keys)
+
+    def _worker(self, jobs: "queue.Queue") -> None:
+        try:
+            while True:
+                job = jobs.get()
+                if job is None:
+                    return
+                self._send_one(job)
+        finally:
+            # Each worker thread owns its own DB connection.
+            connections.close_all()
+
+    def run(self, jobs: Iterable[Tuple[object, EmailContent]], chunk_size: int = 500) -> DispatchStats:
+        """Send ``(user, content)`` jobs, claiming and releasing EmailLog rows per chunk."""
+        started = time.perf_counter()
+        pending: Optional["queue.Queue"] = None
+        threads: List[threading.Thread] = []
+        if self.workers > 1:
+            pending = queue.Queue(maxsize=self.workers * 4)
+            threads = [
+                threading.Thread(target=self._worker, args=(pending,), name=f"email-{idx}", daemon=True)
+                for idx in range(self.workers)
+            ]
+            for thread in threads:
+                thread.start()
+
+        iterator = iter(jobs)
+        while True:
+            chunk = list(islice(iterator, max(1, chunk_size)))
+            if not chunk:
+                break
+            claimed = claim_emails(chunk)
+            for _ in range(len(chunk) - len(claimed)):
+                # No address, or already sent this week.
+                self.stats.record("skipped")
+            for job in claimed:
+                if pending is None:
+                    self._send_one(job)
+                else:
+                    pending.put(job)
+            self._release_failed()
+
+        for _ in threads:
+            pending.put(None)
+        for thread in threads:
+            thread.join()
+        self._release_failed()
+        for session in self._sessions:
+            session.close()
+        self.stats.elapsed = time.perf_counter() - started
+        return self.stats
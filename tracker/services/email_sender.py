@@ -1,8 +1,11 @@
 import logging
-from typing import Optional
+import smtplib
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
 
 from django.conf import settings
-from django.core.mail import send_mail
+from django.core.mail import EmailMessage, get_connection, send_mail
 
 logger = logging.getLogger(__name__)
 
@@ -69,25 +72,63 @@ def _build_sendgrid_payload(to_email: str, subject: str, body: str):
     }, None
 
 
-def _send_via_sendgrid_api(to_email: str, subject: str, body: str) -> Optional[str]:
-    try:
-        from sendgrid import SendGridAPIClient
-    except Exception:
-        logger.exception("SendGrid library not available")
-        return "Email service not configured"
+class SendGridClient:
+    """Keep-alive HTTP client for the SendGrid v3 mail/send endpoint.
 
-    payload, payload_error = _build_sendgrid_payload(to_email, subject, body)
-    if payload_error:
-        return _sendgrid_sender_error(payload_error)
+    One instance is shared by the whole process (see ``get_sendgrid_client``)
+    so OTPs and bulk runs reuse pooled TLS connections instead of opening a
+    new one per message.
+    """
+
+    def __init__(self, api_key: str, url: str, timeout: float, pool_size: int = 8):
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self.api_key = api_key
+        self.url = url
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers.update({
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json",
+        })
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(1, pool_size))
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def send(self, payload: dict) -> Tuple[int, str]:
+        response = self.session.post(self.url, json=payload, timeout=self.timeout)
+        return response.status_code, response.text
 
+    def close(self) -> None:
+        self.session.close()
+
+
+_client_lock = threading.Lock()
+_client: Optional[SendGridClient] = None
+
+
+def get_sendgrid_client() -> SendGridClient:
+    global _client
+    api_key = settings.SENDGRID_API_KEY
+    url = getattr(settings, "SENDGRID_API_URL", "https://api.sendgrid.com/v3/mail/send")
+    with _client_lock:
+        if _client is None or _client.api_key != api_key or _client.url != url:
+            if _client is not None:
+                _client.close()
+            _client = SendGridClient(
+                api_key,
+                url,
+                timeout=getattr(settings, "EMAIL_TIMEOUT", 10),
+                pool_size=getattr(settings, "EMAIL_PROVIDER_CONCURRENCY", {}).get("sendgrid", 8),
+            )
+        return _client
+
+
+def _post_sendgrid(payload: dict) -> Optional[str]:
     try:
-        sg = SendGridAPIClient(api_key=settings.SENDGRID_API_KEY)
-        response = sg.client.mail.send.post(request_body=payload)
-        status = getattr(response, "status_code", None)
-        if status and not (200 <= status < 300):
-            body_text = getattr(response, "body", b"")
-            if isinstance(body_text, bytes):
-                body_text = body_text.decode("utf-8", "ignore")
+        status, body_text = get_sendgrid_client().send(payload)
+        if not (200 <= status < 300):
             if settings.DEBUG:
                 return f"Failed to send email: SendGrid {status} {body_text}"
             return "Failed to send email. Try again."
@@ -100,6 +141,13 @@ def _send_via_sendgrid_api(to_email: str, subject: str, body: str) -> Optional[s
     return None
 
 
+def _send_via_sendgrid_api(to_email: str, subject: str, body: str) -> Optional[str]:
+    payload, payload_error = _build_sendgrid_payload(to_email, subject, body)
+    if payload_error:
+        return _sendgrid_sender_error(payload_error)
+    return _post_sendgrid(payload)
+
+
 def _send_via_smtp(to_email: str, subject: str, body: str) -> Optional[str]:
     try:
         send_mail(
@@ -112,20 +160,179 @@ def _send_via_smtp(to_email: str, subject: str, body: str) -> Optional[str]:
         return None
     except Exception as exc:
         logger.exception("SMTP send failed")
-        if settings.DEBUG:
-            return f"Failed to send email: {exc}"
-        return "Failed to send email. Try again."
+        return _smtp_error(exc)
 
 
-def send_app_email(to_email: str, subject: str, body: str) -> Optional[str]:
+def _smtp_error(exc: Exception) -> str:
+    if settings.DEBUG:
+        return f"Failed to send email: {exc}"
+    return "Failed to send email. Try again."
+
+
+class SMTPSession:
+    """One authenticated SMTP connection reused across many messages.
+
+    ``send_mail`` connects, logs in and quits for every message. A session
+    opens the connection lazily through ``get_connection`` and keeps it
+    until ``close``; a dropped connection is reopened once per message
+    before that message is reported as failed. Not thread-safe: use one
+    session per thread.
+    """
+
+    def __init__(self):
+        self.connection = None
+        self.connects = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _open(self):
+        if self.connection is None:
+            connection = get_connection(fail_silently=False)
+            connection.open()
+            self.connection = connection
+            self.connects += 1
+        return self.connection
+
+    def close(self) -> None:
+        if self.connection is not None:
+            try:
+                self.connection.close()
+            except Exception:
+                pass
+            self.connection = None
+
+    def send_message(self, message: EmailMessage) -> Optional[str]:
+        for attempt in range(2):
+            try:
+                message.connection = self._open()
+                message.send(fail_silently=False)
+                return None
+            except (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError) as exc:
+                error = exc
+            except smtplib.SMTPException as exc:
+                # Refused recipient, rejected data, auth failure: the server
+                # answered, so reconnecting won't help. SMTPException is an
+                # OSError, hence this clause before the socket-error one.
+                logger.exception("SMTP send failed")
+                return _smtp_error(exc)
+            except OSError as exc:
+                error = exc
+            except Exception as exc:
+                logger.exception("SMTP send failed")
+                return _smtp_error(exc)
+            self.close()
+            if attempt:
+                logger.error("SMTP send failed after reconnect: %s", error)
+                return _smtp_error(error)
+        return None
+
+    def send(self, to_email: str, subject: str, body: str) -> Optional[str]:
+        return self.send_message(EmailMessage(subject, body, settings.DEFAULT_FROM_EMAIL, [to_email]))
+
+    def send_many(self, messages: Iterable[EmailMessage]) -> List[Optional[str]]:
+        return [self.send_message(message) for message in messages]
+
+
+# Errors that will not go away by sending again (configuration or input).
+PERMANENT_ERROR_MARKERS = ("not configured", "is required", "verified custom-domain")
+
+
+def is_retryable_error(error: Optional[str]) -> bool:
+    return bool(error) and not any(marker in error for marker in PERMANENT_ERROR_MARKERS)
+
+
+def active_provider() -> Optional[str]:
+    """Name of the transport ``send_app_email`` will use: smtp, sendgrid or None."""
     if getattr(settings, "USE_GMAIL_SMTP", False):
+        return "smtp"
+    if settings.SENDGRID_API_KEY:
+        return "sendgrid"
+    return None
+
+
+def send_app_email(to_email: str, subject: str, body: str) -> Optional[str]:
+    provider = active_provider()
+    if provider == "smtp":
         logger.info("Using Gmail SMTP for app email because USE_GMAIL_SMTP=True.")
         return _send_via_smtp(to_email, subject, body)
 
-    if settings.SENDGRID_API_KEY:
+    if provider == "sendgrid":
         return _send_via_sendgrid_api(to_email, subject, body)
 
     logger.error("SENDGRID_API_KEY missing and Gmail SMTP fallback is disabled.")
     if settings.DEBUG:
         return "Failed to send email: Email service not configured"
     return "Email service not configured"
+
+
+# SendGrid accepts at most this many personalizations per mail/send request.
+SENDGRID_MAX_PERSONALIZATIONS = 1000
+
+
+@dataclass
+class BulkEmail:
+    to_email: str
+    subject: str
+    body: str
+    # Tag -> value, e.g. {"-amount-": "₹1,200.00"}; applied to subject and body.
+    substitutions: Dict[str, str] = field(default_factory=dict)
+
+
+def _substitute(text: str, substitutions: Dict[str, str]) -> str:
+    for tag, value in substitutions.items():
+        text = text.replace(tag, value)
+    return text
+
+
+def send_bulk_email(messages: Iterable[BulkEmail]) -> List[Optional[str]]:
+    """Send ``messages`` and return one error (or None) per message, in order.
+
+    With SendGrid, messages sharing a subject/body template go out as one
+    request per ``SENDGRID_MAX_PERSONALIZATIONS`` recipients, each recipient
+    in its own personalization so nobody sees anyone else's address. SMTP
+    sends them all over one ``SMTPSession``.
+    """
+    messages = list(messages)
+    provider = active_provider()
+    if provider == "smtp":
+        with SMTPSession() as session:
+            return [
+                session.send(item.to_email, _substitute(item.subject, item.substitutions), _substitute(item.body, item.substitutions))
+                for item in messages
+            ]
+    if provider != "sendgrid":
+        return [
+            send_app_email(item.to_email, _substitute(item.subject, item.substitutions), _substitute(item.body, item.substitutions))
+            for item in messages
+        ]
+
+    results: List[Optional[str]] = [None] * len(messages)
+    groups: Dict[Tuple[str, str], List[int]] = {}
+    for idx, item in enumerate(messages):
+        if not (item.to_email or "").strip():
+            results[idx] = _sendgrid_sender_error("Recipient email is required")
+            continue
+        groups.setdefault((item.subject, item.body), []).append(idx)
+
+    for (subject, body), indexes in groups.items():
+        payload, payload_error = _build_sendgrid_payload(messages[indexes[0]].to_email, subject, body)
+        if payload_error:
+            for idx in indexes:
+                results[idx] = _sendgrid_sender_error(payload_error)
+            continue
+        for start in range(0, len(indexes), SENDGRID_MAX_PERSONALIZATIONS):
+            chunk = indexes[start:start + SENDGRID_MAX_PERSONALIZATIONS]
+            personalizations = []
+            for idx in chunk:
+                personalization = {"to": [{"email": messages[idx].to_email.strip()}]}
+                if messages[idx].substitutions:
+                    personalization["substitutions"] = messages[idx].substitutions
+                personalizations.append(personalization)
+            error = _post_sendgrid({**payload, "personalizations": personalizations})
+            for idx in chunk:
+                results[idx] = error
+    return results
@@ -1,14 +1,18 @@
 from dataclasses import dataclass
-from datetime import date, timedelta
-from typing import Optional
+from datetime import date, datetime, time, timedelta
+from typing import Callable, Iterable, List, Optional, Sequence, Set, Tuple
 
 from django.utils import timezone
+from django.db import IntegrityError
+from django.db import transaction as db_transaction
 from django.db.models import Sum
 
 from tracker.models import EmailLog, Transaction
 from tracker.services.prediction_service import _month_start
 from tracker.models import Transaction as TransactionModel
 from tracker.services.email_sender import send_app_email
+from tracker.services.filters import month_range
+from tracker.services.money import format_currency
 
 
 @dataclass
@@ -19,17 +23,14 @@ class EmailContent:
     related_month: date
 
 
-def _format_currency(amount: float) -> str:
-    return f"₹{amount:,.2f}"
-
-
 def _top_category(user, month: date) -> str:
+    start, end = month_range(month)
     top = (
         Transaction.objects.filter(
             user=user,
             type="expense",
-            date__year=month.year,
-            date__month=month.month,
+            date__gte=start,
+            date__lt=end,
         )
         .values("category")
         .order_by()
@@ -46,7 +47,7 @@ def _top_category(user, month: date) -> str:
 def build_email_content(user, prediction, risk_level: str, today: date, force_type: Optional[str] = None) -> EmailContent:
     current_month = _month_start(today)
     related_month = prediction.month if force_type == "prediction" else current_month
-    projected = _format_currency(prediction.predicted_expense)
+    projected = format_currency(prediction.predicted_expense)
     top_category = _top_category(user, current_month)
 
     if risk_level == "high":
@@ -78,34 +79,117 @@ def build_email_content(user, prediction, risk_level: str, today: date, force_ty
     return EmailContent(subject=subject, body=body, email_type=force_type or "healthy", related_month=related_month)
 
 
+def _week_start(today: Optional[date] = None) -> date:
+    today = today or timezone.localdate()
+    return today - timedelta(days=today.weekday())
+
+
+def _week_start_at(week_start: date) -> datetime:
+    # Midnight in the active timezone: a plain range on sent_at keeps the
+    # (user, email_type, related_month, sent_at) index usable, unlike
+    # sent_at__date, which casts the column.
+    return timezone.make_aware(datetime.combine(week_start, time.min))
+
+
 def should_send_email(user, email_type: str, related_month: date) -> bool:
-    week_start = timezone.localdate() - timedelta(days=timezone.localdate().weekday())
     return not EmailLog.objects.filter(
         user=user,
         email_type=email_type,
         related_month=related_month,
-        sent_at__date__gte=week_start,
+        sent_at__gte=_week_start_at(_week_start()),
     ).exists()
 
 
-def send_behavior_email(user, email_content: EmailContent) -> bool:
+def sent_this_week(user_ids: Iterable[int], week_start: date) -> Set[Tuple[int, str, Optional[date]]]:
+    """(user_id, email_type, related_month) of every email logged since ``week_start``."""
+    return set(
+        EmailLog.objects.filter(user_id__in=list(user_ids), sent_at__gte=_week_start_at(week_start))
+        .values_list("user_id", "email_type", "related_month")
+    )
+
+
+def dedup_key(user, email_type: str, related_month: Optional[date], week_start: Optional[date] = None) -> str:
+    month = related_month.isoformat() if related_month else "-"
+    return f"{user.pk}:{email_type}:{month}:{(week_start or _week_start()).isoformat()}"
+
+
+def claim_email(user, email_type: str, related_month: Optional[date]) -> Optional[EmailLog]:
+    """Reserve this week's ``email_type`` email for ``user``, or None if taken.
+
+    The unique ``dedup_key`` makes the claim atomic, so parallel workers (or
+    overlapping command runs) cannot both send it.
+    """
+    if not should_send_email(user, email_type, related_month):
+        return None
+    try:
+        with db_transaction.atomic():
+            return EmailLog.objects.create(
+                user=user,
+                email_type=email_type,
+                related_month=related_month,
+                dedup_key=dedup_key(user, email_type, related_month),
+            )
+    except IntegrityError:
+        return None
+
+
+def claim_emails(jobs: Sequence[Tuple[object, EmailContent]]) -> List[Tuple[object, EmailContent, str]]:
+    """Claim a whole chunk of behavior emails; returns the ``(user, content, dedup_key)`` won.
+
+    One query loads what was already sent this week and one bulk INSERT
+    writes the claims. If another run claimed any of them in between, the
+    insert conflicts and the chunk falls back to per-email ``claim_email``.
+    """
+    week_start = _week_start()
+    jobs = [(user, content) for user, content in jobs if user.email]
+    already_sent = sent_this_week({user.pk for user, _ in jobs}, week_start)
+    pending = {}
+    for user, content in jobs:
+        if (user.pk, content.email_type, content.related_month) in already_sent:
+            continue
+        key = dedup_key(user, content.email_type, content.related_month, week_start)
+        pending.setdefault(key, (user, content))
+    if not pending:
+        return []
+
+    try:
+        with db_transaction.atomic():
+            EmailLog.objects.bulk_create([
+                EmailLog(user=user, email_type=content.email_type, related_month=content.related_month, dedup_key=key)
+                for key, (user, content) in pending.items()
+            ])
+        return [(user, content, key) for key, (user, content) in pending.items()]
+    except IntegrityError:
+        claimed = []
+        for key, (user, content) in pending.items():
+            claim = claim_email(user, content.email_type, content.related_month)
+            if claim is not None:
+                claimed.append((user, content, claim.dedup_key))
+        return claimed
+
+
+def release_claims(keys: Iterable[str]) -> None:
+    """Drop claims for emails that failed, so a later run can try again."""
+    keys = list(keys)
+    if keys:
+        EmailLog.objects.filter(dedup_key__in=keys).delete()
+
+
+def send_behavior_email(user, email_content: EmailContent, send: Callable[[str, str, str], Optional[str]] = send_app_email) -> bool:
     if not user.email:
         return False
 
-    if not should_send_email(user, email_content.email_type, email_content.related_month):
+    claim = claim_email(user, email_content.email_type, email_content.related_month)
+    if claim is None:
         return False
 
-    error = send_app_email(
+    error = send(
         user.email,
         email_content.subject,
         email_content.body,
     )
     if error:
+        # Release the claim so a later run can try again.
+        claim.delete()
         return False
-
-    EmailLog.objects.create(
-        user=user,
-        email_type=email_content.email_type,
-        related_month=email_content.related_month,
-    )
     return True
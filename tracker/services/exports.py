@@ -0,0 +1,44 @@
+import csv
+from typing import Iterator
+
+from django.conf import settings
+
+from tracker.models import Transaction
+from tracker.services.money import format_rupees
+
+TRANSACTION_CSV_HEADER = ["Date", "Type", "Category", "Payment", "Description", "Amount"]
+
+TYPE_LABELS = dict(Transaction.TYPE_CHOICES)
+CATEGORY_LABELS = dict(Transaction.CATEGORY_CHOICES)
+PAYMENT_LABELS = dict(Transaction.PAYMENT_CHOICES)
+
+
+class _Echo:
+    """File-like object whose ``write`` hands the CSV line straight back."""
+
+    def write(self, value):
+        return value
+
+
+def export_chunk_size() -> int:
+    return int(getattr(settings, "EXPORT_CHUNK_SIZE", 2000))
+
+
+def iter_transaction_csv(queryset, chunk_size: int = None) -> Iterator[str]:
+    """Yield the transactions export one CSV line at a time.
+
+    Rows are read as plain tuples through a server-side cursor, so memory
+    stays flat however long the history is.
+    """
+    writer = csv.writer(_Echo())
+    yield writer.writerow(TRANSACTION_CSV_HEADER)
+    rows = queryset.values_list("date", "type", "category", "payment_mode", "description", "amount")
+    for day, kind, category, payment_mode, description, amount in rows.iterator(chunk_size=chunk_size or export_chunk_size()):
+        yield writer.writerow([
+            day.isoformat(),
+            TYPE_LABELS.get(kind, kind),
+            CATEGORY_LABELS.get(category, category),
+            PAYMENT_LABELS.get(payment_mode, payment_mode),
+            description,
+            format_rupees(amount),
+        ])
@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 from datetime import date
-from typing import Optional
+from typing import Optional, Tuple
 
 from django.utils import timezone
 
@@ -63,9 +63,22 @@ def parse_filters(request) -> DashboardFilters:
     )
 
 
+def month_range(value: date) -> Tuple[date, date]:
+    """Half-open ``[first day, first day of next month)`` bounds for ``value``'s month.
+
+    Filter with ``date__gte``/``date__lt`` rather than ``date__year``/``date__month``
+    so the (user, date) indexes can serve the lookup as a range scan.
+    """
+    start = date(value.year, value.month, 1)
+    if start.month == 12:
+        return start, date(start.year + 1, 1, 1)
+    return start, date(start.year, start.month + 1, 1)
+
+
 def apply_filters(queryset, filters: DashboardFilters):
     if filters.month:
-        queryset = queryset.filter(date__year=filters.month.year, date__month=filters.month.month)
+        start, end = month_range(filters.month)
+        queryset = queryset.filter(date__gte=start, date__lt=end)
     if filters.start_date:
         queryset = queryset.filter(date__gte=filters.start_date)
     if filters.end_date:
@@ -78,7 +91,9 @@ def apply_filters(queryset, filters: DashboardFilters):
 
 
 def apply_sort(queryset, filters: DashboardFilters):
-    return queryset.order_by(SORT_MAP.get(filters.sort, "-date"))
+    order = SORT_MAP.get(filters.sort, "-date")
+    # id breaks ties so the order is stable enough for keyset pagination.
+    return queryset.order_by(order, "-id" if order.startswith("-") else "id")
 
 
 def resolve_budget_month(filters: DashboardFilters) -> date:
@@ -0,0 +1,179 @@
+import codecs
+import csv
+import logging
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import transaction as db_transaction
+
+from tracker.models import Transaction
+from tracker.services.dashboard_cache import bump_data_version
+from tracker.services.exports import CATEGORY_LABELS, PAYMENT_LABELS, TRANSACTION_CSV_HEADER, TYPE_LABELS
+from tracker.services.learned_categorizer import learn, predict_categories
+from tracker.services.money import to_paise
+from tracker.services.rollups import RollupKey, apply_deltas, rollup_key
+
+logger = logging.getLogger(__name__)
+
+# Keep at most this many row errors in the result; the rest are only counted.
+MAX_REPORTED_ERRORS = 100
+
+
+def _lookup(choices: Dict[str, str]) -> Dict[str, str]:
+    # Accept both stored values ("online") and export labels ("Online Money").
+    table = {value.lower(): value for value in choices}
+    table.update({label.lower(): value for value, label in choices.items()})
+    return table
+
+
+TYPES = _lookup(TYPE_LABELS)
+CATEGORIES = _lookup(CATEGORY_LABELS)
+PAYMENTS = _lookup(PAYMENT_LABELS)
+COLUMNS = [name.lower() for name in TRANSACTION_CSV_HEADER]
+
+
+class ImportFormatError(ValueError):
+    """The file is not a transactions CSV (missing or unknown header)."""
+
+
+@dataclass
+class ImportResult:
+    rows: int = 0
+    created: int = 0
+    skipped: int = 0
+    auto_categorized: int = 0
+    errors: List[Tuple[int, str]] = field(default_factory=list)
+
+    def add_error(self, line: int, message: str) -> None:
+        self.skipped += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((line, message))
+
+
+def import_chunk_size() -> int:
+    return int(getattr(settings, "IMPORT_CHUNK_SIZE", 2000))
+
+
+def text_lines(binary_lines: Iterable[bytes]) -> Iterator[str]:
+    """Decode an upload or a file opened in "rb" line by line (BOM-tolerant)."""
+    return codecs.iterdecode(binary_lines, "utf-8-sig")
+
+
+def _column_index(header: List[str]) -> Dict[str, int]:
+    names = [name.strip().lower() for name in header]
+    missing = [name for name in COLUMNS if name not in names]
+    if missing:
+        raise ImportFormatError(f"Missing column(s): {', '.join(missing)}")
+    return {name: names.index(name) for name in COLUMNS}
+
+
+def _parse_row(row: List[str], columns: Dict[str, int]) -> dict:
+    def cell(name: str) -> str:
+        idx = columns[name]
+        return row[idx].strip() if idx < len(row) else ""
+
+    try:
+        day = date.fromisoformat(cell("date"))
+    except ValueError:
+        raise ValueError(f"invalid date {cell('date')!r}")
+    kind = TYPES.get(cell("type").lower())
+    if kind is None:
+        raise ValueError(f"invalid type {cell('type')!r}")
+    category_raw = cell("category").lower()
+    category = CATEGORIES.get(category_raw)
+    if category is None and category_raw not in ("", "auto"):
+        raise ValueError(f"invalid category {cell('category')!r}")
+    payment = PAYMENTS.get(cell("payment").lower() or "online")
+    if payment is None:
+        raise ValueError(f"invalid payment {cell('payment')!r}")
+    amount = to_paise(cell("amount").replace(",", ""))
+    if amount <= 0:
+        raise ValueError("amount must be positive")
+    return {
+        "date": day,
+        "type": kind,
+        "category": category,
+        "payment_mode": payment,
+        "description": cell("description")[:255],
+        "amount": amount,
+    }
+
+
+def _numbered_chunks(reader: Iterator[List[str]], size: int) -> Iterator[List[Tuple[int, List[str]]]]:
+    numbered = ((reader.line_num, row) for row in reader)
+    while True:
+        chunk = list(islice(numbered, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def import_transactions(
+    user,
+    lines: Iterable[str],
+    chunk_size: Optional[int] = None,
+    progress: Optional[Callable[[ImportResult], None]] = None,
+    dry_run: bool = False,
+) -> ImportResult:
+    """Stream a transactions CSV (export format) into ``user``'s history.
+
+    Rows are parsed, validated and inserted ``chunk_size`` at a time, so
+    memory stays flat for any file size. Blank or "auto" categories are
+    filled in one batch per chunk. Everything runs in one DB transaction:
+    invalid rows are skipped and reported, but a database error leaves no
+    partial import behind.
+    """
+    chunk_size = chunk_size or import_chunk_size()
+    reader = csv.reader(lines)
+    header = next(reader, None)
+    if not header:
+        raise ImportFormatError("The file is empty.")
+    columns = _column_index(header)
+    result = ImportResult()
+    # One entry per (month, category, type, payment), however many rows.
+    deltas: Dict[RollupKey, List[int]] = defaultdict(lambda: [0, 0])
+
+    with db_transaction.atomic():
+        for chunk in _numbered_chunks(reader, chunk_size):
+            parsed = []
+            for line, row in chunk:
+                if not any(cell.strip() for cell in row):
+                    continue
+                result.rows += 1
+                try:
+                    parsed.append(_parse_row(row, columns))
+                except ValueError as exc:
+                    result.add_error(line, str(exc))
+
+            needs_category = [values for values in parsed if values["category"] is None]
+            if needs_category:
+                guesses = predict_categories(user, [values["description"] for values in needs_category])
+                for values, guess in zip(needs_category, guesses):
+                    values["category"] = guess or "other"
+                result.auto_categorized += len(needs_category)
+
+            items = [Transaction(user=user, **values) for values in parsed]
+            if items and not dry_run:
+                Transaction.objects.bulk_create(items, batch_size=min(chunk_size, 1000))
+                for item in items:
+                    delta = deltas[rollup_key(item)]
+                    delta[0] += item.amount
+                    delta[1] += 1
+                learn(user.id, [(item.description, item.category, 1) for item in items])
+            result.created += len(items)
+            if progress:
+                progress(result)
+        if deltas:
+            apply_deltas(user.id, {key: tuple(value) for key, value in deltas.items()})
+
+    if result.created and not dry_run:
+        bump_data_version(user)
+    logger.info(
+        "Imported %s transactions for user %s (%s rows, %s skipped)",
+        result.created, user.pk, result.rows, result.skipped,
+    )
+    return result
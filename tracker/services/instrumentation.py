@@ -0,0 +1,86 @@
+"""Named timing spans for per-stage latency breakdowns.
+
+``span`` works as a context manager or a decorator. Durations are logged
+at DEBUG, and while a request is being collected (``SpanTimingMiddleware``)
+they are also kept for its ``Server-Timing`` header, its summary log line
+and the staff ring buffer.
+"""
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+_collected: ContextVar[Optional[List[Tuple[str, float]]]] = ContextVar("tracker_spans", default=None)
+
+_recent = deque(maxlen=int(getattr(settings, "SPAN_BUFFER_SIZE", 200)))
+_recent_lock = threading.Lock()
+
+
+@contextmanager
+def span(name: str):
+    """Time the enclosed block (or decorated function) as ``name``."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        duration_ms = (time.perf_counter() - started) * 1000
+        collected = _collected.get()
+        if collected is not None:
+            collected.append((name, duration_ms))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("span %s %.2f ms", name, duration_ms, extra={"span": name, "duration_ms": round(duration_ms, 2)})
+
+
+def start_collecting():
+    """Collect spans in the current context; pass the token to ``stop_collecting``."""
+    return _collected.set([])
+
+
+def stop_collecting(token) -> List[Tuple[str, float]]:
+    spans = _collected.get() or []
+    _collected.reset(token)
+    return spans
+
+
+def summarize(spans: List[Tuple[str, float]]) -> List[Dict]:
+    """Total time and call count per span name, in first-seen order."""
+    totals: Dict[str, Dict] = {}
+    for name, duration_ms in spans:
+        entry = totals.setdefault(name, {"name": name, "ms": 0.0, "count": 0})
+        entry["ms"] += duration_ms
+        entry["count"] += 1
+    for entry in totals.values():
+        entry["ms"] = round(entry["ms"], 2)
+    return list(totals.values())
+
+
+def add_server_timing(response, name: str, duration_ms: float, description: str = "") -> None:
+    """Append one ``Server-Timing`` metric, keeping any already on the response."""
+    entry = f"{name};dur={duration_ms:.1f}"
+    if description:
+        entry += f';desc="{description}"'
+    existing = response.get("Server-Timing")
+    response["Server-Timing"] = f"{existing}, {entry}" if existing else entry
+
+
+def record_request(entry: Dict) -> None:
+    with _recent_lock:
+        _recent.append(entry)
+
+
+def recent_requests() -> List[Dict]:
+    """Newest first."""
+    with _recent_lock:
+        return list(reversed(_recent))
+
+
+def clear_recent() -> None:
+    with _recent_lock:
+        _recent.clear()
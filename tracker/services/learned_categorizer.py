@@ -0,0 +1,190 @@
+import math
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Optional
+
+from django.conf import settings
+from django.db import IntegrityError
+from django.db import transaction as db_transaction
+
+from tracker.models import Transaction, UserCategorizer
+from tracker.services.categorization import get_matcher
+from tracker.services.dashboard_cache import DashboardCache, get_data_version
+
+_TOKEN_RE = re.compile(r"[a-z][a-z0-9]+")
+# Laplace smoothing for token likelihoods.
+ALPHA = 1.0
+
+
+def tokenize(description: str) -> List[str]:
+    """Lowercase word tokens; pure numbers (UPI refs, amounts) carry no signal."""
+    return _TOKEN_RE.findall((description or "").lower())
+
+
+class NaiveBayesModel:
+    """Multinomial naive Bayes over description tokens, updated one transaction at a time."""
+
+    def __init__(self, docs: Optional[Dict[str, int]] = None, tokens: Optional[Dict[str, Dict[str, int]]] = None):
+        self.docs: Dict[str, int] = dict(docs or {})
+        self.tokens: Dict[str, Dict[str, int]] = {token: dict(per) for token, per in (tokens or {}).items()}
+        self.totals: Counter = Counter()
+        for per in self.tokens.values():
+            self.totals.update(per)
+
+    @classmethod
+    def from_counts(cls, counts: dict) -> "NaiveBayesModel":
+        return cls(counts.get("docs"), counts.get("tokens"))
+
+    def to_counts(self) -> dict:
+        return {"docs": self.docs, "tokens": self.tokens}
+
+    def update(self, description: str, category: str, weight: int = 1) -> None:
+        """Add (weight=1) or remove (weight=-1) one transaction's evidence."""
+        tokens = Counter(tokenize(description))
+        if not tokens:
+            return
+        docs = self.docs.get(category, 0) + weight
+        if docs > 0:
+            self.docs[category] = docs
+        else:
+            self.docs.pop(category, None)
+        for token, count in tokens.items():
+            per = self.tokens.setdefault(token, {})
+            value = per.get(category, 0) + weight * count
+            if value > 0:
+                per[category] = value
+            else:
+                per.pop(category, None)
+                if not per:
+                    del self.tokens[token]
+            self.totals[category] = max(0, self.totals[category] + weight * count)
+
+    def prune(self, max_vocab: int) -> None:
+        """Keep the vocabulary bounded by dropping the rarest tokens (down to 90%)."""
+        if len(self.tokens) <= max_vocab:
+            return
+        ranked = sorted(self.tokens, key=lambda token: sum(self.tokens[token].values()))
+        for token in ranked[:len(self.tokens) - int(max_vocab * 0.9)]:
+            for category, count in self.tokens.pop(token).items():
+                self.totals[category] -= count
+
+    def predict(self, description: str) -> Optional[str]:
+        """Most likely category, or None when no token has been seen before."""
+        words = [token for token in tokenize(description) if token in self.tokens]
+        if not words or not self.docs:
+            return None
+        vocab = len(self.tokens)
+        doc_total = sum(self.docs.values())
+        best, best_score = None, -math.inf
+        for category, docs in self.docs.items():
+            denominator = math.log(self.totals[category] + ALPHA * vocab)
+            score = math.log(docs / doc_total)
+            for token in words:
+                score += math.log(self.tokens[token].get(category, 0) + ALPHA) - denominator
+            if score > best_score:
+                best, best_score = category, score
+        return best
+
+
+model_cache = DashboardCache(
+    max_entries=int(getattr(settings, "CATEGORIZER_CACHE_MAX_ENTRIES", 1024)),
+    ttl=float(getattr(settings, "CATEGORIZER_CACHE_TTL", 600)),
+)
+
+
+def _load(user_id: int) -> NaiveBayesModel:
+    row = UserCategorizer.objects.filter(user_id=user_id).only("counts").first()
+    return NaiveBayesModel.from_counts(row.counts if row else {})
+
+
+def get_model(user) -> NaiveBayesModel:
+    # Every transaction write bumps the data version, so a model learned in
+    # another process is never served stale from this one.
+    return model_cache.get_or_build(("categorizer", user.pk, get_data_version(user)), lambda: _load(user.pk))
+
+
+def predict_category(user, description: str) -> Optional[str]:
+    """The user's learned category for ``description``, else the keyword map's.
+
+    A keyword-map hit on a merchant the user has never categorized wins over
+    the learned model, so one shared word ("order", "upi") cannot drag a
+    new merchant into the wrong category.
+    """
+    return _predict(get_model(user), get_matcher(), description)
+
+
+def _predict(model: NaiveBayesModel, matcher, description: str) -> Optional[str]:
+    found = matcher.match_keyword(description)
+    if found and not any(token in model.tokens for token in tokenize(found[0])):
+        return found[1]
+    return model.predict(description) or (found[1] if found else None)
+
+
+def predict_categories(user, descriptions: Iterable[str]) -> List[Optional[str]]:
+    """``predict_category`` for many descriptions, loading the model once."""
+    model = get_model(user)
+    matcher = get_matcher()
+    results: List[Optional[str]] = []
+    seen: Dict[str, Optional[str]] = {}
+    for description in descriptions:
+        key = (description or "").lower()
+        if key not in seen:
+            seen[key] = _predict(model, matcher, key)
+        results.append(seen[key])
+    return results
+
+
+def learn(user_id: int, changes: Iterable[tuple]) -> None:
+    """Apply ``(description, category, weight)`` changes to the user's stored counts.
+
+    Call inside the transaction that saves the rows, before the data version
+    is bumped.
+    """
+    changes = [change for change in changes if tokenize(change[0])]
+    if not changes:
+        return
+    max_vocab = int(getattr(settings, "CATEGORIZER_MAX_VOCAB", 2000))
+    with db_transaction.atomic():
+        row = UserCategorizer.objects.select_for_update().filter(user_id=user_id).first()
+        if row is None:
+            try:
+                with db_transaction.atomic():
+                    row = UserCategorizer.objects.create(user_id=user_id)
+            except IntegrityError:
+                row = UserCategorizer.objects.select_for_update().get(user_id=user_id)
+        model = NaiveBayesModel.from_counts(row.counts)
+        for description, category, weight in changes:
+            model.update(description, category, weight)
+        model.prune(max_vocab)
+        row.counts = model.to_counts()
+        row.save(update_fields=["counts", "updated_at"])
+
+
+# Rows generated from a recurring series repeat one user choice many times,
+# so only hand-entered transactions are learned from.
+
+def learn_created(item) -> None:
+    if not item.recurring_source_id:
+        learn(item.user_id, [(item.description, item.category, 1)])
+
+
+def learn_deleted(item) -> None:
+    if not item.recurring_source_id:
+        learn(item.user_id, [(item.description, item.category, -1)])
+
+
+def learn_changed(user_id: int, old_description: str, old_category: str, item) -> None:
+    if item.recurring_source_id or (old_description, old_category) == (item.description, item.category):
+        return
+    learn(user_id, [(old_description, old_category, -1), (item.description, item.category, 1)])
+
+
+def rebuild_model(user_id: int) -> NaiveBayesModel:
+    """Retrain from the user's history, for bulk changes that bypass ``learn``."""
+    model = NaiveBayesModel()
+    history = Transaction.objects.filter(user_id=user_id, recurring_source__isnull=True).exclude(description="")
+    for description, category in history.values_list("description", "category").iterator(chunk_size=2000):
+        model.update(description, category)
+    model.prune(int(getattr(settings, "CATEGORIZER_MAX_VOCAB", 2000)))
+    UserCategorizer.objects.update_or_create(user_id=user_id, defaults={"counts": model.to_counts()})
+    return model
@@ -0,0 +1,55 @@
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+from typing import Union
+
+# Money is stored and summed as integer paise; rupees only exist at the edges
+# (form input, templates, CSV, charts).
+PAISE_PER_RUPEE = 100
+# Largest accepted amount (₹10 trillion): far below the BigIntegerField
+# limit, so sums of many amounts cannot overflow either.
+MAX_PAISE = 10 ** 15
+
+Number = Union[int, float, str, Decimal]
+
+
+def to_paise(value: Number) -> int:
+    """Parse a rupee amount (``"12.5"``, ``12.5``, ``Decimal``) into paise.
+
+    Raises ``ValueError`` for anything that is not a finite number or is
+    larger than ``MAX_PAISE`` either way.
+    """
+    try:
+        rupees = Decimal(str(value).strip())
+        if not rupees.is_finite():
+            raise ValueError(f"Invalid amount: {value!r}")
+        paise = int((rupees * PAISE_PER_RUPEE).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+    except InvalidOperation:
+        # Also raised by quantize for exponents like 1e400.
+        raise ValueError(f"Invalid amount: {value!r}")
+    if abs(paise) > MAX_PAISE:
+        raise ValueError(f"Amount too large: {value!r}")
+    return paise
+
+
+def to_rupees(paise) -> Decimal:
+    return Decimal(int(round(paise or 0))) / PAISE_PER_RUPEE
+
+
+def rupees_float(paise) -> float:
+    """Rupee value for JSON/chart payloads, where a float is expected."""
+    return (paise or 0) / PAISE_PER_RUPEE
+
+
+def format_rupees(paise, grouping: bool = False) -> str:
+    """Exact ``"1234.50"`` (or ``"1,234.50"``) rendering of a paise amount."""
+    paise = int(round(paise or 0))
+    sign = "-" if paise < 0 else ""
+    rupees, fraction = divmod(abs(paise), PAISE_PER_RUPEE)
+    whole = f"{rupees:,}" if grouping else str(rupees)
+    return f"{sign}{whole}.{fraction:02d}"
+
+
+def format_currency(paise) -> str:
+    formatted = format_rupees(paise, grouping=True)
+    if formatted.startswith("-"):
+        return f"-₹{formatted[1:]}"
+    return f"₹{formatted}"
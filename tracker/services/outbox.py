@@ -0,0 +1,185 @@
+import logging
+import time
+from datetime import timedelta
+from itertools import islice
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.db.models import Count, Min
+from django.utils import timezone
+
+from tracker.models import EmailOutbox
+from tracker.services.email_dispatch import DispatchStats, Sender, TokenBucket, _percentile
+from tracker.services.email_sender import SMTPSession, active_provider, is_retryable_error, send_app_email
+from tracker.services.email_service import EmailContent, claim_emails, release_claims
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_NAMES = {EmailOutbox.PRIORITY_OTP: "otp", EmailOutbox.PRIORITY_BULK: "bulk"}
+
+
+def enqueue_email(to_email: str, subject: str, body: str, priority: int = EmailOutbox.PRIORITY_BULK) -> EmailOutbox:
+    return EmailOutbox.objects.create(to_email=to_email, subject=subject, body=body, priority=priority)
+
+
+def enqueue_behavior_emails(jobs: Iterable[Tuple[object, EmailContent]], chunk_size: int = 500) -> DispatchStats:
+    """Claim ``(user, content)`` jobs a chunk at a time and queue them as bulk mail.
+
+    Each row keeps its EmailLog ``dedup_key``; ``drain_outbox`` releases the
+    claim if the email fails for good. ``sent`` in the result counts queued
+    emails.
+    """
+    stats = DispatchStats()
+    started = time.perf_counter()
+    iterator = iter(jobs)
+    while True:
+        chunk = list(islice(iterator, max(1, chunk_size)))
+        if not chunk:
+            break
+        claimed = claim_emails(chunk)
+        EmailOutbox.objects.bulk_create([
+            EmailOutbox(to_email=user.email, subject=content.subject, body=content.body, dedup_key=key)
+            for user, content, key in claimed
+        ])
+        stats.sent += len(claimed)
+        # No address, or already sent this week.
+        stats.skipped += len(chunk) - len(claimed)
+    stats.elapsed = time.perf_counter() - started
+    return stats
+
+
+def queue_app_email(to_email: str, subject: str, body: str, priority: int = EmailOutbox.PRIORITY_OTP) -> Optional[str]:
+    """Drop-in for ``send_app_email`` that enqueues when EMAIL_USE_OUTBOX is on.
+
+    Missing provider configuration is still reported straight away, since
+    no amount of retrying in the worker would fix it.
+    """
+    if not getattr(settings, "EMAIL_USE_OUTBOX", False):
+        return send_app_email(to_email, subject, body)
+    if active_provider() is None:
+        logger.error("Email outbox enabled but no email provider is configured.")
+        if settings.DEBUG:
+            return "Failed to send email: Email service not configured"
+        return "Email service not configured"
+    enqueue_email(to_email, subject, body, priority)
+    return None
+
+
+def claim_batch(limit: int, max_priority: Optional[int] = None) -> List[EmailOutbox]:
+    """Lease up to ``limit`` due rows to this worker, most urgent first.
+
+    Each row is claimed with a compare-and-swap UPDATE, so concurrent
+    workers never send the same row twice. A claimed row whose worker died
+    becomes due again once its lease runs out.
+    """
+    now = timezone.now()
+    lease_until = now + timedelta(seconds=int(getattr(settings, "EMAIL_OUTBOX_LEASE_SECONDS", 60)))
+    due = EmailOutbox.objects.filter(status__in=("pending", "sending"), available_at__lte=now)
+    if max_priority is not None:
+        due = due.filter(priority__lte=max_priority)
+
+    claimed = []
+    for row in due.order_by("priority", "id")[:limit]:
+        won = EmailOutbox.objects.filter(pk=row.pk, status=row.status, available_at=row.available_at).update(
+            status="sending", available_at=lease_until,
+        )
+        if won:
+            row.status, row.available_at = "sending", lease_until
+            claimed.append(row)
+    return claimed
+
+
+def _record_result(row: EmailOutbox, error: Optional[str], backoff: float, max_attempts: int) -> str:
+    now = timezone.now()
+    row.attempts += 1
+    if not error:
+        row.status, row.sent_at, row.last_error = "sent", now, ""
+    elif is_retryable_error(error) and row.attempts < max_attempts:
+        row.status, row.last_error = "pending", error[:255]
+        row.available_at = now + timedelta(seconds=backoff * (2 ** (row.attempts - 1)))
+    else:
+        row.status, row.last_error = "failed", error[:255]
+        if row.dedup_key:
+            # Not delivered after all: let the next run send it again.
+            release_claims([row.dedup_key])
+    if row.status == "sent" or (row.status == "failed" and row.priority == EmailOutbox.PRIORITY_OTP):
+        # Bodies can hold OTP codes; nothing needs them once delivery is settled.
+        row.body = ""
+    row.save(update_fields=["status", "attempts", "last_error", "available_at", "sent_at", "body"])
+    return row.status
+
+
+def drain_outbox(
+    batch_size: int = 20,
+    max_priority: Optional[int] = None,
+    limit: Optional[int] = None,
+    rate: Optional[float] = None,
+    sender: Optional[Sender] = None,
+) -> DispatchStats:
+    """Send due outbox rows until none are left (or ``limit`` were attempted).
+
+    Rows are re-selected by priority after every small batch, so OTPs that
+    arrive during a bulk backlog wait for at most ``batch_size`` sends.
+    Latencies in the returned stats are enqueue-to-delivery times.
+    """
+    stats = DispatchStats()
+    bucket = TokenBucket(rate if rate is not None else getattr(settings, "EMAIL_RATE_LIMIT", 0))
+    backoff = float(getattr(settings, "EMAIL_RETRY_BACKOFF", 1.0))
+    max_attempts = int(getattr(settings, "EMAIL_OUTBOX_MAX_ATTEMPTS", 5))
+    session = None
+    if sender is None:
+        if active_provider() == "smtp":
+            session = SMTPSession()
+            sender = session.send
+        else:
+            sender = send_app_email
+
+    started = time.perf_counter()
+    attempted = 0
+    try:
+        while limit is None or attempted < limit:
+            size = batch_size if limit is None else min(batch_size, limit - attempted)
+            batch = claim_batch(size, max_priority)
+            if not batch:
+                break
+            for row in batch:
+                bucket.acquire()
+                status = _record_result(row, sender(row.to_email, row.subject, row.body), backoff, max_attempts)
+                attempted += 1
+                if status == "sent":
+                    stats.record("sent", (row.sent_at - row.created_at).total_seconds())
+                elif status == "pending":
+                    stats.add_retry()
+                else:
+                    logger.warning("Outbox email %s to %s failed: %s", row.pk, row.to_email, row.last_error)
+                    stats.record("failed")
+    finally:
+        if session is not None:
+            session.close()
+    stats.elapsed = time.perf_counter() - started
+    return stats
+
+
+def outbox_metrics(window: timedelta = timedelta(hours=1)) -> Dict[str, object]:
+    """Queue depth per priority, oldest waiting age and recent delivery latency."""
+    now = timezone.now()
+    waiting = EmailOutbox.objects.filter(status__in=("pending", "sending"))
+    depth = {name: 0 for name in PRIORITY_NAMES.values()}
+    for row in waiting.values("priority").annotate(n=Count("id")):
+        depth[PRIORITY_NAMES.get(row["priority"], str(row["priority"]))] = row["n"]
+    oldest = waiting.aggregate(oldest=Min("created_at"))["oldest"]
+
+    recent = EmailOutbox.objects.filter(status="sent", sent_at__gte=now - window)
+    latencies = sorted(
+        (sent_at - created_at).total_seconds()
+        for created_at, sent_at in recent.values_list("created_at", "sent_at")[:5000]
+    )
+    return {
+        "depth": depth,
+        "oldest_seconds": round((now - oldest).total_seconds(), 1) if oldest else 0.0,
+        "failed": EmailOutbox.objects.filter(status="failed").count(),
+        "sent_recent": len(latencies),
+        "p50_ms": round(_percentile(latencies, 50) * 1000, 1),
+        "p90_ms": round(_percentile(latencies, 90) * 1000, 1),
+        "p99_ms": round(_percentile(latencies, 99) * 1000, 1),
+    }
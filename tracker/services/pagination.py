@@ -0,0 +1,72 @@
+import base64
+import binascii
+from dataclasses import dataclass
+from datetime import date
+from typing import List, Optional, Tuple
+
+from django.conf import settings
+from django.db.models import Q
+
+from tracker.services.filters import SORT_MAP, DashboardFilters, apply_sort
+
+# Columns rendered by tracker/_transaction_rows.html.
+ROW_FIELDS = ("id", "type", "amount", "category", "payment_mode", "date", "description")
+
+
+@dataclass
+class TransactionPage:
+    rows: List
+    next_cursor: Optional[str]
+
+
+def page_size() -> int:
+    return int(getattr(settings, "TRANSACTION_PAGE_SIZE", 50))
+
+
+def _sort_key(sort: str) -> Tuple[str, bool]:
+    order = SORT_MAP.get(sort, "-date")
+    return order.lstrip("-"), order.startswith("-")
+
+
+def encode_cursor(sort: str, item) -> str:
+    field, _ = _sort_key(sort)
+    value = getattr(item, field)
+    raw = value.isoformat() if field == "date" else str(int(value))
+    return base64.urlsafe_b64encode(f"{raw}|{item.id}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(sort: str, cursor: Optional[str]):
+    if not cursor:
+        return None
+    field, _ = _sort_key(sort)
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw, pk = base64.urlsafe_b64decode(padded.encode()).decode().rsplit("|", 1)
+        value = date.fromisoformat(raw) if field == "date" else int(raw)
+        return value, int(pk)
+    except (ValueError, UnicodeDecodeError, binascii.Error):
+        return None
+
+
+def paginate_transactions(queryset, filters: DashboardFilters, cursor: Optional[str] = None, size: Optional[int] = None) -> TransactionPage:
+    """Return one keyset page of ``queryset`` in the dashboard sort order.
+
+    The cursor is the (sort value, id) of the last row already shown, so each
+    page is a bounded index range scan no matter how deep the user scrolls.
+    """
+    size = size or page_size()
+    field, descending = _sort_key(filters.sort)
+    qs = apply_sort(queryset.only(*ROW_FIELDS), filters)
+
+    position = decode_cursor(filters.sort, cursor)
+    if position:
+        value, pk = position
+        op = "lt" if descending else "gt"
+        qs = qs.filter(Q(**{f"{field}__{op}": value}) | Q(**{field: value, f"id__{op}": pk}))
+
+    rows = list(qs[:size + 1])
+    next_cursor = None
+    if len(rows) > size:
+        rows = rows[:size]
+        next_cursor = encode_cursor(filters.sort, rows[-1])
+    return TransactionPage(rows=rows, next_cursor=next_cursor)
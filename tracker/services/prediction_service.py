@@ -1,18 +1,24 @@
+import threading
 from dataclasses import dataclass
 from datetime import date
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
 
+import numpy as np
 from django.conf import settings
+from django.db import IntegrityError
+from django.db import transaction as db_transaction
 from django.db.models import Sum
-from django.db.models.functions import TruncMonth
 
-from tracker.models import SpendingPrediction, Transaction
+from tracker.models import SpendingPrediction, UserMonthRollup
+from tracker.services.analytics import AnalyticsCube, load_analytics_cube
+from tracker.services.dashboard_cache import dashboard_cache, get_data_version
+from tracker.services.instrumentation import span
 
 
 @dataclass
 class PredictionResult:
     month: date
-    predicted_expense: float
+    predicted_expense: int  # paise
     risk_level: str
     explanation: str
 
@@ -37,27 +43,26 @@ def _get_threshold(name: str, default: float) -> float:
     return float(getattr(settings, name, default))
 
 
-def get_monthly_expenses(user, months_back: int, end_month: date) -> Dict[date, float]:
+def get_monthly_expenses(user, months_back: int, end_month: date, cube: Optional[AnalyticsCube] = None) -> Dict[date, int]:
     start_month = _month_delta(end_month, -(months_back - 1))
+    if cube is not None:
+        return {
+            month: total
+            for month, total in cube.monthly_expenses().items()
+            if start_month <= month <= end_month
+        }
     qs = (
-        Transaction.objects.filter(
+        UserMonthRollup.objects.filter(
             user=user,
             type="expense",
-            date__gte=start_month,
-            date__lte=_month_delta(end_month, 1),
+            month__gte=start_month,
+            month__lte=end_month,
         )
-        .annotate(month=TruncMonth("date"))
         .values("month")
-        .annotate(total=Sum("amount"))
+        .annotate(total=Sum("total"))
         .order_by("month")
     )
-    totals = {}
-    for item in qs:
-        month_value = item["month"]
-        if hasattr(month_value, "date"):
-            month_value = month_value.date()
-        totals[_month_start(month_value)] = float(item["total"] or 0)
-    return totals
+    return {item["month"]: item["total"] or 0 for item in qs}
 
 
 def compute_growth_rates(months: List[date], totals: Dict[date, float]) -> List[float]:
@@ -71,11 +76,12 @@ def compute_growth_rates(months: List[date], totals: Dict[date, float]) -> List[
     return rates
 
 
-def predict_next_month(user, today: date, months_back: int = 6) -> Optional[PredictionResult]:
+@span("prediction.predict_next_month")
+def predict_next_month(user, today: date, months_back: int = 6, cube: Optional[AnalyticsCube] = None) -> Optional[PredictionResult]:
     months_back = max(3, min(months_back, 6))
     current_month = _month_start(today)
     history_months = [_month_delta(current_month, -i) for i in range(months_back - 1, -1, -1)]
-    totals = get_monthly_expenses(user, months_back, current_month)
+    totals = get_monthly_expenses(user, months_back, current_month, cube=cube)
     available_totals = [totals.get(month, 0) for month in history_months]
 
     if sum(1 for value in available_totals if value > 0) < 2:
@@ -98,42 +104,33 @@ def predict_next_month(user, today: date, months_back: int = 6) -> Optional[Pred
 
     return PredictionResult(
         month=_month_delta(current_month, 1),
-        predicted_expense=predicted,
+        predicted_expense=round(predicted),
         risk_level="insufficient",
         explanation="Prediction based on your recent expense trend.",
     )
 
 
-def classify_risk(user, today: date, average: float, prediction: float) -> Tuple[str, str]:
+def _month_expense(user, month: date, cube: Optional[AnalyticsCube] = None) -> int:
+    if cube is not None:
+        return cube.month_totals(month)[1]
+    return (
+        UserMonthRollup.objects.filter(user=user, type="expense", month=month)
+        .aggregate(total=Sum("total"))
+        .get("total")
+        or 0
+    )
+
+
+@span("prediction.classify_risk")
+def classify_risk(user, today: date, average: float, prediction: float, cube: Optional[AnalyticsCube] = None) -> Tuple[str, str]:
     overspend_projection_threshold = _get_threshold("PREDICTION_OVR_PROJ_THRESHOLD", 0.15)
     overspend_pace_threshold = _get_threshold("PREDICTION_OVR_PACE_THRESHOLD", 0.20)
     underspend_threshold = _get_threshold("PREDICTION_UNDER_THRESHOLD", 0.60)
     stable_threshold = _get_threshold("PREDICTION_STABLE_THRESHOLD", 0.10)
 
     current_month = _month_start(today)
-    month_total = (
-        Transaction.objects.filter(
-            user=user,
-            type="expense",
-            date__year=current_month.year,
-            date__month=current_month.month,
-        )
-        .aggregate(total=Sum("amount"))
-        .get("total")
-        or 0
-    )
-    last_month = _month_delta(current_month, -1)
-    last_month_total = (
-        Transaction.objects.filter(
-            user=user,
-            type="expense",
-            date__year=last_month.year,
-            date__month=last_month.month,
-        )
-        .aggregate(total=Sum("amount"))
-        .get("total")
-        or 0
-    )
+    month_total = _month_expense(user, current_month, cube=cube)
+    last_month_total = _month_expense(user, _month_delta(current_month, -1), cube=cube)
 
     # spending pace estimate
     days_elapsed = max(1, today.day)
@@ -155,23 +152,67 @@ def classify_risk(user, today: date, average: float, prediction: float) -> Tuple
     return "healthy", "Spending is within a healthy range."
 
 
-def save_prediction(user, result: PredictionResult) -> SpendingPrediction:
+class PredictionStats:
+    """Process-wide counters for how ``build_prediction_summary`` was served."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        self.served_stored = 0
+        self.served_memo = 0
+        self.recomputed_unchanged = 0
+        self.written = 0
+
+    def record(self, outcome: str) -> None:
+        with self._lock:
+            setattr(self, outcome, getattr(self, outcome) + 1)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "served_stored": self.served_stored,
+                "served_memo": self.served_memo,
+                "recomputed_unchanged": self.recomputed_unchanged,
+                "written": self.written,
+            }
+
+
+prediction_stats = PredictionStats()
+
+
+def _from_stored(stored: SpendingPrediction) -> PredictionResult:
+    return PredictionResult(
+        month=stored.month,
+        predicted_expense=stored.predicted_expense,
+        risk_level=stored.risk_level,
+        explanation=stored.explanation,
+    )
+
+
+def save_prediction(user, result: PredictionResult, today: Optional[date] = None, data_version: int = 0) -> SpendingPrediction:
     prediction, _ = SpendingPrediction.objects.update_or_create(
         user=user,
         month=result.month,
         defaults={
             "predicted_expense": result.predicted_expense,
             "risk_level": result.risk_level,
+            "explanation": result.explanation,
+            "computed_on": today,
+            "data_version": data_version,
         },
     )
     return prediction
 
 
-def build_prediction_summary(user, today: date) -> PredictionResult:
+def _compute_prediction_summary(user, today: date, cube: Optional[AnalyticsCube] = None) -> PredictionResult:
+    if cube is None:
+        cube = load_analytics_cube(user)
     current_month = _month_start(today)
-    history = get_monthly_expenses(user, 6, current_month)
+    history = get_monthly_expenses(user, 6, current_month, cube=cube)
     avg_expense = sum(history.values()) / len(history) if history else 0
-    prediction = predict_next_month(user, today)
+    prediction = predict_next_month(user, today, cube=cube)
     if not prediction:
         return PredictionResult(
             month=_month_delta(current_month, 1),
@@ -179,8 +220,190 @@ def build_prediction_summary(user, today: date) -> PredictionResult:
             risk_level="insufficient",
             explanation="Not enough data to forecast next month.",
         )
-    risk_level, explanation = classify_risk(user, today, avg_expense, prediction.predicted_expense)
+    risk_level, explanation = classify_risk(user, today, avg_expense, prediction.predicted_expense, cube=cube)
     prediction.risk_level = risk_level
     prediction.explanation = explanation
-    save_prediction(user, prediction)
     return prediction
+
+
+@span("prediction.summary")
+def build_prediction_summary(user, today: date, cube: Optional[AnalyticsCube] = None) -> PredictionResult:
+    """Next month's prediction for ``user``, memoized per (user, day, data version).
+
+    The stored ``SpendingPrediction`` is served as-is when it was computed
+    today from the current data version. Otherwise the prediction is
+    recomputed, and the row is only rewritten when the result changed; an
+    identical result is remembered in ``dashboard_cache`` instead, so
+    unchanged predictions cost no write.
+    """
+    version = get_data_version(user)
+    cache_key = ("prediction", user.pk, version, today)
+    memo = dashboard_cache.get(cache_key)
+    if memo is not None:
+        prediction_stats.record("served_memo")
+        return memo
+
+    next_month = _month_delta(_month_start(today), 1)
+    stored = SpendingPrediction.objects.filter(user=user, month=next_month).first()
+    if stored and stored.computed_on == today and stored.data_version == version:
+        prediction_stats.record("served_stored")
+        return _from_stored(stored)
+
+    prediction = _compute_prediction_summary(user, today, cube=cube)
+    if stored is not None and _from_stored(stored) == prediction:
+        dashboard_cache.set(cache_key, prediction)
+        prediction_stats.record("recomputed_unchanged")
+        return prediction
+
+    fields = {
+        "predicted_expense": prediction.predicted_expense,
+        "risk_level": prediction.risk_level,
+        "explanation": prediction.explanation,
+        "computed_on": today,
+        "data_version": version,
+    }
+    if stored is not None:
+        SpendingPrediction.objects.filter(pk=stored.pk).update(**fields)
+    else:
+        try:
+            with db_transaction.atomic():
+                SpendingPrediction.objects.create(user=user, month=next_month, **fields)
+        except IntegrityError:
+            # A concurrent request stored it first.
+            SpendingPrediction.objects.filter(user=user, month=next_month).update(**fields)
+    prediction_stats.record("written")
+    return prediction
+
+
+# Batch engine used by send_behavior_emails. It reproduces
+# build_prediction_summary for many users at once: one grouped rollup query
+# and one upsert per chunk instead of several queries per user.
+
+HISTORY_MONTHS = 6
+
+_RISK_OUTCOMES = [
+    ("high", "Projected spending is rising faster than last month."),
+    ("high", "Current spending pace suggests overspending."),
+    ("under", "Spending is well below your historical average."),
+    ("healthy", "Spending is stable compared to your average."),
+    ("healthy", "Spending is within a healthy range."),
+]
+
+
+def _expense_matrix(user_ids: Sequence[int], months: List[date]) -> Tuple[np.ndarray, np.ndarray]:
+    """``(totals, present)`` arrays of shape ``(len(user_ids), len(months))``."""
+    row_of = {user_id: idx for idx, user_id in enumerate(user_ids)}
+    col_of = {month: idx for idx, month in enumerate(months)}
+    totals = np.zeros((len(user_ids), len(months)), dtype=np.int64)
+    present = np.zeros(totals.shape, dtype=bool)
+    rows = (
+        UserMonthRollup.objects.filter(
+            user_id__in=user_ids,
+            type="expense",
+            month__gte=months[0],
+            month__lte=months[-1],
+        )
+        .values_list("user_id", "month")
+        .annotate(total=Sum("total"))
+        .order_by()
+    )
+    for user_id, month, total in rows:
+        totals[row_of[user_id], col_of[month]] = total or 0
+        present[row_of[user_id], col_of[month]] = True
+    return totals, present
+
+
+@span("prediction.predict_batch")
+def predict_batch(user_ids: Sequence[int], today: date) -> Dict[int, PredictionResult]:
+    """Vectorized ``build_prediction_summary`` for ``user_ids`` (read-only)."""
+    if not user_ids:
+        return {}
+    current_month = _month_start(today)
+    months = [_month_delta(current_month, -i) for i in range(HISTORY_MONTHS - 1, -1, -1)]
+    totals, present = _expense_matrix(user_ids, months)
+
+    # predict_next_month: last month scaled by the mean month-over-month growth,
+    # or the plain 6-month mean when no growth rate is defined.
+    previous, following = totals[:, :-1], totals[:, 1:]
+    has_rate = previous != 0
+    rates = np.divide(following - previous, previous, out=np.zeros(previous.shape), where=has_rate)
+    rate_count = has_rate.sum(axis=1)
+    avg_growth = np.divide(rates.sum(axis=1), rate_count, out=np.zeros(len(user_ids)), where=rate_count > 0)
+    predicted = np.where(
+        rate_count > 0,
+        np.maximum(0, totals[:, -1] * (1 + avg_growth)),
+        np.maximum(0, totals.sum(axis=1) / HISTORY_MONTHS),
+    )
+    predicted = np.where((totals > 0).sum(axis=1) < 2, 0, np.round(predicted)).astype(np.int64)
+
+    # classify_risk: "average" only counts months that have any expense row.
+    present_count = present.sum(axis=1)
+    average = np.divide(totals.sum(axis=1), present_count, out=np.zeros(len(user_ids)), where=present_count > 0)
+    month_total = totals[:, -1]
+    last_month_total = totals[:, -2]
+    total_days = (_month_delta(current_month, 1) - current_month).days
+    pace_projection = (month_total / max(1, today.day)) * total_days
+    deviation = np.divide(np.abs(month_total - average), average, out=np.full(len(user_ids), np.inf), where=average != 0)
+
+    outcome = np.select(
+        [
+            (last_month_total != 0) & (predicted > last_month_total * (1 + _get_threshold("PREDICTION_OVR_PROJ_THRESHOLD", 0.15))),
+            (average != 0) & (pace_projection > average * (1 + _get_threshold("PREDICTION_OVR_PACE_THRESHOLD", 0.20))),
+            (average != 0) & (month_total < average * _get_threshold("PREDICTION_UNDER_THRESHOLD", 0.60)),
+            deviation <= _get_threshold("PREDICTION_STABLE_THRESHOLD", 0.10),
+        ],
+        [0, 1, 2, 3],
+        default=4,
+    )
+
+    next_month = _month_delta(current_month, 1)
+    results = {}
+    for idx, user_id in enumerate(user_ids):
+        risk_level, explanation = _RISK_OUTCOMES[outcome[idx]]
+        results[user_id] = PredictionResult(
+            month=next_month,
+            predicted_expense=int(predicted[idx]),
+            risk_level=risk_level,
+            explanation=explanation,
+        )
+    return results
+
+
+@span("prediction.save_predictions")
+def save_predictions(results: Dict[int, PredictionResult], today: date, versions: Dict[int, int]) -> None:
+    """Upsert a batch of results, stamping the memo key build_prediction_summary checks."""
+    SpendingPrediction.objects.bulk_create(
+        [
+            SpendingPrediction(
+                user_id=user_id,
+                month=result.month,
+                predicted_expense=result.predicted_expense,
+                risk_level=result.risk_level,
+                explanation=result.explanation,
+                computed_on=today,
+                data_version=versions.get(user_id, 0),
+            )
+            for user_id, result in results.items()
+        ],
+        update_conflicts=True,
+        unique_fields=["user", "month"],
+        update_fields=["predicted_expense", "risk_level", "explanation", "computed_on", "data_version"],
+    )
+
+
+def iter_prediction_summaries(users, today: date, chunk_size: int = 500) -> Iterator[Tuple[object, PredictionResult]]:
+    """Yield ``(user, prediction)`` for ``users``, saving each chunk in bulk.
+
+    ``users`` is a User queryset; it is walked in id order, ``chunk_size``
+    users at a time.
+    """
+    last_id = 0
+    while True:
+        chunk = list(users.filter(id__gt=last_id).select_related("profile").order_by("id")[:chunk_size])
+        if not chunk:
+            return
+        last_id = chunk[-1].id
+        results = predict_batch([user.id for user in chunk], today)
+        save_predictions(results, today, {user.id: get_data_version(user) for user in chunk})
+        for user in chunk:
+            yield user, results[user.id]
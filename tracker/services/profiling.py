@@ -0,0 +1,180 @@
+"""On-demand request profiling: cProfile stats, sampled stacks and allocations.
+
+Each profile is a set of files sharing one id in ``PROFILE_DIR``:
+``<id>.pstats`` (load with ``pstats``/snakeviz), ``<id>.collapsed``
+(sampled stacks for flamegraph.pl or speedscope) and, with memory
+tracking, ``<id>.alloc.txt``. The directory is pruned oldest-first to
+``PROFILE_DIR_MAX_MB``.
+"""
+import cProfile
+import logging
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+PROFILE_FILE_RE = re.compile(r"^[0-9]{8}T[0-9]{6}-[a-z0-9_-]+\.(pstats|collapsed|alloc\.txt)$")
+TOP_ALLOCATIONS = 40
+
+# cProfile cannot profile two threads' requests into one clean result, and
+# Python 3.12+ refuses a second active profiler outright.
+_active = threading.Lock()
+
+
+def profile_dir() -> Path:
+    path = Path(getattr(settings, "PROFILE_DIR", "") or os.path.join(tempfile.gettempdir(), "tracker-profiles"))
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+class StackSampler(threading.Thread):
+    """Record one thread's Python stack every ``interval`` seconds as collapsed lines."""
+
+    def __init__(self, thread_id: int, interval: float):
+        super().__init__(daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if names:
+                self.stacks[";".join(reversed(names))] += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+@dataclass
+class ProfileResult:
+    profile_id: str
+    seconds: float
+    samples: int
+    peak_alloc_mb: Optional[float] = None
+
+
+class RequestProfiler:
+    """Profile the code between ``start()`` and ``stop()`` on the calling thread."""
+
+    def __init__(self, label: str, memory: bool = False):
+        slug = re.sub(r"[^a-z0-9]+", "-", label.lower()).strip("-")[:60] or "request"
+        now = timezone.now()
+        self.profile_id = f"{now:%Y%m%dT%H%M%S}-{now.microsecond:06d}-{slug}"
+        self.memory = memory
+        self.profiler = cProfile.Profile()
+        self.sampler = StackSampler(threading.get_ident(), float(getattr(settings, "PROFILE_SAMPLE_INTERVAL", 0.001)))
+        self._started = 0.0
+
+    @classmethod
+    def acquire(cls, label: str, memory: bool = False) -> Optional["RequestProfiler"]:
+        """A profiler, or None while another request is being profiled."""
+        if not _active.acquire(blocking=False):
+            return None
+        return cls(label, memory)
+
+    def start(self) -> None:
+        try:
+            if self.memory:
+                tracemalloc.start(int(getattr(settings, "PROFILE_TRACEMALLOC_FRAMES", 10)))
+            self.sampler.start()
+            self._started = time.perf_counter()
+            self.profiler.enable()
+        except BaseException:
+            # stop() will not be called: undo what did start and free the slot.
+            if self.sampler.is_alive():
+                self.sampler.stop()
+            if self.memory:
+                tracemalloc.stop()
+            _active.release()
+            raise
+
+    def stop(self) -> ProfileResult:
+        try:
+            self.profiler.disable()
+            seconds = time.perf_counter() - self._started
+            self.sampler.stop()
+            result = ProfileResult(self.profile_id, round(seconds, 4), sum(self.sampler.stacks.values()))
+            directory = profile_dir()
+            self.profiler.dump_stats(directory / f"{self.profile_id}.pstats")
+            (directory / f"{self.profile_id}.collapsed").write_text(self.sampler.collapsed(), encoding="utf-8")
+            if self.memory:
+                snapshot = tracemalloc.take_snapshot()
+                result.peak_alloc_mb = round(tracemalloc.get_traced_memory()[1] / 1e6, 2)
+                tracemalloc.stop()
+                self._write_allocations(directory, snapshot, result.peak_alloc_mb)
+            prune_profiles(directory)
+            return result
+        finally:
+            _active.release()
+
+    def _write_allocations(self, directory: Path, snapshot, peak_mb: float) -> None:
+        snapshot = snapshot.filter_traces([tracemalloc.Filter(False, tracemalloc.__file__)])
+        lines = [f"peak {peak_mb} MB; live allocations by line at the end of the request:"]
+        for stat in snapshot.statistics("lineno")[:TOP_ALLOCATIONS]:
+            frame = stat.traceback[0]
+            lines.append(f"{stat.size / 1024:10.1f} KiB {stat.count:8d} blocks  {frame.filename}:{frame.lineno}")
+        (directory / f"{self.profile_id}.alloc.txt").write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def prune_profiles(directory: Optional[Path] = None) -> int:
+    """Delete the oldest profile files until the directory fits ``PROFILE_DIR_MAX_MB``."""
+    directory = directory or profile_dir()
+    limit = float(getattr(settings, "PROFILE_DIR_MAX_MB", 50)) * 1e6
+    files = sorted(
+        (path for path in directory.iterdir() if PROFILE_FILE_RE.match(path.name)),
+        key=lambda path: path.name,
+    )
+    total = sum(path.stat().st_size for path in files)
+    removed = 0
+    while files and total > limit:
+        oldest = files.pop(0)
+        total -= oldest.stat().st_size
+        oldest.unlink(missing_ok=True)
+        removed += 1
+    return removed
+
+
+def list_profiles() -> List[Dict]:
+    """Stored profiles, newest first, with their files and total size."""
+    profiles: Dict[str, Dict] = {}
+    for path in profile_dir().iterdir():
+        if not PROFILE_FILE_RE.match(path.name):
+            continue
+        profile_id = path.name.split(".", 1)[0]
+        entry = profiles.setdefault(profile_id, {"id": profile_id, "files": [], "bytes": 0})
+        entry["files"].append(path.name)
+        entry["bytes"] += path.stat().st_size
+    for entry in profiles.values():
+        entry["files"].sort()
+    return sorted(profiles.values(), key=lambda entry: entry["id"], reverse=True)
+
+
+def profile_file(name: str) -> Optional[Path]:
+    """Path of a stored profile file, or None for unknown or unsafe names."""
+    if not PROFILE_FILE_RE.match(name):
+        return None
+    path = profile_dir() / name
+    return path if path.is_file() else None
@@ -1,9 +1,18 @@
 from calendar import monthrange
+from collections import defaultdict
 from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional
 
+import numpy as np
 from django.db import transaction as db_transaction
+from django.db.models import Case, DateField, F, Q, Value, When
 
 from tracker.models import RecurringTransaction, Transaction
+from tracker.services.dashboard_cache import bump_data_version
+from tracker.services.instrumentation import span
+from tracker.services.rollups import apply_deltas, rollup_key
+
+BULK_BATCH_SIZE = 500
 
 
 def _add_months(value: date, months: int) -> date:
@@ -45,9 +54,13 @@ def _allowed_weekdays(series: RecurringTransaction):
     return set(range(7))
 
 
-def iter_occurrence_dates(series: RecurringTransaction, start: date, end: date):
+def _stepwise_occurrence_dates(series: RecurringTransaction, start: date, end: date):
+    """Reference walker (day by day / month by month from ``start_date``).
+
+    Kept to property-test and benchmark ``occurrence_dates`` against.
+    """
     if end < start:
-        return []
+        return
 
     if series.repeat == "monthly":
         current = series.start_date
@@ -65,48 +78,205 @@ def iter_occurrence_dates(series: RecurringTransaction, start: date, end: date):
         cursor += timedelta(days=1)
 
 
-def generate_recurring_transactions(user, up_to_date: date) -> int:
-    created = 0
-    series_list = RecurringTransaction.objects.filter(user=user, active=True)
+def _month_lengths(months: np.ndarray) -> np.ndarray:
+    return ((months + 1).astype("datetime64[D]") - months.astype("datetime64[D]")).astype(np.int64)
+
+
+def _monthly_occurrences(series: RecurringTransaction, start: date, end: date) -> np.ndarray:
+    # Each step clamps to the previous occurrence's day (Jan 31 -> Feb 28 ->
+    # Mar 28), so occurrence k falls on min(start day, shortest month in 1..k).
+    anchor = np.datetime64(series.start_date, "M")
+    first_k = max(0, int(np.datetime64(start, "M") - anchor))
+    last_k = int(np.datetime64(end, "M") - anchor)
+    if last_k < first_k:
+        return np.array([], dtype="datetime64[D]")
+
+    carried = series.start_date.day
+    if first_k > 1 and carried > 28:
+        # Any 49 consecutive months include a 28-day February.
+        skipped = anchor + np.arange(1, min(first_k, 49), dtype=np.int64)
+        carried = min(carried, int(_month_lengths(skipped).min()))
+
+    months = anchor + np.arange(first_k, last_k + 1, dtype=np.int64)
+    days = np.minimum(_month_lengths(months), carried)
+    if first_k == 0:
+        days[0] = series.start_date.day
+    days = np.minimum.accumulate(days)
+    dates = months.astype("datetime64[D]") + (days - 1)
+    return dates[(dates >= np.datetime64(start, "D")) & (dates <= np.datetime64(end, "D"))]
+
+
+def occurrence_dates(series: RecurringTransaction, start: date, end: date) -> np.ndarray:
+    """All occurrences of ``series`` within ``[start, end]`` as ``datetime64[D]``."""
+    if end < start:
+        return np.array([], dtype="datetime64[D]")
+    if series.repeat == "monthly":
+        return _monthly_occurrences(series, start, end)
+
+    first = max(series.start_date, start)
+    if end < first:
+        return np.array([], dtype="datetime64[D]")
+    days = np.arange(np.datetime64(first, "D"), np.datetime64(end, "D") + 1)
+    allowed = _allowed_weekdays(series)
+    if len(allowed) == 7:
+        return days
+    # 1970-01-01 was a Thursday (weekday 3).
+    weekdays = (days.astype(np.int64) + 3) % 7
+    return days[np.isin(weekdays, list(allowed))]
+
+
+def iter_occurrence_dates(series: RecurringTransaction, start: date, end: date) -> List[date]:
+    return occurrence_dates(series, start, end).astype(object).tolist()
+
+
+def occurrence_filter(series: RecurringTransaction, start: date, end: date) -> Q:
+    """ORM condition matching the same dates as ``occurrence_dates``.
+
+    Daily and weekly series become a date range plus weekday test instead of
+    a ``date__in`` list that grows with the length of the series.
+    """
+    if series.repeat == "monthly":
+        return Q(date__in=iter_occurrence_dates(series, start, end))
+    condition = Q(date__gte=max(series.start_date, start), date__lte=end)
+    allowed = _allowed_weekdays(series)
+    if len(allowed) < 7:
+        # Django's week_day runs 1 (Sunday) .. 7 (Saturday).
+        condition &= Q(date__week_day__in=[((day + 1) % 7) + 1 for day in allowed])
+    return condition
+
+
+def due_series(up_to_date: date):
+    """Active series that may still have occurrences on or before ``up_to_date``.
+
+    ``last_generated_on`` is the watermark: every occurrence up to and
+    including it has already been materialized.
+    """
+    return RecurringTransaction.objects.filter(
+        Q(active=True, start_date__lte=up_to_date),
+        Q(last_generated_on__isnull=True) | Q(last_generated_on__lt=up_to_date),
+        Q(end_date__isnull=True) | Q(end_date__gte=F("start_date")),
+        Q(end_date__isnull=True) | Q(last_generated_on__isnull=True) | Q(end_date__gt=F("last_generated_on")),
+    )
+
 
+def _due_windows(series_list: Iterable[RecurringTransaction], up_to_date: date):
+    windows = []
+    for series in series_list:
+        start = series.start_date
+        if series.last_generated_on:
+            start = series.last_generated_on + timedelta(days=1)
+        end = up_to_date
+        if series.end_date and series.end_date < end:
+            end = series.end_date
+        if end >= start:
+            windows.append((series, start, end))
+    return windows
+
+
+def _generate_for_series(user_id: int, series_list: List[RecurringTransaction], up_to_date: date) -> int:
+    if not _due_windows(series_list, up_to_date):
+        return 0
     with db_transaction.atomic():
-        for series in series_list:
-            last_date = series.last_generated_on
-            start = series.start_date
-            if last_date:
-                start = last_date + timedelta(days=1)
+        # Lock the series and re-read their watermarks: a dashboard view and
+        # materialize_recurring (or two tabs) may race for the same window,
+        # and only the first one to get the lock may insert it.
+        locked = list(
+            RecurringTransaction.objects.select_for_update()
+            .filter(id__in=[series.id for series in series_list], active=True)
+            .order_by("id")
+        )
+        created = _insert_occurrences(user_id, _due_windows(locked, up_to_date))
+    watermarks = {series.id: series.last_generated_on for series in locked}
+    for series in series_list:
+        series.last_generated_on = watermarks.get(series.id, series.last_generated_on)
+    return created
+
+
+def _insert_occurrences(user_id: int, windows) -> int:
+    if not windows:
+        return 0
 
-            end = up_to_date
-            if series.end_date and series.end_date < end:
-                end = series.end_date
+    # One query for every occurrence that already exists in the whole window.
+    existing = set(
+        Transaction.objects.filter(
+            user_id=user_id,
+            recurring_source_id__in=[series.id for series, _, _ in windows],
+            date__gte=min(start for _, start, _ in windows),
+            date__lte=max(end for _, _, end in windows),
+        ).values_list("recurring_source_id", "date")
+    )
 
-            if end < start:
+    new_items = []
+    deltas = {}
+    for series, start, end in windows:
+        for occurrence in iter_occurrence_dates(series, start, end):
+            if (series.id, occurrence) in existing:
                 continue
+            item = Transaction(
+                user_id=user_id,
+                type=series.type,
+                amount=series.amount,
+                category=series.category,
+                payment_mode=series.payment_mode,
+                date=occurrence,
+                description=series.description,
+                recurring_source=series,
+            )
+            new_items.append(item)
+            key = rollup_key(item)
+            amount, count = deltas.get(key, (0, 0))
+            deltas[key] = (amount + item.amount, count + 1)
 
-            latest_created = None
-            for occurrence in iter_occurrence_dates(series, start, end):
-                if Transaction.objects.filter(
-                    user=user,
-                    recurring_source=series,
-                    date=occurrence,
-                ).exists():
-                    latest_created = occurrence
-                    continue
-                Transaction.objects.create(
-                    user=user,
-                    type=series.type,
-                    amount=series.amount,
-                    category=series.category,
-                    payment_mode=series.payment_mode,
-                    date=occurrence,
-                    description=series.description,
-                    recurring_source=series,
-                )
-                created += 1
-                latest_created = occurrence
-
-            if latest_created and latest_created != series.last_generated_on:
-                series.last_generated_on = latest_created
-                series.save(update_fields=["last_generated_on"])
+    Transaction.objects.bulk_create(new_items, batch_size=BULK_BATCH_SIZE)
+    RecurringTransaction.objects.filter(id__in=[series.id for series, _, _ in windows]).update(
+        last_generated_on=Case(
+            *[When(id=series.id, then=Value(end)) for series, _, end in windows],
+            output_field=DateField(),
+        )
+    )
+    if deltas:
+        apply_deltas(user_id, deltas)
 
-    return created
+    for series, _, end in windows:
+        series.last_generated_on = end
+    return len(new_items)
+
+
+@span("recurring.generate")
+def generate_recurring_transactions(user, up_to_date: date) -> int:
+    series_list = list(due_series(up_to_date).filter(user=user))
+    if not series_list:
+        return 0
+    return _generate_for_series(user.id, series_list, up_to_date)
+
+
+@span("recurring.materialize")
+def materialize_recurring(up_to_date: date, chunk_size: int = 500, user_id: Optional[int] = None) -> Dict[str, int]:
+    """Materialize every due series for all users, ``chunk_size`` series at a time."""
+    stats = {"series": 0, "users": 0, "created": 0}
+    seen_users = set()
+    queryset = due_series(up_to_date).order_by("id")
+    if user_id:
+        queryset = queryset.filter(user_id=user_id)
+
+    last_id = 0
+    while True:
+        chunk = list(queryset.filter(id__gt=last_id)[:chunk_size])
+        if not chunk:
+            break
+        last_id = chunk[-1].id
+
+        by_user = defaultdict(list)
+        for series in chunk:
+            by_user[series.user_id].append(series)
+
+        for owner_id, series_list in by_user.items():
+            created = _generate_for_series(owner_id, series_list, up_to_date)
+            if created:
+                bump_data_version(owner_id)
+            seen_users.add(owner_id)
+            stats["series"] += len(series_list)
+            stats["created"] += created
+
+    stats["users"] = len(seen_users)
+    return stats
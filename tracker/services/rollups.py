@@ -0,0 +1,217 @@
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.db import IntegrityError
+from django.db import transaction as db_transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import TruncMonth
+
+from tracker.models import Transaction, UserMonthRollup
+
+
+# (month, category, type, payment_mode)
+RollupKey = Tuple[date, str, str, str]
+
+
+def month_of(value: date) -> date:
+    return date(value.year, value.month, 1)
+
+
+def _next_month(month: date) -> date:
+    if month.month == 12:
+        return date(month.year + 1, 1, 1)
+    return date(month.year, month.month + 1, 1)
+
+
+def rollup_key(item) -> RollupKey:
+    return (month_of(item.date), item.category, item.type, item.payment_mode)
+
+
+def _bump(user_id: int, key: RollupKey, amount: int, count: int) -> None:
+    month, category, kind, payment_mode = key
+    lookup = {
+        "user_id": user_id,
+        "month": month,
+        "category": category,
+        "type": kind,
+        "payment_mode": payment_mode,
+    }
+    updated = UserMonthRollup.objects.filter(**lookup).update(
+        total=F("total") + amount,
+        count=F("count") + count,
+    )
+    if not updated:
+        if count <= 0:
+            return
+        try:
+            with db_transaction.atomic():
+                UserMonthRollup.objects.create(total=amount, count=count, **lookup)
+        except IntegrityError:
+            # Another writer created the row first; fold our delta into it.
+            UserMonthRollup.objects.filter(**lookup).update(
+                total=F("total") + amount,
+                count=F("count") + count,
+            )
+    if count < 0:
+        UserMonthRollup.objects.filter(count__lte=0, **lookup).delete()
+
+
+def _apply_many(user_id: int, deltas: Dict[RollupKey, Tuple[int, int]]) -> None:
+    rows = {
+        (row.month, row.category, row.type, row.payment_mode): row
+        for row in UserMonthRollup.objects.select_for_update().filter(
+            user_id=user_id,
+            month__in={key[0] for key in deltas},
+        )
+    }
+    changed, created, emptied = [], [], []
+    for key, (amount, count) in deltas.items():
+        row = rows.get(key)
+        if row is None:
+            if count > 0:
+                month, category, kind, payment_mode = key
+                created.append(UserMonthRollup(
+                    user_id=user_id,
+                    month=month,
+                    category=category,
+                    type=kind,
+                    payment_mode=payment_mode,
+                    total=amount,
+                    count=count,
+                ))
+            continue
+        row.total += amount
+        row.count += count
+        if row.count <= 0:
+            emptied.append(row.pk)
+        else:
+            changed.append(row)
+
+    if changed:
+        UserMonthRollup.objects.bulk_update(changed, ["total", "count"])
+    if emptied:
+        UserMonthRollup.objects.filter(pk__in=emptied).delete()
+    if created:
+        UserMonthRollup.objects.bulk_create(created)
+
+
+def apply_deltas(user_id: int, deltas: Dict[RollupKey, Tuple[int, int]]) -> None:
+    """Add ``(amount, count)`` deltas to the user's rollup rows."""
+    deltas = {key: value for key, value in deltas.items() if value[0] or value[1]}
+    if not deltas:
+        return
+    with db_transaction.atomic():
+        if len(deltas) > 1:
+            try:
+                with db_transaction.atomic():
+                    _apply_many(user_id, deltas)
+                return
+            except IntegrityError:
+                # A concurrent writer inserted one of our rows; fall back to
+                # per-row upserts, which tolerate that.
+                pass
+        for key, (amount, count) in deltas.items():
+            _bump(user_id, key, amount, count)
+
+
+def record_created(item: Transaction) -> None:
+    apply_deltas(item.user_id, {rollup_key(item): (item.amount, 1)})
+
+
+def record_deleted(item: Transaction) -> None:
+    apply_deltas(item.user_id, {rollup_key(item): (-item.amount, -1)})
+
+
+def record_changed(user_id: int, old_key: RollupKey, old_amount: int, item: Transaction) -> None:
+    new_key = rollup_key(item)
+    if old_key == new_key:
+        apply_deltas(user_id, {new_key: (item.amount - old_amount, 0)})
+        return
+    apply_deltas(user_id, {
+        old_key: (-old_amount, -1),
+        new_key: (item.amount, 1),
+    })
+
+
+def affected_months(queryset) -> List[date]:
+    return [month_of(value) for value in queryset.dates("date", "month")]
+
+
+def _aggregate_transactions(queryset):
+    return (
+        queryset.annotate(month=TruncMonth("date"))
+        .values("month", "category", "type", "payment_mode")
+        .annotate(total=Sum("amount"), count=Count("id"))
+        .order_by()
+    )
+
+
+def _build_rows(user_id: int, aggregated) -> List[UserMonthRollup]:
+    rows = []
+    for item in aggregated:
+        month_value = item["month"]
+        if hasattr(month_value, "date"):
+            month_value = month_value.date()
+        rows.append(UserMonthRollup(
+            user_id=user_id,
+            month=month_value,
+            category=item["category"],
+            type=item["type"],
+            payment_mode=item["payment_mode"],
+            total=item["total"] or 0,
+            count=item["count"],
+        ))
+    return rows
+
+
+def _months_filter(months: Iterable[date]) -> Q:
+    condition = Q()
+    for month in months:
+        condition |= Q(date__gte=month, date__lt=_next_month(month))
+    return condition
+
+
+def rebuild_months(user, months: Iterable[date]) -> None:
+    """Recompute the rollup rows for ``months`` from the user's transactions."""
+    months = sorted({month_of(month) for month in months})
+    if not months:
+        return
+    user_id = getattr(user, "pk", user)
+    with db_transaction.atomic():
+        UserMonthRollup.objects.filter(user_id=user_id, month__in=months).delete()
+        aggregated = _aggregate_transactions(
+            Transaction.objects.filter(_months_filter(months), user_id=user_id)
+        )
+        UserMonthRollup.objects.bulk_create(_build_rows(user_id, aggregated))
+
+
+def rebuild_user_rollups(user) -> int:
+    user_id = getattr(user, "pk", user)
+    with db_transaction.atomic():
+        UserMonthRollup.objects.filter(user_id=user_id).delete()
+        rows = _build_rows(user_id, _aggregate_transactions(Transaction.objects.filter(user_id=user_id)))
+        UserMonthRollup.objects.bulk_create(rows)
+    return len(rows)
+
+
+def verify_user_rollups(user) -> List[Tuple[RollupKey, Optional[Tuple[int, int]], Optional[Tuple[int, int]]]]:
+    """Return ``(key, stored, expected)`` for every rollup cell that has drifted.
+
+    Totals are integer paise, so the comparison is exact.
+    """
+    user_id = getattr(user, "pk", user)
+    stored = {
+        (row.month, row.category, row.type, row.payment_mode): (row.total, row.count)
+        for row in UserMonthRollup.objects.filter(user_id=user_id)
+    }
+    expected = {
+        (row.month, row.category, row.type, row.payment_mode): (row.total, row.count)
+        for row in _build_rows(user_id, _aggregate_transactions(Transaction.objects.filter(user_id=user_id)))
+    }
+    mismatches = []
+    for key in sorted(set(stored) | set(expected)):
+        have = stored.get(key)
+        want = expected.get(key)
+        if have != want:
+            mismatches.append((key, have, want))
+    return mismatches
@@ -0,0 +1,151 @@
+"""Deterministic synthetic users and history for benchmarks and local load testing."""
+import random
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import List, Optional
+
+from django.contrib.auth.models import User
+from django.db import transaction as db_transaction
+from django.utils import timezone
+
+from tracker.models import (
+    CategoryBudget,
+    MonthlyBudget,
+    Profile,
+    RecurringTransaction,
+    SavingsGoal,
+    Transaction,
+)
+from tracker.services.recurring import generate_recurring_transactions
+from tracker.services.rollups import month_of, rebuild_user_rollups
+
+INSERT_BATCH = 5000
+
+# (description, category, typical amount in rupees)
+MERCHANTS = [
+    ("Swiggy order", "food", 350),
+    ("Zomato dinner", "food", 600),
+    ("Cafe coffee", "food", 180),
+    ("Uber ride", "transport", 250),
+    ("Petrol pump", "transport", 1500),
+    ("Amazon order", "shopping", 1200),
+    ("Flipkart", "shopping", 2000),
+    ("Mall shopping", "shopping", 3000),
+    ("Pharmacy", "other", 400),
+    ("Electricity bill", "other", 1800),
+]
+
+
+@dataclass
+class SeedSummary:
+    users: int = 0
+    transactions: int = 0
+    recurring_series: int = 0
+    recurring_transactions: int = 0
+    budgets: int = 0
+    goals: int = 0
+
+
+def _months(start: date, end: date) -> List[date]:
+    months, month = [], month_of(start)
+    while month <= end:
+        months.append(month)
+        month = date(month.year + (month.month == 12), month.month % 12 + 1, 1)
+    return months
+
+
+def _user_transactions(user: User, rng: random.Random, start: date, end: date):
+    day = start
+    salary = rng.randint(40, 150) * 1000
+    while day <= end:
+        if day.day == 1:
+            yield Transaction(
+                user=user, type="income", amount=salary * 100, category="salary",
+                payment_mode="online", date=day, description="Salary credit",
+            )
+        for _ in range(rng.randint(0, 4)):
+            description, category, typical = rng.choice(MERCHANTS)
+            rupees = max(10, int(rng.lognormvariate(0, 0.5) * typical))
+            yield Transaction(
+                user=user, type="expense", amount=rupees * 100 + rng.randint(0, 99), category=category,
+                payment_mode="cash" if rng.random() < 0.25 else "online", date=day,
+                description=f"{description} {rng.randint(1000, 9999)}",
+            )
+        day += timedelta(days=1)
+
+
+def seed_synthetic_data(
+    users: int = 10,
+    years: float = 2,
+    seed: int = 0,
+    prefix: str = "synthetic",
+    today: Optional[date] = None,
+) -> SeedSummary:
+    """Create ``users`` users named ``{prefix}-{n}`` with ``years`` of history up to ``today``.
+
+    The same arguments always produce the same data. Each user gets daily
+    expenses, a monthly salary, three recurring series (materialized up to
+    ``today``), monthly and category budgets, and two savings goals.
+    Rollups are rebuilt at the end, as bulk inserts bypass them.
+    """
+    rng = random.Random(seed)
+    today = today or timezone.localdate()
+    start = today - timedelta(days=int(years * 365))
+    months = _months(start, today)
+    summary = SeedSummary()
+
+    with db_transaction.atomic():
+        created = User.objects.bulk_create([
+            User(username=f"{prefix}-{idx}", email=f"{prefix}-{idx}@example.com", password="!")
+            for idx in range(users)
+        ])
+        Profile.objects.bulk_create([Profile(user=user, full_name=user.username.title()) for user in created])
+        summary.users = len(created)
+
+        for user in created:
+            batch = []
+            for item in _user_transactions(user, rng, start, today):
+                batch.append(item)
+                if len(batch) >= INSERT_BATCH:
+                    Transaction.objects.bulk_create(batch)
+                    summary.transactions += len(batch)
+                    batch = []
+            Transaction.objects.bulk_create(batch)
+            summary.transactions += len(batch)
+
+            series = RecurringTransaction.objects.bulk_create([
+                RecurringTransaction(
+                    user=user, type="expense", amount=rng.randint(80, 300) * 10000, category="rent",
+                    description="Flat rent", start_date=start, repeat="monthly",
+                ),
+                RecurringTransaction(
+                    user=user, type="expense", amount=rng.randint(50, 150) * 100, category="transport",
+                    description="Metro card", start_date=start, repeat="weekly", weekdays="0,2,4",
+                ),
+                RecurringTransaction(
+                    user=user, type="expense", amount=rng.randint(20, 60) * 100, category="food",
+                    description="Office lunch", start_date=start, repeat="daily",
+                    end_date=start + timedelta(days=rng.randint(60, 365)),
+                ),
+            ])
+            summary.recurring_series += len(series)
+            summary.recurring_transactions += generate_recurring_transactions(user, today)
+
+            monthly = MonthlyBudget.objects.bulk_create([
+                MonthlyBudget(user=user, month=month, total_amount=rng.randint(30, 90) * 100000) for month in months
+            ])
+            per_category = CategoryBudget.objects.bulk_create([
+                CategoryBudget(user=user, month=month, category=category, amount=rng.randint(5, 20) * 100000)
+                for month in months
+                for category in ("food", "transport", "shopping")
+            ])
+            summary.budgets += len(monthly) + len(per_category)
+
+            SavingsGoal.objects.bulk_create([
+                SavingsGoal(user=user, name="Emergency fund", target_amount=rng.randint(1, 5) * 10000000),
+                SavingsGoal(user=user, name="Vacation", target_amount=rng.randint(5, 30) * 1000000),
+            ])
+            summary.goals += 2
+
+            rebuild_user_rollups(user)
+    return summary
@@ -57,6 +57,117 @@
     }
   }
 
+  // Deferred dashboard sections: fetched in parallel after first paint.
+  const renderChart = (canvasId, config) => {
+    const canvas = qs(canvasId);
+    if (!canvas || !window.Chart) return;
+    if (canvas.chartInstance) canvas.chartInstance.destroy();
+    canvas.chartInstance = new window.Chart(canvas, config);
+  };
+
+  const sectionRenderers = {
+    charts(section, data) {
+      const { category, trend } = data;
+      const incomeExpense = data.income_expense;
+      if (category && category.labels) {
+        renderChart("#categoryChart", {
+          type: "pie",
+          data: {
+            labels: category.labels,
+            datasets: [{
+              data: category.values || [],
+              backgroundColor: ["#6366f1","#10b981","#f59e0b","#ef4444","#0ea5e9","#8b5cf6"],
+            }],
+          },
+          options: {
+            plugins: {
+              legend: { position: "bottom" },
+            },
+          },
+        });
+      }
+      if (trend && trend.labels) {
+        renderChart("#trendChart", {
+          type: "line",
+          data: {
+            labels: trend.labels,
+            datasets: [{
+              label: "Expenses",
+              data: trend.values || [],
+              borderColor: "#4f46e5",
+              backgroundColor: "rgba(79,70,229,.2)",
+              fill: true,
+              tension: 0.4,
+            }],
+          },
+          options: {
+            plugins: { legend: { display: false } },
+            scales: { y: { beginAtZero: true } },
+          },
+        });
+      }
+      if (incomeExpense && incomeExpense.labels) {
+        renderChart("#incomeExpenseChart", {
+          type: "bar",
+          data: {
+            labels: incomeExpense.labels,
+            datasets: [{
+              data: incomeExpense.values || [],
+              backgroundColor: ["#10b981", "#ef4444"],
+              borderRadius: 8,
+            }],
+          },
+          options: {
+            plugins: { legend: { display: false } },
+            scales: { y: { beginAtZero: true } },
+          },
+        });
+      }
+    },
+
+    insights(section, data) {
+      const list = section.querySelector("[data-insight-list]");
+      if (!list) return;
+      list.replaceChildren(...(data.items || []).map((item) => {
+        const card = document.createElement("div");
+        card.className = `insight-card ${item.tone || "neutral"}`;
+        card.textContent = item.text;
+        return card;
+      }));
+    },
+
+    prediction(section, data) {
+      const tones = { high: "danger", under: "warning", healthy: "success" };
+      const pill = section.querySelector("[data-prediction-risk]");
+      if (pill) {
+        pill.className = `status-pill ${tones[data.risk_level] || "neutral"}`;
+        pill.textContent = data.risk_label;
+      }
+      const month = section.querySelector("[data-prediction-month]");
+      if (month) month.textContent = `Prediction for ${data.month_label}`;
+      const value = section.querySelector("[data-prediction-value]");
+      if (value) value.textContent = data.predicted_display;
+      const note = section.querySelector("[data-prediction-note]");
+      if (note) note.textContent = data.explanation;
+    },
+  };
+
+  const loadDashboardSections = () => Promise.all(qsa("[data-dashboard-section]").map(async (section) => {
+    const render = sectionRenderers[section.dataset.dashboardSection];
+    if (!render || !section.dataset.url) return;
+    try {
+      const response = await fetch(section.dataset.url, {
+        credentials: "same-origin",
+        headers: { Accept: "application/json" },
+      });
+      if (!response.ok) throw new Error(`HTTP ${response.status}`);
+      render(section, await response.json());
+      section.dataset.loaded = "1";
+    } catch (err) {
+      section.dataset.loaded = "error";
+    }
+  }));
+
   document.addEventListener("DOMContentLoaded", () => {
     const openBtn = qs("#openDrawerBtn");
     const closeBtn = qs("#drawerClose");
@@ -209,16 +320,17 @@
     const deleteModal = qs("#deleteModal");
     const deleteForm = qs("#deleteForm");
     const deleteText = qs("#deleteModalText");
-    qsa("[data-delete-url]").forEach((btn) => {
-      btn.addEventListener("click", () => {
-        if (deleteForm) {
-          deleteForm.action = btn.dataset.deleteUrl;
-        }
-        if (deleteText) {
-          deleteText.textContent = `Delete ${btn.dataset.deleteLabel}?`;
-        }
-        openModal(deleteModal);
-      });
+    // Delegated so rows appended by "Load more" work too.
+    document.addEventListener("click", (event) => {
+      const btn = event.target.closest("[data-delete-url]");
+      if (!btn) return;
+      if (deleteForm) {
+        deleteForm.action = btn.dataset.deleteUrl;
+      }
+      if (deleteText) {
+        deleteText.textContent = `Delete ${btn.dataset.deleteLabel}?`;
+      }
+      openModal(deleteModal);
     });
 
     // Reset transactions modal
@@ -232,21 +344,61 @@
     // Edit transaction modal
     const editModal = qs("#editModal");
     const editForm = qs("#editForm");
-    qsa("[data-edit-transaction]").forEach((btn) => {
-      btn.addEventListener("click", () => {
-        if (editForm && btn.dataset.editUrl) {
-          editForm.action = btn.dataset.editUrl;
-        }
-        qs("#editType").value = btn.dataset.type || "expense";
-        qs("#editPayment").value = btn.dataset.payment || "online";
-        qs("#editAmount").value = btn.dataset.amount || "";
-        qs("#editCategory").value = btn.dataset.category || "other";
-        qs("#editDate").value = btn.dataset.date || "";
-        qs("#editDescription").value = btn.dataset.description || "";
-        openModal(editModal);
-      });
+    document.addEventListener("click", (event) => {
+      const btn = event.target.closest("[data-edit-transaction]");
+      if (!btn) return;
+      if (editForm && btn.dataset.editUrl) {
+        editForm.action = btn.dataset.editUrl;
+      }
+      qs("#editType").value = btn.dataset.type || "expense";
+      qs("#editPayment").value = btn.dataset.payment || "online";
+      qs("#editAmount").value = btn.dataset.amount || "";
+      qs("#editCategory").value = btn.dataset.category || "other";
+      qs("#editDate").value = btn.dataset.date || "";
+      qs("#editDescription").value = btn.dataset.description || "";
+      openModal(editModal);
     });
 
+    // Transaction pages (keyset cursor in the URL)
+    const transactionList = qs("[data-transaction-list]");
+    const moreBtn = qs("[data-transactions-next]");
+    if (transactionList && moreBtn) {
+      let loading = false;
+      let observer = null;
+      const loadMore = async () => {
+        const url = moreBtn.dataset.transactionsNext;
+        if (loading || !url) return;
+        loading = true;
+        moreBtn.disabled = true;
+        try {
+          const response = await fetch(url, {
+            credentials: "same-origin",
+            headers: { Accept: "application/json" },
+          });
+          if (!response.ok) throw new Error(`HTTP ${response.status}`);
+          const data = await response.json();
+          transactionList.insertAdjacentHTML("beforeend", data.html || "");
+          moreBtn.dataset.transactionsNext = data.next_url || "";
+          if (!data.next_url) {
+            if (observer) observer.disconnect();
+            moreBtn.remove();
+          }
+        } catch (err) {
+          // Leave the button in place so the user can retry.
+        } finally {
+          loading = false;
+          moreBtn.disabled = false;
+        }
+      };
+      moreBtn.addEventListener("click", loadMore);
+      if ("IntersectionObserver" in window) {
+        observer = new IntersectionObserver((entries) => {
+          if (entries.some((entry) => entry.isIntersecting)) loadMore();
+        }, { rootMargin: "400px 0px" });
+        observer.observe(moreBtn);
+      }
+    }
+
     // Recurring edit modal
     const recurringEditModal = qs("#recurringEditModal");
     const recurringEditForm = qs("#recurringEditForm");
@@ -382,6 +534,8 @@
       });
     }
 
+    loadDashboardSections();
+
     window.dashboardReady = true;
   });
 
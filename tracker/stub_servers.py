@@ -0,0 +1,144 @@
+"""Local stand-ins for the email providers, used by tests and benchmarks."""
+import json
+import socketserver
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StubSendGridServer:
+    """Minimal HTTP/1.1 keep-alive server that accepts SendGrid mail/send posts.
+
+    Records every request payload and counts TCP connections, so callers can
+    check both batching and connection reuse::
+
+        with StubSendGridServer() as stub:
+            with override_settings(SENDGRID_API_URL=stub.url): ...
+    """
+
+    def __init__(self, status: int = 202):
+        self.status = status
+        self.payloads = []
+        self.connections = 0
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                with stub._lock:
+                    stub.connections += 1
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                with stub._lock:
+                    stub.payloads.append(payload)
+                self.send_response(stub.status)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/v3/mail/send"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def requests(self) -> int:
+        return len(self.payloads)
+
+    @property
+    def recipients(self) -> int:
+        return sum(len(payload.get("personalizations", [])) for payload in self.payloads)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class StubSMTPServer:
+    """Plain-text SMTP server (no TLS, no AUTH) that accepts every message.
+
+    Counts connections and delivered messages. ``drop_after`` closes a
+    connection after that many messages without a reply, to exercise
+    client reconnects; recipients in ``refuse`` get a permanent 550::
+
+        with StubSMTPServer() as stub:
+            with override_settings(EMAIL_PORT=stub.port, ...): ...
+    """
+
+    def __init__(self, drop_after: int = 0, refuse=()):
+        self.drop_after = drop_after
+        self.refuse = set(refuse)
+        self.messages = []
+        self.connections = 0
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def reply(self, line: str):
+                self.wfile.write(line.encode() + b"\r\n")
+
+            def handle(self):
+                with stub._lock:
+                    stub.connections += 1
+                delivered = 0
+                recipients = []
+                self.reply("220 stub ESMTP")
+                while True:
+                    line = self.rfile.readline()
+                    if not line:
+                        return
+                    verb = line.decode("utf-8", "replace").strip().split(" ", 1)[0].upper()
+                    if verb == "EHLO":
+                        self.reply("250-stub")
+                        self.reply("250 8BITMIME")
+                    elif verb == "RCPT":
+                        address = line.decode("utf-8", "replace").split(":", 1)[-1].strip(" <>\r\n")
+                        if address in stub.refuse:
+                            self.reply("550 No such user")
+                            continue
+                        recipients.append(address)
+                        self.reply("250 OK")
+                    elif verb == "DATA":
+                        self.reply("354 End data with <CR><LF>.<CR><LF>")
+                        while self.rfile.readline() not in (b".\r\n", b".\n", b""):
+                            pass
+                        if stub.drop_after and delivered >= stub.drop_after:
+                            return
+                        delivered += 1
+                        with stub._lock:
+                            stub.messages.append(recipients)
+                        recipients = []
+                        self.reply("250 OK queued")
+                    elif verb == "RSET":
+                        recipients = []
+                        self.reply("250 OK")
+                    elif verb == "QUIT":
+                        self.reply("221 Bye")
+                        return
+                    elif verb in ("HELO", "MAIL", "NOOP"):
+                        self.reply("250 OK")
+                    else:
+                        self.reply("502 Command not implemented")
+
+        self.server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.port = self.server.server_address[1]
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
@@ -1,5 +1,5 @@
 {% load static %}
-const CACHE_VERSION = "v2";
+const CACHE_VERSION = "v4";
 const CACHE_NAME = `expense-tracker-${CACHE_VERSION}`;
 const PRECACHE_URLS = [
   "/manifest.json",
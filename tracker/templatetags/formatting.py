@@ -1,15 +1,24 @@
 from django import template
 
+from tracker.services.money import format_currency, format_rupees
+
 register = template.Library()
 
 
-@register.filter
-def currency(value):
+def _paise(value) -> int:
     try:
-        amount = float(value)
+        return int(value)
     except (TypeError, ValueError):
-        amount = 0.0
-    sign = "-" if amount < 0 else ""
-    amount = abs(amount)
-    formatted = f"{amount:,.2f}"
-    return f"{sign}₹{formatted}"
+        return 0
+
+
+@register.filter
+def currency(value):
+    """Render a paise amount as ``₹1,234.50``."""
+    return format_currency(_paise(value))
+
+
+@register.filter
+def rupees(value):
+    """Plain ``1234.50`` for form values and data attributes."""
+    return format_rupees(_paise(value))
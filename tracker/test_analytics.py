@@ -0,0 +1,252 @@
+from datetime import date, timedelta
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
+
+from tracker.models import Transaction, UserMonthRollup
+from tracker.services.analytics import (
+    aggregate_totals,
+    build_insights,
+    build_monthly_trend,
+    category_expense_breakdown,
+    load_analytics_cube,
+)
+from tracker.services.dashboard_cache import DashboardCache, dashboard_cache
+from tracker.services.filters import apply_filters, parse_filters
+from tracker.services.rollups import rebuild_user_rollups, verify_user_rollups
+from tracker.views import PREDICTION_RISK_LABELS, _build_dashboard_context
+
+
+class AnalyticsCubeTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="cube", email="cube@example.com", password="x")
+        self.factory = RequestFactory()
+        dashboard_cache.clear()
+        rows = [
+            ("income", 50000, "salary", "online", date(2026, 1, 1)),
+            ("expense", 1200, "food", "online", date(2026, 1, 5)),
+            ("expense", 300, "transport", "cash", date(2026, 1, 20)),
+            ("expense", 15000, "rent", "online", date(2026, 2, 1)),
+            ("expense", 450, "food", "cash", date(2026, 2, 14)),
+            ("income", 2000, "other", "cash", date(2026, 2, 28)),
+            ("expense", 800, "shopping", "online", date(2026, 3, 3)),
+        ]
+        for kind, amount, category, mode, day in rows:
+            Transaction.objects.create(
+                user=self.user,
+                type=kind,
+                amount=amount * 100,
+                category=category,
+                payment_mode=mode,
+                date=day,
+            )
+        rebuild_user_rollups(self.user)
+
+    def _filters(self, **params):
+        return parse_filters(self.factory.get("/", params))
+
+    def test_windowed_totals_match_queryset_aggregate(self):
+        cases = [
+            {},
+            {"month": "2026-02"},
+            {"start": "2026-01-10", "end": "2026-02-20"},
+            {"category": "food"},
+            {"payment": "cash", "start": "2026-01-06"},
+        ]
+        for params in cases:
+            with self.subTest(params=params):
+                filters = self._filters(**params)
+                cube = load_analytics_cube(self.user, filters)
+                expected = aggregate_totals(apply_filters(Transaction.objects.filter(user=self.user), filters))
+                actual = cube.totals(category=filters.category, payment_mode=filters.payment_mode, windowed=True)
+                self.assertEqual(actual, expected)
+
+    def test_breakdown_trend_and_insights_come_from_cube(self):
+        cube = load_analytics_cube(self.user, self._filters(month="2026-02"))
+
+        breakdown = category_expense_breakdown(cube)
+        self.assertEqual([item["category"] for item in breakdown], ["rent", "food"])
+
+        trend = build_monthly_trend(cube, date(2026, 3, 1), count=3)
+        self.assertEqual(trend["values"], [1500.0, 15450.0, 800.0])
+
+        insights = build_insights(cube, date(2026, 2, 1))
+        self.assertIn("Highest spending category: Rent.", [item["text"] for item in insights])
+
+    def test_dashboard_context_query_count_is_bounded(self):
+        request = self.factory.get("/", {"month": "2026-02", "category": "food"})
+        request.user = self.user
+
+        with CaptureQueriesContext(connection) as ctx:
+            context = _build_dashboard_context(request)
+            list(context["transactions"])
+            list(context["recurring_items"])
+        statements = [
+            query["sql"] for query in ctx.captured_queries
+            if "SAVEPOINT" not in query["sql"].upper()
+        ]
+        rollup_reads = [sql for sql in statements if "tracker_usermonthrollup" in sql]
+        transaction_aggregates = [
+            sql for sql in statements
+            if "tracker_transaction" in sql and "SUM(" in sql.upper()
+        ]
+        self.assertEqual(len(rollup_reads), 1)
+        self.assertEqual(transaction_aggregates, [])
+        self.assertLessEqual(len(statements), 9)
+        self.assertEqual(context["total_expense"], 45000)
+
+
+class MonthRollupTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="rollup", email="rollup@example.com", password="x")
+        self.client.force_login(self.user)
+
+    def _create(self, **overrides):
+        data = {
+            "type": "expense",
+            "amount": "250",
+            "category": "food",
+            "payment_mode": "online",
+            "date": "2026-03-10",
+        }
+        data.update(overrides)
+        self.client.post("/transactions/create/", data)
+
+    def test_rollups_track_create_edit_delete_and_reset(self):
+        self._create()
+        self._create(amount="100", date="2026-03-12")
+        self._create(type="income", category="salary", amount="9000", date="2026-04-01")
+
+        row = UserMonthRollup.objects.get(user=self.user, month=date(2026, 3, 1), type="expense")
+        self.assertEqual((row.total, row.count), (35000, 2))
+
+        item = Transaction.objects.get(user=self.user, amount=10000)
+        self.client.post(f"/transactions/{item.id}/edit/", {"amount": "40", "date": "2026-04-02"})
+        self.assertEqual(verify_user_rollups(self.user), [])
+
+        self.client.post(f"/transactions/{item.id}/delete/")
+        self.assertEqual(verify_user_rollups(self.user), [])
+
+        self.client.post("/transactions/reset/?month=2026-03")
+        self.assertEqual(verify_user_rollups(self.user), [])
+        self.assertFalse(UserMonthRollup.objects.filter(user=self.user, month=date(2026, 3, 1)).exists())
+        self.assertTrue(UserMonthRollup.objects.filter(user=self.user, month=date(2026, 4, 1)).exists())
+
+
+class DashboardCacheTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="cached", email="cached@example.com", password="x")
+        self.client.force_login(self.user)
+        dashboard_cache.clear()
+
+    def test_repeat_views_hit_cache_until_a_write_bumps_the_version(self):
+        self.client.get("/")
+        self.client.get("/")
+        self.assertEqual((dashboard_cache.hits, dashboard_cache.misses), (1, 1))
+
+        self.client.post("/transactions/create/", {
+            "type": "expense",
+            "amount": "120",
+            "category": "food",
+            "date": "2026-03-10",
+        })
+        response = self.client.get("/", {"month": "2026-03"})
+        self.assertEqual(dashboard_cache.misses, 2)
+        self.assertEqual(response.context["total_expense"], 12000)
+
+        self.client.get("/", {"month": "2026-03", "sort": "amount_asc"})
+        self.assertEqual(dashboard_cache.hits, 2)
+
+    def test_cache_is_bounded(self):
+        cache = DashboardCache(max_entries=2, ttl=60)
+        for key in ("a", "b", "c"):
+            cache.set(key, key)
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.get("c"), "c")
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+
+class DashboardSectionTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="sections", email="sections@example.com", password="x")
+        self.client.force_login(self.user)
+        dashboard_cache.clear()
+        self.client.post("/transactions/create/", {
+            "type": "expense",
+            "amount": "120",
+            "category": "food",
+            "date": "2026-03-10",
+        })
+
+    def test_shell_defers_sections_to_json_endpoints(self):
+        response = self.client.get("/", {"month": "2026-03", "sort": "amount_asc"})
+        self.assertNotIn("trend_chart", response.context)
+        self.assertContains(response, 'data-url="/api/dashboard/charts/?month=2026-03"')
+
+        charts = self.client.get("/api/dashboard/charts/", {"month": "2026-03"})
+        self.assertEqual(charts.json()["category"], {"labels": ["Food"], "values": [120.0]})
+        self.assertNotIn(b", ", charts.content)
+        self.assertEqual(self.client.get("/api/dashboard/insights/", {"month": "2026-03"}).json()["month"], "2026-03-01")
+        prediction = self.client.get("/api/dashboard/prediction/").json()
+        self.assertEqual(prediction["risk_label"], PREDICTION_RISK_LABELS[prediction["risk_level"]])
+        self.assertTrue(prediction["predicted_display"].startswith("₹"))
+        self.assertEqual(self.client.get("/api/dashboard/totals/").status_code, 404)
+
+    def test_etag_revalidates_until_data_changes(self):
+        first = self.client.get("/api/dashboard/charts/")
+        self.assertIn("no-cache", first["Cache-Control"])
+        again = self.client.get("/api/dashboard/charts/", HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(again.status_code, 304)
+
+        self.client.post("/transactions/create/", {
+            "type": "expense",
+            "amount": "80",
+            "category": "transport",
+            "date": "2026-03-11",
+        })
+        changed = self.client.get("/api/dashboard/charts/", HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(changed.status_code, 200)
+        self.assertEqual(changed.json()["category"]["labels"], ["Food", "Transport"])
+
+
+class MonthFilterIndexTests(TestCase):
+    def setUp(self):
+        self.users = [User.objects.create_user(username=f"idx{idx}", password="x") for idx in range(20)]
+        Transaction.objects.bulk_create([
+            Transaction(
+                user=user,
+                type="expense" if day % 3 else "income",
+                amount=day,
+                category="food",
+                date=date(2025, 1, 1) + timedelta(days=day),
+            )
+            for user in self.users
+            for day in range(0, 365, 2)
+        ])
+        with connection.cursor() as cursor:
+            if connection.vendor == "postgresql":
+                cursor.execute("ANALYZE tracker_transaction")
+                cursor.execute("SET enable_seqscan = off")
+            else:
+                cursor.execute("ANALYZE")
+
+    def test_month_filter_is_a_half_open_range(self):
+        qs = apply_filters(Transaction.objects.all(), parse_filters(RequestFactory().get("/", {"month": "2025-12"})))
+        sql = str(qs.query)
+        self.assertIn('"date" >= 2025-12-01', sql)
+        self.assertIn('"date" < 2026-01-01', sql)
+
+    def test_planner_uses_composite_indexes(self):
+        filters = parse_filters(RequestFactory().get("/", {"month": "2025-03"}))
+        user = self.users[7]
+        cases = {
+            "tracker_txn_user_date_idx": apply_filters(Transaction.objects.filter(user=user), filters),
+            "tracker_txn_user_type_date_idx": apply_filters(
+                Transaction.objects.filter(user=user, type="expense"), filters
+            ),
+        }
+        for index, qs in cases.items():
+            with self.subTest(index=index):
+                self.assertIn(index, qs.explain())
@@ -0,0 +1,73 @@
+import os
+import random
+import tempfile
+
+from django.test import SimpleTestCase, override_settings
+
+from tracker.services.categorization import (
+    KEYWORD_CATEGORY_MAP,
+    KeywordMatcher,
+    KeywordRule,
+    builtin_rules,
+    load_keyword_file,
+    suggest_categories,
+    suggest_category,
+)
+
+
+def _substring_reference(description):
+    value = description.lower()
+    for category, keywords in KEYWORD_CATEGORY_MAP.items():
+        if any(keyword in value for keyword in keywords):
+            return category
+    return None
+
+
+class KeywordMatcherTests(SimpleTestCase):
+    def test_matches_old_substring_scan_on_random_descriptions(self):
+        rng = random.Random(18)
+        words = [kw for kws in KEYWORD_CATEGORY_MAP.values() for kw in kws] + ["x", "pay", "ment", "the", "ub", "er"]
+        for _ in range(2000):
+            description = rng.choice(["", " ", "-"]).join(rng.choice(words) for _ in range(rng.randint(0, 4))).upper()
+            self.assertEqual(suggest_category(description), _substring_reference(description), description)
+
+    def test_priority_beats_position_and_ties_go_to_load_order(self):
+        matcher = KeywordMatcher([
+            KeywordRule("uber", "transport"),
+            KeywordRule("uber eats", "food", priority=-1),
+            KeywordRule("eats", "shopping"),
+        ])
+        self.assertEqual(matcher.match("Uber Eats order"), "food")
+        self.assertEqual(matcher.match("uber ride, eats later"), "transport")
+
+    def test_word_boundary_rules_ignore_partial_words(self):
+        matcher = KeywordMatcher([KeywordRule("bus", "transport", word_boundary=True), KeywordRule("business", "other", 5)])
+        self.assertEqual(matcher.match("City bus pass"), "transport")
+        self.assertEqual(matcher.match("bus"), "transport")
+        self.assertEqual(matcher.match("Business lunch"), "other")
+        self.assertIsNone(matcher.match("omnibuses"))
+
+    def test_batch_api_matches_single_calls(self):
+        descriptions = ["Swiggy order", "SWIGGY ORDER", "", None, "Metro card", "gift"]
+        self.assertEqual(suggest_categories(descriptions), [suggest_category(d) for d in descriptions])
+
+    def test_external_keyword_file_extends_builtin_map(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False) as handle:
+            handle.write("# keyword,category,priority,word_boundary\n")
+            handle.write("blinkit,food\n")
+            handle.write("irctc,transport,-1\n")
+            handle.write("gym,shopping,0,word\n")
+            handle.write("broken\n")
+        self.addCleanup(os.unlink, handle.name)
+
+        with self.assertLogs("tracker.services.categorization", "WARNING"):
+            rules = load_keyword_file(handle.name)
+        self.assertEqual(rules[2], KeywordRule("gym", "shopping", 0, True))
+        with override_settings(CATEGORY_KEYWORDS_FILE=handle.name):
+            self.assertEqual(suggest_category("Blinkit groceries"), "food")
+            self.assertEqual(suggest_category("IRCTC train rent refund"), "transport")
+            self.assertIsNone(suggest_category("gymkhana"))
+        self.assertIsNone(suggest_category("Blinkit groceries"))
+
+    def test_builtin_rules_keep_map_order(self):
+        self.assertEqual(builtin_rules()[0], KeywordRule("swiggy", "food"))
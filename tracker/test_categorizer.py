@@ -0,0 +1,82 @@
+import time
+
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from tracker.models import Transaction, UserCategorizer
+from tracker.services.learned_categorizer import NaiveBayesModel, model_cache, predict_category, rebuild_model
+
+
+class NaiveBayesModelTests(SimpleTestCase):
+    def test_learns_and_forgets_incrementally(self):
+        model = NaiveBayesModel()
+        model.update("Uber to office 4521", "food")
+        model.update("Uber ride home", "food")
+        self.assertEqual(model.predict("UBER trip"), "food")
+
+        model.update("Uber ride home", "food", -1)
+        model.update("Uber ride home", "transport")
+        model.update("Uber airport", "transport")
+        self.assertEqual(model.predict("uber"), "transport")
+        self.assertIsNone(model.predict("netflix 199"))
+
+    def test_round_trips_through_stored_counts(self):
+        model = NaiveBayesModel()
+        model.update("chai point cafe", "food")
+        restored = NaiveBayesModel.from_counts(model.to_counts())
+        self.assertEqual(restored.totals, model.totals)
+        self.assertEqual(restored.predict("chai"), "food")
+
+    def test_prune_keeps_vocabulary_bounded(self):
+        model = NaiveBayesModel()
+        for idx in range(300):
+            model.update(f"merchant{idx} store", "shopping")
+        model.prune(100)
+        self.assertLessEqual(len(model.tokens), 100)
+        self.assertIn("store", model.tokens)
+        self.assertEqual(model.totals["shopping"], sum(per["shopping"] for per in model.tokens.values()))
+
+    def test_prediction_takes_well_under_a_millisecond(self):
+        model = NaiveBayesModel()
+        for idx in range(2000):
+            model.update(f"merchant{idx} upi payment order", ["food", "transport", "shopping", "rent"][idx % 4])
+        started = time.perf_counter()
+        for idx in range(1000):
+            model.predict(f"UPI payment merchant{idx} 99812")
+        self.assertLess((time.perf_counter() - started) / 1000, 0.001)
+
+
+@override_settings(CATEGORIZER_MAX_VOCAB=2000)
+class LearnedCategorizerViewTests(TestCase):
+    def setUp(self):
+        model_cache.clear()
+        self.user = User.objects.create(username="learner")
+        self.client.force_login(self.user)
+
+    def _create(self, description, category="auto"):
+        self.client.post(reverse("create_transaction"), {
+            "amount": "120", "type": "expense", "category": category, "description": description, "date": "2026-03-10",
+        })
+        return Transaction.objects.filter(user=self.user).latest("id")
+
+    def test_corrections_override_keyword_map(self):
+        self.assertEqual(self._create("Uber eats dinner").category, "transport")
+        wrong = self._create("Uber eats lunch")
+        self.client.post(reverse("edit_transaction", args=[wrong.id]), {"category": "food"})
+        self._create("Uber eats breakfast", category="food")
+
+        self.user.refresh_from_db()
+        self.assertEqual(self._create("uber eats order 8812").category, "food")
+        # Unknown merchants still fall back to the keyword map.
+        self.assertEqual(self._create("Amazon order").category, "shopping")
+
+    def test_delete_and_reset_keep_counts_in_step_with_history(self):
+        item = self._create("Blue Tokai beans", category="food")
+        self.client.post(reverse("delete_transaction", args=[item.id]))
+        self.assertEqual(UserCategorizer.objects.get(user=self.user).counts, {"docs": {}, "tokens": {}})
+
+        self._create("Blue Tokai beans", category="food")
+        self.client.post(reverse("reset_transactions"))
+        self.assertEqual(rebuild_model(self.user.id).docs, {})
+        self.assertIsNone(predict_category(self.user, "Blue Tokai"))
@@ -0,0 +1,154 @@
+import threading
+import time
+from datetime import date, timedelta
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+
+from tracker.models import EmailLog
+from tracker.services.email_dispatch import EmailDispatcher, TokenBucket
+from tracker.services.email_service import (
+    EmailContent,
+    _week_start,
+    _week_start_at,
+    claim_emails,
+    should_send_email,
+)
+from tracker.stub_servers import StubSMTPServer
+from tracker.tests import SMTP_SETTINGS
+
+
+def _content(email_type="overspend"):
+    return EmailContent(subject="Hi", body="Body", email_type=email_type, related_month=date(2026, 3, 1))
+
+
+class RecordingSender:
+    def __init__(self, errors=(), delay=0.0):
+        self.errors = list(errors)
+        self.delay = delay
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def __call__(self, to_email, subject, body):
+        time.sleep(self.delay)
+        with self._lock:
+            self.calls.append(to_email)
+            return self.errors.pop(0) if self.errors else None
+
+
+class TokenBucketTests(SimpleTestCase):
+    def test_waits_for_refill_once_burst_is_spent(self):
+        now = [0.0]
+        slept = []
+
+        def sleep(seconds):
+            slept.append(seconds)
+            now[0] += seconds
+
+        bucket = TokenBucket(rate=2, burst=2, clock=lambda: now[0], sleep=sleep)
+        self.assertEqual([bucket.acquire() for _ in range(3)], [0.0, 0.0, 0.5])
+        self.assertEqual(slept, [0.5])
+
+
+class EmailRetryTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="retry", email="retry@example.com", password="x")
+
+    def test_transient_errors_are_retried_with_backoff(self):
+        sender = RecordingSender(errors=["Failed to send email. Try again."])
+        sleeps = []
+        dispatcher = EmailDispatcher(rate=0, retries=2, backoff=1, provider_caps={}, sender=sender, sleep=sleeps.append)
+
+        stats = dispatcher.run([(self.user, _content())])
+
+        self.assertEqual((stats.sent, stats.retries, len(sender.calls)), (1, 1, 2))
+        self.assertTrue(1 <= sleeps[0] <= 1.5)
+        self.assertEqual(EmailLog.objects.filter(user=self.user).count(), 1)
+
+    def test_permanent_errors_fail_fast_and_release_the_claim(self):
+        sender = RecordingSender(errors=["Email service not configured"])
+        dispatcher = EmailDispatcher(rate=0, retries=3, provider_caps={}, sender=sender)
+
+        stats = dispatcher.run([(self.user, _content())])
+
+        self.assertEqual((stats.failed, stats.retries, len(sender.calls)), (1, 0, 1))
+        self.assertFalse(EmailLog.objects.exists())
+
+
+class BulkClaimTests(TestCase):
+    def setUp(self):
+        self.users = User.objects.bulk_create([
+            User(username=f"claim{idx}", email=f"claim{idx}@example.com") for idx in range(50)
+        ])
+        self.users.append(User.objects.create(username="noemail", email=""))
+
+    def test_chunk_is_claimed_with_constant_queries(self):
+        jobs = [(user, _content()) for user in self.users]
+        # Prefetch, then one bulk INSERT inside a savepoint.
+        with self.assertNumQueries(4):
+            claimed = claim_emails(jobs)
+
+        self.assertEqual(len(claimed), 50)
+        self.assertEqual(EmailLog.objects.count(), 50)
+        with self.assertNumQueries(1):
+            self.assertEqual(claim_emails(jobs), [])
+
+    def test_emails_logged_before_this_week_do_not_block(self):
+        user = self.users[0]
+        log = EmailLog.objects.create(user=user, email_type="overspend", related_month=date(2026, 3, 1))
+        week_start = _week_start_at(_week_start())
+        EmailLog.objects.filter(pk=log.pk).update(sent_at=week_start - timedelta(seconds=1))
+        self.assertTrue(should_send_email(user, "overspend", date(2026, 3, 1)))
+
+        EmailLog.objects.filter(pk=log.pk).update(sent_at=week_start)
+        self.assertFalse(should_send_email(user, "overspend", date(2026, 3, 1)))
+        self.assertEqual(claim_emails([(user, _content())]), [])
+
+
+class ConcurrentDispatchTests(TransactionTestCase):
+    def setUp(self):
+        self.users = [
+            User.objects.create(username=f"bulk{idx}", email=f"bulk{idx}@example.com")
+            for idx in range(12)
+        ]
+
+    def test_overlapping_runs_send_each_email_once(self):
+        sender = RecordingSender(delay=0.01)
+        jobs = [(user, _content()) for user in self.users]
+        dispatchers = [
+            EmailDispatcher(workers=4, rate=0, provider_caps={"sendgrid": 2, "smtp": 2}, sender=sender)
+            for _ in range(2)
+        ]
+        runs = [threading.Thread(target=dispatcher.run, args=(jobs,)) for dispatcher in dispatchers]
+        for run in runs:
+            run.start()
+        for run in runs:
+            run.join()
+
+        self.assertEqual(sorted(sender.calls), sorted(user.email for user in self.users))
+        self.assertEqual(EmailLog.objects.count(), 12)
+        self.assertEqual(sum(dispatcher.stats.sent for dispatcher in dispatchers), 12)
+        summary = dispatchers[0].stats.summary()
+        self.assertGreaterEqual(summary["p99_ms"], summary["p50_ms"])
+
+    @override_settings(PREDICTION_FIRST_WEEK_DAYS=31)
+    def test_command_reports_throughput(self):
+        sender = RecordingSender()
+        out = StringIO()
+        with patch("tracker.services.email_dispatch.send_app_email", sender):
+            call_command("send_behavior_emails", workers=3, rate=0, stdout=out)
+
+        self.assertIn("Behavior emails sent: 12, skipped: 0, failed: 0", out.getvalue())
+        self.assertIn("latency p50/p90/p99", out.getvalue())
+        self.assertEqual(len(sender.calls), 12)
+
+    @override_settings(PREDICTION_FIRST_WEEK_DAYS=31)
+    def test_command_keeps_one_smtp_connection_per_worker(self):
+        with StubSMTPServer() as stub, override_settings(EMAIL_PORT=stub.port, **SMTP_SETTINGS):
+            call_command("send_behavior_emails", workers=3, rate=0, stdout=StringIO())
+
+        self.assertEqual(len(stub.messages), 12)
+        self.assertLessEqual(stub.connections, 3)
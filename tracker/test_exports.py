@@ -0,0 +1,32 @@
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from tracker.models import Transaction
+
+
+class TransactionExportTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="export", password="x")
+        other = User.objects.create_user(username="other-export", password="x")
+        self.client.force_login(self.user)
+        Transaction.objects.bulk_create([
+            Transaction(user=self.user, type="expense", amount=12050, category="food", payment_mode="cash", date=date(2026, 3, 2), description='Lunch, "team"'),
+            Transaction(user=self.user, type="income", amount=500000, category="salary", date=date(2026, 3, 1)),
+            Transaction(user=self.user, type="expense", amount=999, category="transport", date=date(2026, 4, 1)),
+            Transaction(user=other, type="expense", amount=100, category="food", date=date(2026, 3, 5)),
+        ])
+
+    def test_export_streams_labelled_rows_in_date_order(self):
+        with self.settings(EXPORT_CHUNK_SIZE=1):
+            response = self.client.get("/export/transactions/", {"month": "2026-03"})
+
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Disposition"], 'attachment; filename="transactions.csv"')
+        body = b"".join(response.streaming_content).decode()
+        self.assertEqual(body.splitlines(), [
+            "Date,Type,Category,Payment,Description,Amount",
+            "2026-03-01,Income,Salary,Online Money,,5000.00",
+            '2026-03-02,Expense,Food,Cash Money,"Lunch, ""team""",120.50',
+        ])
@@ -0,0 +1,119 @@
+import os
+import tempfile
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from tracker.models import Transaction, UserMonthRollup
+from tracker.services.exports import iter_transaction_csv
+from tracker.services.imports import import_transactions
+from tracker.services.rollups import verify_user_rollups
+
+CSV = (
+    "Date,Type,Category,Payment,Description,Amount\n"
+    "2026-03-01,Expense,Food,Online Money,Swiggy dinner,420.50\n"
+    "2026-03-02,expense,,cash,Uber to office,\"1,200.00\"\n"
+    "2026-03-03,Income,Salary,Online Money,March salary,50000\n"
+    "2026-03-04,Expense,auto,Online Money,Something new,99\n"
+    "not-a-date,Expense,Food,Online Money,Bad,10\n"
+    "2026-03-05,Expense,Holidays,Online Money,Bad category,10\n"
+    "2026-03-06,Expense,Food,Online Money,Zero,0\n"
+    "\n"
+)
+
+
+class TransactionImportTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(username="importer")
+
+    def test_valid_rows_are_inserted_and_bad_rows_reported(self):
+        progress = []
+        result = import_transactions(self.user, StringIO(CSV), chunk_size=3, progress=lambda r: progress.append(r.rows))
+
+        self.assertEqual((result.rows, result.created, result.skipped, result.auto_categorized), (7, 4, 3, 2))
+        self.assertEqual([line for line, _ in result.errors], [6, 7, 8])
+        self.assertEqual(progress, [3, 6, 7])
+        rows = dict(Transaction.objects.filter(user=self.user).values_list("description", "category"))
+        self.assertEqual(rows["Uber to office"], "transport")
+        self.assertEqual(rows["Something new"], "other")
+        self.assertEqual(Transaction.objects.get(description="Uber to office").amount, 120000)
+        self.assertEqual(verify_user_rollups(self.user), [])
+        self.assertTrue(UserMonthRollup.objects.filter(user=self.user).exists())
+
+    def test_huge_amounts_are_row_errors(self):
+        rows = CSV.splitlines()[0] + "\n" + "".join(
+            f"2026-03-01,Expense,Food,Online Money,Huge,{amount}\n" for amount in ("1e25", "1e400", "10000000000001", "10000000000000")
+        )
+
+        result = import_transactions(self.user, StringIO(rows))
+
+        self.assertEqual(result.errors, [
+            (2, "Amount too large: '1e25'"), (3, "Invalid amount: '1e400'"), (4, "Amount too large: '10000000000001'"),
+        ])
+        self.assertEqual(list(Transaction.objects.filter(user=self.user).values_list("amount", flat=True)), [10 ** 15])
+        self.assertEqual(verify_user_rollups(self.user), [])
+
+    def test_export_round_trips_through_import(self):
+        import_transactions(self.user, StringIO(CSV))
+        exported = "".join(iter_transaction_csv(Transaction.objects.filter(user=self.user).order_by("date", "id")))
+        other = User.objects.create(username="copy")
+
+        result = import_transactions(other, StringIO(exported))
+
+        self.assertEqual((result.created, result.skipped), (4, 0))
+        fields = ("date", "type", "category", "payment_mode", "description", "amount")
+        self.assertEqual(
+            list(Transaction.objects.filter(user=other).order_by("date").values_list(*fields)),
+            list(Transaction.objects.filter(user=self.user).order_by("date").values_list(*fields)),
+        )
+
+    def test_upload_endpoint_and_missing_header(self):
+        self.client.force_login(self.user)
+        response = self.client.post(reverse("import_transactions"), {
+            "file": SimpleUploadedFile("t.csv", ("﻿" + CSV).encode("utf-8"), content_type="text/csv"),
+        })
+        self.assertEqual(response.json()["created"], 4)
+        self.assertEqual(response.json()["errors"][0], {"line": 6, "error": "invalid date 'not-a-date'"})
+
+        response = self.client.post(reverse("import_transactions"), {
+            "file": SimpleUploadedFile("t.csv", b"Date,Amount\n2026-03-01,10\n", content_type="text/csv"),
+        })
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("Missing column(s): type", response.json()["error"])
+
+    def test_dashboard_form_reports_counts_and_row_errors(self):
+        self.client.force_login(self.user)
+        response = self.client.post(reverse("import_transactions"), {
+            "file": SimpleUploadedFile("t.csv", CSV.encode("utf-8"), content_type="text/csv"),
+            "next": "/?month=2026-03",
+        }, follow=True)
+
+        self.assertRedirects(response, "/?month=2026-03")
+        self.assertEqual([str(message) for message in response.context["messages"]], [
+            "Imported 4 transactions (2 auto-categorized).",
+            "Skipped 3 of 7 rows: line 6: invalid date 'not-a-date'; line 7: invalid category 'Holidays'; "
+            "line 8: amount must be positive",
+        ])
+        self.assertContains(response, "line 6: invalid date &#x27;not-a-date&#x27;")
+
+        response = self.client.post(reverse("import_transactions"), {
+            "file": SimpleUploadedFile("t.csv", b"Date,Amount\n2026-03-01,10\n", content_type="text/csv"),
+            "next": "/",
+        }, follow=True)
+        self.assertRedirects(response, "/")
+        self.assertContains(response, "Could not read the CSV: Missing column(s): type")
+
+    def test_command_dry_run_saves_nothing(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False) as handle:
+            handle.write(CSV)
+        self.addCleanup(os.unlink, handle.name)
+        out = StringIO()
+
+        call_command("import_transactions", handle.name, user="importer", dry_run=True, stdout=out)
+
+        self.assertIn("Would import 4 transactions (2 auto-categorized), skipped 3 of 7 rows", out.getvalue())
+        self.assertFalse(Transaction.objects.exists())
@@ -0,0 +1,67 @@
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from tracker.services.dashboard_cache import dashboard_cache
+from tracker.services.instrumentation import (
+    clear_recent,
+    recent_requests,
+    span,
+    start_collecting,
+    stop_collecting,
+    summarize,
+)
+
+
+@span("test.decorated")
+def decorated(value):
+    return value * 2
+
+
+class SpanTests(SimpleTestCase):
+    def test_spans_collect_only_while_collecting(self):
+        with span("test.ignored"):
+            pass
+
+        token = start_collecting()
+        with span("test.block"):
+            self.assertEqual(decorated(2), 4)
+            decorated(3)
+        spans = stop_collecting(token)
+
+        self.assertEqual([name for name, _ in spans], ["test.decorated", "test.decorated", "test.block"])
+        self.assertEqual(
+            [(entry["name"], entry["count"]) for entry in summarize(spans)],
+            [("test.decorated", 2), ("test.block", 1)],
+        )
+
+    def test_exceptions_still_close_the_span(self):
+        token = start_collecting()
+        with self.assertRaises(ValueError), span("test.failing"):
+            raise ValueError
+        self.assertEqual(stop_collecting(token)[0][0], "test.failing")
+
+
+@override_settings(REQUEST_SPANS=True)
+class SpanMiddlewareTests(TestCase):
+    def setUp(self):
+        clear_recent()
+        dashboard_cache.clear()
+        self.user = User.objects.create_user(username="viewer", password="x")
+
+    def test_dashboard_stages_reach_header_and_staff_view(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse("home"))
+
+        header = response["Server-Timing"]
+        for name in ("dashboard.recurring", "dashboard.analytics", "analytics.load_cube", "analytics.budget_summary"):
+            self.assertIn(f"{name};dur=", header)
+        self.assertEqual(recent_requests()[0]["path"], "/")
+        self.assertEqual(recent_requests()[0]["user_id"], self.user.id)
+
+        self.assertEqual(self.client.get(reverse("staff_spans")).status_code, 302)
+        self.user.is_staff = True
+        self.user.save()
+        data = self.client.get(reverse("staff_spans")).json()
+        self.assertTrue(data["enabled"])
+        self.assertIn("dashboard.render", [entry["name"] for entry in data["requests"][0]["spans"]])
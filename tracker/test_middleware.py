@@ -0,0 +1,41 @@
+from django.contrib.auth.models import User
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+
+from tracker.middleware import QueryInstrumentationMiddleware, sql_shape
+
+
+class QueryInstrumentationTests(TestCase):
+    def test_sql_shape_collapses_in_lists(self):
+        self.assertEqual(
+            sql_shape('SELECT 1 FROM t WHERE id IN (%s, %s, %s) AND x = %s'),
+            sql_shape('SELECT 1 FROM t WHERE id IN (%s) AND x = %s'),
+        )
+
+    @override_settings(SQL_INSTRUMENTATION=True, SQL_REPEAT_THRESHOLD=3, SQL_SLOW_REQUEST_MS=0)
+    def test_counts_queries_and_flags_repeated_shapes(self):
+        users = [User.objects.create(username=f"u{idx}") for idx in range(4)]
+
+        def view(request):
+            for user in users:
+                User.objects.filter(id=user.id).exists()
+            return HttpResponse("ok")
+
+        middleware = QueryInstrumentationMiddleware(view)
+        with self.assertLogs("tracker.middleware", "WARNING") as logs:
+            response = middleware(RequestFactory().get("/loop/"))
+
+        self.assertRegex(response["Server-Timing"], r'^db;dur=[\d.]+;desc="4 queries", total;dur=[\d.]+$')
+        self.assertIn("Repeated query on GET /loop/: 4 times", logs.output[0])
+        self.assertIn("Slow request GET /loop/: 200", logs.output[1])
+
+    def test_disabled_by_default(self):
+        user = User.objects.create_user(username="plain", password="x")
+        self.client.force_login(user)
+        self.assertNotIn("Server-Timing", self.client.get(reverse("home")))
+
+        with override_settings(SQL_INSTRUMENTATION=True):
+            self.client.handler.load_middleware()
+            response = self.client.get(reverse("home"))
+        self.assertIn("db;dur=", response["Server-Timing"])
@@ -0,0 +1,44 @@
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase
+
+from tracker.models import Transaction, UserMonthRollup
+from tracker.services.money import format_rupees, to_paise, to_rupees
+from tracker.templatetags.formatting import currency, rupees
+
+
+class MoneyConversionTests(SimpleTestCase):
+    def test_to_paise_rounds_half_up_and_rejects_garbage(self):
+        self.assertEqual(to_paise("12.345"), 1235)
+        self.assertEqual(to_paise(0.1), 10)
+        self.assertEqual(to_paise(" 1e3 "), 100000)
+        self.assertEqual(to_paise("-1e13"), -(10 ** 15))
+        for bad in ("", "abc", "nan", "inf", "1e400", "10000000000000.01", "-1e25"):
+            with self.subTest(value=bad), self.assertRaises(ValueError):
+                to_paise(bad)
+
+    def test_formatting_is_exact(self):
+        self.assertEqual(format_rupees(123456789), "1234567.89")
+        self.assertEqual(str(to_rupees(5)), "0.05")
+        self.assertEqual(currency(-123456), "-₹1,234.56")
+        self.assertEqual(currency(None), "₹0.00")
+        self.assertEqual(rupees(1050), "10.50")
+
+
+class PaiseAggregationTests(TestCase):
+    def test_sums_of_fractional_amounts_do_not_drift(self):
+        user = User.objects.create_user(username="paise", password="x")
+        self.client.force_login(user)
+        for _ in range(30):
+            self.client.post("/transactions/create/", {
+                "type": "expense",
+                "amount": "0.10",
+                "category": "food",
+                "date": "2026-03-10",
+            })
+
+        self.assertEqual(set(Transaction.objects.filter(user=user).values_list("amount", flat=True)), {10})
+        row = UserMonthRollup.objects.get(user=user, month=date(2026, 3, 1))
+        self.assertEqual((row.total, row.count), (300, 30))
+        self.assertContains(self.client.get("/", {"month": "2026-03"}), "₹3.00")
@@ -0,0 +1,125 @@
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from tracker.models import EmailLog, EmailOutbox
+from tracker.services.outbox import claim_batch, drain_outbox, enqueue_email, outbox_metrics, queue_app_email
+from tracker.test_email_dispatch import RecordingSender
+
+
+@override_settings(EMAIL_USE_OUTBOX=True, SENDGRID_API_KEY="test-key", USE_GMAIL_SMTP=False, EMAIL_RETRY_BACKOFF=30)
+class EmailOutboxTests(TestCase):
+    def test_forgot_password_enqueues_otp_without_sending(self):
+        User.objects.create(username="asha", email="asha@example.com")
+        with patch("tracker.services.outbox.send_app_email") as send:
+            response = self.client.post(reverse("forgot_password"), {"email": "asha@example.com"})
+
+        self.assertRedirects(response, reverse("forgot_password_verify"), fetch_redirect_response=False)
+        send.assert_not_called()
+        row = EmailOutbox.objects.get()
+        self.assertEqual((row.to_email, row.priority, row.status), ("asha@example.com", EmailOutbox.PRIORITY_OTP, "pending"))
+
+    @override_settings(EMAIL_USE_OUTBOX=False)
+    def test_disabled_outbox_sends_inline(self):
+        with patch("tracker.services.outbox.send_app_email", return_value=None) as send:
+            self.assertIsNone(queue_app_email("a@example.com", "OTP", "1"))
+        send.assert_called_once_with("a@example.com", "OTP", "1")
+        self.assertFalse(EmailOutbox.objects.exists())
+
+    @override_settings(SENDGRID_API_KEY="", DEBUG=False)
+    def test_missing_provider_is_reported_at_enqueue_time(self):
+        with self.assertLogs("tracker.services.outbox", "ERROR"):
+            self.assertEqual(queue_app_email("a@example.com", "OTP", "1"), "Email service not configured")
+        self.assertFalse(EmailOutbox.objects.exists())
+
+    def test_otp_mail_is_sent_ahead_of_bulk_backlog(self):
+        for idx in range(5):
+            enqueue_email(f"bulk{idx}@example.com", "Your month", "Body")
+        enqueue_email("otp@example.com", "OTP", "1", priority=EmailOutbox.PRIORITY_OTP)
+        sender = RecordingSender()
+
+        stats = drain_outbox(batch_size=2, rate=0, sender=sender)
+
+        self.assertEqual(sender.calls[0], "otp@example.com")
+        self.assertEqual(stats.sent, 6)
+        self.assertEqual(EmailOutbox.objects.filter(status="sent").count(), 6)
+
+    def test_otp_only_mode_leaves_bulk_mail_queued(self):
+        enqueue_email("bulk@example.com", "Your month", "Body")
+        enqueue_email("otp@example.com", "OTP", "1", priority=EmailOutbox.PRIORITY_OTP)
+        sender = RecordingSender()
+
+        drain_outbox(max_priority=EmailOutbox.PRIORITY_OTP, rate=0, sender=sender)
+
+        self.assertEqual(sender.calls, ["otp@example.com"])
+        self.assertEqual(outbox_metrics()["depth"], {"otp": 0, "bulk": 1})
+
+    def test_transient_failures_are_rescheduled_and_permanent_ones_fail(self):
+        flaky = enqueue_email("flaky@example.com", "S", "B")
+        broken = enqueue_email("broken@example.com", "S", "B")
+        sender = RecordingSender(errors=["Failed to send email. Try again.", "Email service not configured"])
+
+        stats = drain_outbox(rate=0, sender=sender)
+
+        flaky.refresh_from_db()
+        broken.refresh_from_db()
+        self.assertEqual((flaky.status, flaky.attempts), ("pending", 1))
+        self.assertGreater(flaky.available_at, timezone.now() + timedelta(seconds=20))
+        self.assertEqual((broken.status, broken.last_error), ("failed", "Email service not configured"))
+        self.assertEqual((stats.sent, stats.failed, stats.retries), (0, 1, 1))
+        # Not due yet, so a second drain leaves it alone.
+        self.assertEqual(drain_outbox(rate=0, sender=sender).retries, 0)
+
+    def test_bodies_are_cleared_once_delivery_is_settled(self):
+        enqueue_email("otp@example.com", "OTP", "Your code is 123456", priority=EmailOutbox.PRIORITY_OTP)
+        enqueue_email("lost@example.com", "OTP", "Your code is 654321", priority=EmailOutbox.PRIORITY_OTP)
+        enqueue_email("bulk@example.com", "Your month", "Body")
+        enqueue_email("retry@example.com", "Your month", "Body")
+        sender = RecordingSender(errors=[None, "Email service not configured", None, "Failed to send email. Try again."])
+
+        drain_outbox(rate=0, sender=sender)
+
+        bodies = dict(EmailOutbox.objects.values_list("to_email", "body"))
+        self.assertEqual(bodies, {
+            "otp@example.com": "", "lost@example.com": "", "bulk@example.com": "", "retry@example.com": "Body",
+        })
+
+    @override_settings(PREDICTION_FIRST_WEEK_DAYS=31)
+    def test_permanently_failed_behavior_email_is_queued_again_next_run(self):
+        for name in ("ok", "bounce"):
+            User.objects.create(username=name, email=f"{name}@example.com")
+        call_command("send_behavior_emails", outbox=True, stdout=StringIO())
+        self.assertEqual(EmailOutbox.objects.exclude(dedup_key="").count(), 2)
+
+        drain_outbox(rate=0, sender=RecordingSender(errors=[None, "Email service not configured"]))
+        failed = EmailOutbox.objects.get(status="failed")
+        self.assertFalse(EmailLog.objects.filter(dedup_key=failed.dedup_key).exists())
+
+        out = StringIO()
+        call_command("send_behavior_emails", outbox=True, stdout=out)
+        self.assertIn("Behavior emails sent: 1, skipped: 1", out.getvalue())
+        self.assertEqual(EmailOutbox.objects.filter(status="pending").get().to_email, failed.to_email)
+
+    def test_claimed_rows_are_not_claimed_again_until_lease_expires(self):
+        row = enqueue_email("a@example.com", "S", "B")
+
+        self.assertEqual([item.pk for item in claim_batch(10)], [row.pk])
+        self.assertEqual(claim_batch(10), [])
+        EmailOutbox.objects.filter(pk=row.pk).update(available_at=timezone.now() - timedelta(seconds=1))
+        self.assertEqual([item.pk for item in claim_batch(10)], [row.pk])
+
+    def test_command_reports_depth_and_latency(self):
+        enqueue_email("otp@example.com", "OTP", "1", priority=EmailOutbox.PRIORITY_OTP)
+        out = StringIO()
+        with patch("tracker.services.outbox.send_app_email", return_value=None):
+            call_command("drain_email_outbox", once=True, rate=0, stdout=out)
+
+        self.assertIn("Outbox emails sent: 1, failed: 0", out.getvalue())
+        self.assertIn("queue depth otp=0, bulk=0", out.getvalue())
+        self.assertIn("delivery latency p50/p90/p99", out.getvalue())
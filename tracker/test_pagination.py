@@ -0,0 +1,69 @@
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.test import RequestFactory, TestCase
+
+from tracker.models import Transaction
+from tracker.services.filters import SORT_MAP, apply_filters, apply_sort, parse_filters
+from tracker.services.pagination import decode_cursor, encode_cursor, paginate_transactions
+
+
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="pager", email="pager@example.com", password="x")
+        self.factory = RequestFactory()
+        rows = [
+            (100, date(2026, 1, 5)),
+            (100, date(2026, 1, 5)),
+            (25050, date(2026, 1, 7)),
+            (40, date(2026, 1, 7)),
+            (100, date(2026, 2, 1)),
+            (999, date(2026, 2, 3)),
+            (40, date(2026, 2, 3)),
+        ]
+        for amount, day in rows:
+            Transaction.objects.create(
+                user=self.user,
+                type="expense",
+                amount=amount,
+                category="food",
+                date=day,
+            )
+
+    def test_pages_cover_every_sort_order_without_gaps_or_duplicates(self):
+        for sort in SORT_MAP:
+            with self.subTest(sort=sort):
+                filters = parse_filters(self.factory.get("/", {"sort": sort}))
+                base = apply_filters(Transaction.objects.filter(user=self.user), filters)
+                expected = list(apply_sort(base, filters).values_list("id", flat=True))
+
+                seen = []
+                cursor = None
+                while True:
+                    page = paginate_transactions(base, filters, cursor=cursor, size=2)
+                    seen.extend(item.id for item in page.rows)
+                    if not page.next_cursor:
+                        break
+                    cursor = page.next_cursor
+                self.assertEqual(seen, expected)
+
+    def test_amount_cursor_keeps_exact_paise(self):
+        item = Transaction(id=7, amount=2 ** 53 + 1)
+        self.assertEqual(decode_cursor("amount_desc", encode_cursor("amount_desc", item)), (2 ** 53 + 1, 7))
+
+    def test_invalid_cursor_falls_back_to_first_page(self):
+        filters = parse_filters(self.factory.get("/"))
+        page = paginate_transactions(Transaction.objects.filter(user=self.user), filters, cursor="not-a-cursor", size=3)
+        self.assertEqual(len(page.rows), 3)
+
+    def test_page_endpoint_returns_fragment_and_next_url(self):
+        self.client.force_login(self.user)
+        with self.settings(TRANSACTION_PAGE_SIZE=4):
+            first = self.client.get("/")
+            self.assertEqual(len(first.context["transactions"]), 4)
+            next_url = first.context["transactions_next_url"]
+
+            response = self.client.get(next_url)
+        data = response.json()
+        self.assertEqual(data["html"].count("data-edit-transaction"), 3)
+        self.assertEqual(data["next_url"], "")
@@ -0,0 +1,114 @@
+import random
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from tracker.models import SpendingPrediction, UserMonthRollup
+from tracker.services.analytics import month_delta
+from tracker.services.dashboard_cache import bump_data_version, dashboard_cache
+from tracker.services.prediction_service import (
+    build_prediction_summary,
+    iter_prediction_summaries,
+    predict_batch,
+    prediction_stats,
+)
+
+
+class BatchPredictionTests(TestCase):
+    today = date(2026, 3, 30)
+
+    def setUp(self):
+        rng = random.Random(11)
+        self.users = User.objects.bulk_create([User(username=f"pred{idx}") for idx in range(40)])
+        rows = []
+        # The first user has no history at all.
+        for user in self.users[1:]:
+            base = rng.randrange(1, 50_000_00)
+            gaps = rng.random() * 0.6
+            for back in range(8):
+                if rng.random() < gaps:
+                    continue
+                month = month_delta(date(2026, 3, 1), -back)
+                for kind in ("expense", "income"):
+                    total = round(base * rng.uniform(0.5, 1.4)) if rng.random() > 0.1 else 0
+                    rows.append(UserMonthRollup(
+                        user=user, month=month, category="food", type=kind,
+                        payment_mode="online", total=total, count=1,
+                    ))
+        UserMonthRollup.objects.bulk_create(rows)
+
+    def test_batch_matches_per_user_summary(self):
+        batch = predict_batch([user.id for user in self.users], self.today)
+        for user in self.users:
+            with self.subTest(user=user.username):
+                self.assertEqual(batch[user.id], build_prediction_summary(user, self.today))
+
+    def test_chunks_cost_constant_queries_and_upsert(self):
+        SpendingPrediction.objects.create(
+            user=self.users[0], month=date(2026, 4, 1), predicted_expense=1, risk_level="insufficient",
+        )
+        users = User.objects.filter(username__startswith="pred")
+        # Per chunk: users, grouped rollups, upsert; plus the final empty page.
+        with self.assertNumQueries(4 * 3 + 1):
+            results = dict(iter_prediction_summaries(users, self.today, chunk_size=10))
+
+        self.assertEqual(len(results), 40)
+        stored = {
+            row.user_id: (row.predicted_expense, row.risk_level)
+            for row in SpendingPrediction.objects.filter(month=date(2026, 4, 1))
+        }
+        self.assertEqual(stored, {
+            user.id: (result.predicted_expense, result.risk_level) for user, result in results.items()
+        })
+
+
+class PredictionMemoTests(TestCase):
+    today = date(2026, 3, 30)
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="memo", password="x")
+        for back, total in enumerate([40000, 50000, 45000]):
+            UserMonthRollup.objects.create(
+                user=self.user, month=month_delta(date(2026, 3, 1), -back), category="food",
+                type="expense", payment_mode="online", total=total, count=1,
+            )
+        prediction_stats.reset()
+        dashboard_cache.clear()
+
+    def _stats(self):
+        return prediction_stats.stats()
+
+    def test_reads_are_served_from_the_stored_row_until_inputs_change(self):
+        first = build_prediction_summary(self.user, self.today)
+        self.assertEqual(self._stats()["written"], 1)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(build_prediction_summary(self.user, self.today), first)
+        self.assertEqual(self._stats()["served_stored"], 1)
+
+        # New version, same inputs: recomputed, but the result row is not touched.
+        bump_data_version(self.user)
+        before = SpendingPrediction.objects.get(user=self.user)
+        build_prediction_summary(self.user, self.today)
+        self.assertEqual(self._stats()["recomputed_unchanged"], 1)
+        after = SpendingPrediction.objects.get(user=self.user)
+        self.assertEqual((after.computed_on, after.data_version), (before.computed_on, before.data_version))
+        with self.assertNumQueries(0):
+            self.assertEqual(build_prediction_summary(self.user, self.today), first)
+        self.assertEqual(self._stats()["served_memo"], 1)
+
+        UserMonthRollup.objects.filter(user=self.user, month=date(2026, 3, 1)).update(total=90000)
+        bump_data_version(self.user)
+        changed = build_prediction_summary(self.user, self.today)
+        self.assertNotEqual(changed, first)
+        self.assertEqual(self._stats(), {"served_stored": 1, "served_memo": 1, "recomputed_unchanged": 1, "written": 2})
+
+        stored = SpendingPrediction.objects.get(user=self.user, month=date(2026, 4, 1))
+        self.assertEqual((stored.predicted_expense, stored.risk_level, stored.explanation),
+                         (changed.predicted_expense, changed.risk_level, changed.explanation))
+
+    def test_a_new_day_recomputes(self):
+        build_prediction_summary(self.user, self.today)
+        build_prediction_summary(self.user, date(2026, 3, 31))
+        self.assertEqual(self._stats()["served_stored"], 0)
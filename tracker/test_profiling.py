@@ -0,0 +1,72 @@
+import pstats
+import shutil
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from tracker.models import Transaction
+from tracker.services.profiling import StackSampler, prune_profiles
+
+
+class RequestProfilerTests(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        settings_override = override_settings(PROFILE_DIR=self.directory)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.user = User.objects.create_user(username="ops", password="x")
+        Transaction.objects.create(
+            user=self.user, type="expense", amount=1000, category="food", date="2026-03-01", description="Tea",
+        )
+
+    def test_only_staff_can_profile(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse("export_transactions"), {"_profile": "1"})
+        self.assertNotIn("X-Profile-Id", response)
+        self.assertEqual(list(Path(self.directory).iterdir()), [])
+        self.assertEqual(self.client.get(reverse("staff_profiles")).status_code, 302)
+
+    def test_streamed_export_is_profiled_and_downloadable(self):
+        self.user.is_staff = True
+        self.user.save()
+        self.client.force_login(self.user)
+
+        response = self.client.get(reverse("export_transactions"), HTTP_X_PROFILE="mem")
+        self.assertIn(b"Tea", b"".join(response.streaming_content))
+        profile_id = response["X-Profile-Id"]
+        self.assertIn("get-export-transactions", profile_id)
+
+        stats = pstats.Stats(str(Path(self.directory) / f"{profile_id}.pstats"))
+        self.assertTrue(any(func[2] == "iter_transaction_csv" for func in stats.stats))
+        listing = self.client.get(reverse("staff_profiles")).json()["profiles"][0]
+        self.assertEqual(listing["id"], profile_id)
+        self.assertEqual(
+            listing["files"], [f"{profile_id}.alloc.txt", f"{profile_id}.collapsed", f"{profile_id}.pstats"],
+        )
+        download = self.client.get(listing["urls"][0])
+        self.assertIn(b"peak", b"".join(download.streaming_content))
+        self.assertEqual(self.client.get(reverse("staff_profile_download", args=["..%2Fsecrets.pstats"])).status_code, 404)
+
+    def test_failed_start_frees_the_profiler_for_the_next_request(self):
+        self.user.is_staff = True
+        self.user.save()
+        self.client.force_login(self.user)
+
+        with mock.patch.object(StackSampler, "start", side_effect=RuntimeError("can't start new thread")), \
+                self.assertRaises(RuntimeError):
+            self.client.get(reverse("export_transactions"), HTTP_X_PROFILE="mem")
+
+        response = self.client.get(reverse("export_transactions"), HTTP_X_PROFILE="1")
+        self.assertNotEqual(response["X-Profile-Id"], "busy")
+
+    def test_prune_keeps_directory_under_limit(self):
+        for idx in range(3):
+            (Path(self.directory) / f"20260301T00000{idx}-000000-x.pstats").write_bytes(b"0" * 600_000)
+        with override_settings(PROFILE_DIR_MAX_MB=1):
+            self.assertEqual(prune_profiles(Path(self.directory)), 2)
+        self.assertEqual([path.name for path in Path(self.directory).iterdir()], ["20260301T000002-000000-x.pstats"])
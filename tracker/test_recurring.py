@@ -0,0 +1,169 @@
+import random
+from datetime import date, timedelta
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from tracker.models import RecurringTransaction, Transaction
+from tracker.services.recurring import (
+    _generate_for_series,
+    _stepwise_occurrence_dates,
+    due_series,
+    generate_recurring_transactions,
+    iter_occurrence_dates,
+    materialize_recurring,
+    occurrence_filter,
+)
+from tracker.services.rollups import verify_user_rollups
+
+
+class RecurringMaterializationTests(TestCase):
+    def setUp(self):
+        self.users = [
+            User.objects.create_user(username=f"rec{idx}", email=f"rec{idx}@example.com", password="x")
+            for idx in range(3)
+        ]
+        for user in self.users:
+            RecurringTransaction.objects.create(
+                user=user,
+                type="expense",
+                amount=20,
+                category="transport",
+                start_date=date(2026, 1, 1),
+                repeat="daily",
+            )
+            RecurringTransaction.objects.create(
+                user=user,
+                type="income",
+                amount=5000,
+                category="salary",
+                start_date=date(2026, 1, 31),
+                repeat="monthly",
+            )
+
+    def test_materialize_processes_all_users_in_chunks_and_advances_watermarks(self):
+        stats = materialize_recurring(date(2026, 3, 31), chunk_size=2)
+
+        self.assertEqual(stats, {"series": 6, "users": 3, "created": 3 * (90 + 3)})
+        self.assertFalse(due_series(date(2026, 3, 31)).exists())
+        self.assertEqual(
+            set(RecurringTransaction.objects.values_list("last_generated_on", flat=True)),
+            {date(2026, 3, 31)},
+        )
+        self.assertEqual(
+            list(Transaction.objects.filter(user=self.users[0], type="income").values_list("date", flat=True).order_by("date")),
+            [date(2026, 1, 31), date(2026, 2, 28), date(2026, 3, 28)],
+        )
+        for user in self.users:
+            self.assertEqual(verify_user_rollups(user), [])
+
+        self.assertEqual(materialize_recurring(date(2026, 3, 31))["created"], 0)
+
+    def test_dashboard_catch_up_only_queries_when_nothing_is_due(self):
+        materialize_recurring(date(2026, 3, 31))
+        with self.assertNumQueries(1):
+            self.assertEqual(generate_recurring_transactions(self.users[0], date(2026, 3, 31)), 0)
+
+        self.assertEqual(generate_recurring_transactions(self.users[0], date(2026, 4, 2)), 2)
+
+
+    def test_stale_watermark_does_not_duplicate_occurrences(self):
+        # A dashboard view read the series just before materialize_recurring ran.
+        stale = list(due_series(date(2026, 3, 31)).filter(user=self.users[0]))
+        materialize_recurring(date(2026, 3, 31))
+
+        self.assertEqual(_generate_for_series(self.users[0].id, stale, date(2026, 3, 31)), 0)
+        self.assertEqual(Transaction.objects.filter(user=self.users[0]).count(), 90 + 3)
+        self.assertEqual(stale[0].last_generated_on, date(2026, 3, 31))
+        self.assertEqual(verify_user_rollups(self.users[0]), [])
+
+    def test_editing_start_earlier_backfills_behind_the_watermark(self):
+        user = self.users[0]
+        today = timezone.localdate()
+        series = RecurringTransaction.objects.create(
+            user=user, type="expense", amount=9900, category="food", start_date=today - timedelta(days=6), repeat="daily",
+        )
+        generate_recurring_transactions(user, today)
+        self.client.force_login(user)
+
+        self.client.post(f"/recurring/{series.id}/edit/", {
+            "amount": "99",
+            "repeat": "daily",
+            "start_date": (today - timedelta(days=20)).isoformat(),
+        })
+
+        dates = list(Transaction.objects.filter(recurring_source=series).values_list("date", flat=True))
+        self.assertEqual(sorted(dates), [today - timedelta(days=offset) for offset in range(20, -1, -1)])
+        self.assertEqual(verify_user_rollups(user), [])
+
+
+    def test_failed_edit_rolls_back_relinked_and_rewritten_occurrences(self):
+        user = self.users[0]
+        series = RecurringTransaction.objects.filter(user=user, category="transport").get()
+        generate_recurring_transactions(user, timezone.localdate())
+        self.client.force_login(user)
+
+        with mock.patch("tracker.views.rebuild_months", side_effect=RuntimeError), self.assertRaises(RuntimeError):
+            self.client.post(f"/recurring/{series.id}/edit/", {"amount": "35", "repeat": "daily"})
+
+        series.refresh_from_db()
+        self.assertEqual(series.amount, 20)
+        self.assertEqual(set(Transaction.objects.filter(recurring_source=series).values_list("amount", flat=True)), {20})
+        self.assertEqual(verify_user_rollups(user), [])
+
+
+class OccurrenceDateTests(SimpleTestCase):
+    def _random_series(self, rng):
+        start_date = date(2016, 1, 1) + timedelta(days=rng.randrange(3650))
+        if rng.random() < 0.3:
+            # Bias towards month ends, where clamping happens.
+            start_date = date(start_date.year, start_date.month, 28) + timedelta(days=rng.randrange(4))
+        weekdays = ",".join(str(day) for day in rng.sample(range(7), rng.randrange(8)))
+        return RecurringTransaction(
+            start_date=start_date,
+            repeat=rng.choice(["daily", "weekly", "monthly"]),
+            weekdays=weekdays if rng.random() < 0.7 else "",
+        )
+
+    def test_matches_stepwise_iterator(self):
+        rng = random.Random(20260101)
+        for _ in range(500):
+            series = self._random_series(rng)
+            start = series.start_date + timedelta(days=rng.randrange(-400, 3000))
+            end = start + timedelta(days=rng.randrange(-5, 800))
+            with self.subTest(series=(series.repeat, series.start_date, series.weekdays), start=start, end=end):
+                self.assertEqual(
+                    iter_occurrence_dates(series, start, end),
+                    list(_stepwise_occurrence_dates(series, start, end)),
+                )
+
+    def test_monthly_clamping_carries_forward(self):
+        series = RecurringTransaction(start_date=date(2024, 1, 31), repeat="monthly")
+        self.assertEqual(
+            iter_occurrence_dates(series, date(2024, 1, 1), date(2024, 5, 31)),
+            [date(2024, 1, 31), date(2024, 2, 29), date(2024, 3, 29), date(2024, 4, 29), date(2024, 5, 29)],
+        )
+        self.assertEqual(
+            iter_occurrence_dates(series, date(2030, 1, 1), date(2030, 1, 31)),
+            [date(2030, 1, 28)],
+        )
+
+
+class OccurrenceFilterTests(TestCase):
+    def test_filter_selects_exactly_the_occurrences(self):
+        user = User.objects.create_user(username="occ", password="x")
+        Transaction.objects.bulk_create([
+            Transaction(user=user, type="expense", amount=1, category="food", date=date(2026, 1, 1) + timedelta(days=offset))
+            for offset in range(60)
+        ])
+        series = RecurringTransaction(start_date=date(2026, 1, 5), repeat="weekly", weekdays="0,2,6")
+        start, end = date(2026, 1, 1), date(2026, 2, 20)
+
+        matched = Transaction.objects.filter(occurrence_filter(series, start, end), user=user)
+
+        self.assertEqual(
+            list(matched.order_by("date").values_list("date", flat=True)),
+            iter_occurrence_dates(series, start, end),
+        )
@@ -0,0 +1,46 @@
+from datetime import date
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from tracker.models import CategoryBudget, RecurringTransaction, SavingsGoal, Transaction
+from tracker.services.rollups import verify_user_rollups
+from tracker.services.synthetic import seed_synthetic_data
+
+TODAY = date(2026, 6, 15)
+
+
+class SyntheticDataTests(TestCase):
+    def test_seed_is_deterministic_and_rollups_match(self):
+        summary = seed_synthetic_data(users=2, years=1, seed=7, prefix="a", today=TODAY)
+        again = seed_synthetic_data(users=2, years=1, seed=7, prefix="b", today=TODAY)
+
+        self.assertEqual(summary, again)
+        self.assertEqual(summary.users, 2)
+        self.assertEqual(summary.recurring_series, 6)
+        self.assertEqual(SavingsGoal.objects.filter(user__username__startswith="a-").count(), 4)
+        fields = ("date", "type", "category", "amount", "description")
+        first, second = User.objects.get(username="a-1"), User.objects.get(username="b-1")
+        self.assertEqual(
+            list(Transaction.objects.filter(user=first).order_by("date", "id").values_list(*fields)),
+            list(Transaction.objects.filter(user=second).order_by("date", "id").values_list(*fields)),
+        )
+        self.assertEqual(Transaction.objects.filter(date__gt=TODAY).count(), 0)
+        self.assertTrue(Transaction.objects.filter(user=first, recurring_source__isnull=False).exists())
+        self.assertFalse(RecurringTransaction.objects.filter(last_generated_on__isnull=True).exists())
+        self.assertEqual(verify_user_rollups(first), [])
+
+    def test_command_refuses_existing_prefix_unless_cleared(self):
+        out = StringIO()
+        call_command("seed_synthetic_data", users=1, years=0.2, today="2026-06-15", stdout=out)
+        self.assertIn("Seeded 1 users", out.getvalue())
+
+        with self.assertRaises(CommandError):
+            call_command("seed_synthetic_data", users=1, years=0.2, stdout=StringIO())
+
+        call_command("seed_synthetic_data", users=1, years=0.2, clear=True, stdout=StringIO())
+        self.assertEqual(User.objects.filter(username__startswith="synthetic-").count(), 1)
+        self.assertEqual(CategoryBudget.objects.values("user").distinct().count(), 1)
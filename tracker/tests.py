@@ -4,10 +4,15 @@ from django.test import SimpleTestCase, override_settings
 
 from expense_tracker.settings import _email_domain, _env_bool
 from tracker.services.email_sender import (
+    SENDGRID_MAX_PERSONALIZATIONS,
+    BulkEmail,
+    SMTPSession,
     _build_sendgrid_payload,
     _send_via_sendgrid_api,
     send_app_email,
+    send_bulk_email,
 )
+from tracker.stub_servers import StubSendGridServer, StubSMTPServer
 
 
 class SendGridEmailSenderTests(SimpleTestCase):
@@ -64,12 +69,11 @@ class SendGridEmailSenderTests(SimpleTestCase):
         )
 
     @override_settings(DEFAULT_FROM_EMAIL="sender@example.com", SENDGRID_API_KEY="test-key", DEBUG=True)
-    @patch("sendgrid.SendGridAPIClient")
-    def test_sendgrid_api_uses_explicit_payload(self, mock_client_cls):
-        mock_response = Mock(status_code=202, body=b"")
+    @patch("tracker.services.email_sender.get_sendgrid_client")
+    def test_sendgrid_api_uses_explicit_payload(self, mock_get_client):
         mock_client = Mock()
-        mock_client.client.mail.send.post.return_value = mock_response
-        mock_client_cls.return_value = mock_client
+        mock_client.send.return_value = (202, "")
+        mock_get_client.return_value = mock_client
 
         error = _send_via_sendgrid_api(
             "recipient@example.com",
@@ -78,8 +82,8 @@ class SendGridEmailSenderTests(SimpleTestCase):
         )
 
         self.assertIsNone(error)
-        mock_client.client.mail.send.post.assert_called_once()
-        payload = mock_client.client.mail.send.post.call_args.kwargs["request_body"]
+        mock_client.send.assert_called_once()
+        payload = mock_client.send.call_args.args[0]
         self.assertEqual(
             payload["personalizations"][0]["to"][0]["email"],
             "recipient@example.com",
@@ -87,7 +91,7 @@ class SendGridEmailSenderTests(SimpleTestCase):
         self.assertEqual(payload["subject"], "Verify Your Account")
 
     @override_settings(DEFAULT_FROM_EMAIL="sender@example.com", SENDGRID_API_KEY="test-key", DEBUG=True)
-    @patch("sendgrid.SendGridAPIClient")
+    @patch("tracker.services.email_sender.get_sendgrid_client")
     def test_missing_recipient_returns_debug_error_without_calling_sendgrid(self, mock_client_cls):
         error = _send_via_sendgrid_api("", "Verify Your Account", "Your OTP is 123456")
 
@@ -95,7 +99,7 @@ class SendGridEmailSenderTests(SimpleTestCase):
         mock_client_cls.assert_not_called()
 
     @override_settings(DEFAULT_FROM_EMAIL="trackexpenseteam@gmail.com", SENDGRID_API_KEY="test-key", DEBUG=True)
-    @patch("sendgrid.SendGridAPIClient")
+    @patch("tracker.services.email_sender.get_sendgrid_client")
     def test_sendgrid_api_rejects_public_webmail_sender_without_calling_sendgrid(self, mock_client_cls):
         error = _send_via_sendgrid_api(
             "recipient@example.com",
@@ -154,3 +158,103 @@ class SendGridEmailSenderTests(SimpleTestCase):
             "Your OTP is 123456",
         )
         mock_sendgrid.assert_not_called()
+
+
+@override_settings(DEFAULT_FROM_EMAIL="sender@example.com", SENDGRID_API_KEY="test-key", USE_GMAIL_SMTP=False)
+class SendGridStubServerTests(SimpleTestCase):
+    def test_single_sends_reuse_one_keep_alive_connection(self):
+        with StubSendGridServer() as stub, override_settings(SENDGRID_API_URL=stub.url):
+            errors = [send_app_email(f"user{idx}@example.com", "OTP", "123456") for idx in range(5)]
+
+        self.assertEqual(errors, [None] * 5)
+        self.assertEqual((stub.requests, stub.connections), (5, 1))
+
+    def test_bulk_send_groups_recipients_into_personalizations(self):
+        messages = [
+            BulkEmail(f"user{idx}@example.com", "Your month", "Spent -amount-", {"-amount-": f"₹{idx}.00"})
+            for idx in range(2500)
+        ]
+        messages.append(BulkEmail("other@example.com", "Different", "Body"))
+        messages.append(BulkEmail("", "Your month", "Spent -amount-"))
+
+        with StubSendGridServer() as stub, override_settings(SENDGRID_API_URL=stub.url):
+            errors = send_bulk_email(messages)
+
+        self.assertEqual(errors[:-1], [None] * 2501)
+        self.assertEqual(errors[-1], "Email service not configured")
+        self.assertEqual(
+            [len(payload["personalizations"]) for payload in stub.payloads],
+            [SENDGRID_MAX_PERSONALIZATIONS, SENDGRID_MAX_PERSONALIZATIONS, 500, 1],
+        )
+        first = stub.payloads[0]["personalizations"][1]
+        self.assertEqual(first, {"to": [{"email": "user1@example.com"}], "substitutions": {"-amount-": "₹1.00"}})
+        self.assertEqual(stub.connections, 1)
+
+    def test_provider_errors_are_reported_per_message(self):
+        with StubSendGridServer(status=503) as stub, override_settings(SENDGRID_API_URL=stub.url):
+            errors = send_bulk_email([BulkEmail("a@example.com", "S", "B"), BulkEmail("b@example.com", "S", "B")])
+
+        self.assertEqual(errors, ["Failed to send email. Try again."] * 2)
+        self.assertEqual(stub.requests, 1)
+
+
+SMTP_SETTINGS = dict(
+    EMAIL_BACKEND="django.core.mail.backends.smtp.EmailBackend",
+    EMAIL_HOST="127.0.0.1",
+    EMAIL_USE_TLS=False,
+    EMAIL_USE_SSL=False,
+    EMAIL_HOST_USER="",
+    EMAIL_HOST_PASSWORD="",
+    DEFAULT_FROM_EMAIL="sender@example.com",
+    USE_GMAIL_SMTP=True,
+    SENDGRID_API_KEY="",
+    DEBUG=False,
+)
+
+
+class SMTPSessionTests(SimpleTestCase):
+    def test_session_sends_many_messages_over_one_connection(self):
+        with StubSMTPServer() as stub, override_settings(EMAIL_PORT=stub.port, **SMTP_SETTINGS):
+            with SMTPSession() as session:
+                errors = [session.send(f"user{idx}@example.com", "Hi", "Body") for idx in range(20)]
+
+        self.assertEqual(errors, [None] * 20)
+        self.assertEqual((len(stub.messages), stub.connections), (20, 1))
+        self.assertEqual(stub.messages[3], ["user3@example.com"])
+
+    def test_session_reconnects_after_dropped_connection(self):
+        with StubSMTPServer(drop_after=3) as stub, override_settings(EMAIL_PORT=stub.port, **SMTP_SETTINGS):
+            with SMTPSession() as session:
+                errors = [session.send(f"user{idx}@example.com", "Hi", "Body") for idx in range(7)]
+
+        self.assertEqual(errors, [None] * 7)
+        self.assertEqual(len(stub.messages), 7)
+        self.assertEqual(session.connects, 3)
+
+    def test_refused_recipient_fails_without_reconnecting(self):
+        with StubSMTPServer(refuse={"gone@example.com"}) as stub, \
+                override_settings(EMAIL_PORT=stub.port, **SMTP_SETTINGS):
+            with SMTPSession() as session:
+                with self.assertLogs("tracker.services.email_sender", "ERROR"):
+                    refused = session.send("gone@example.com", "Hi", "Body")
+                delivered = session.send("here@example.com", "Hi", "Body")
+
+        self.assertEqual(refused, "Failed to send email. Try again.")
+        self.assertIsNone(delivered)
+        self.assertEqual(stub.messages, [["here@example.com"]])
+        self.assertEqual((session.connects, stub.connections), (1, 1))
+
+    def test_unreachable_server_reports_error(self):
+        with StubSMTPServer() as stub:
+            port = stub.port
+        with override_settings(EMAIL_PORT=port, EMAIL_TIMEOUT=1, **SMTP_SETTINGS):
+            with SMTPSession() as session, self.assertLogs("tracker.services.email_sender", "ERROR"):
+                self.assertEqual(session.send("a@example.com", "Hi", "Body"), "Failed to send email. Try again.")
+
+    def test_bulk_send_over_smtp_uses_one_connection(self):
+        messages = [BulkEmail(f"user{idx}@example.com", "Hi -name-", "Body", {"-name-": str(idx)}) for idx in range(10)]
+        with StubSMTPServer() as stub, override_settings(EMAIL_PORT=stub.port, **SMTP_SETTINGS):
+            errors = send_bulk_email(messages)
+
+        self.assertEqual(errors, [None] * 10)
+        self.assertEqual((len(stub.messages), stub.connections), (10, 1))
@@ -5,7 +5,9 @@ from django.contrib.auth import views as auth_views
 urlpatterns = [
     path('', views.index, name='home'),
     path('get-started/', views.get_started, name='get_started'),
+    path("api/dashboard/<slug:section>/", views.dashboard_section, name="dashboard_section"),
     path("transactions/create/", views.create_transaction, name="create_transaction"),
+    path("transactions/page/", views.transactions_page, name="transactions_page"),
     path("transactions/<int:id>/edit/", views.edit_transaction, name="edit_transaction"),
     path("transactions/<int:id>/delete/", views.delete_transaction, name="delete_transaction"),
     path("budgets/monthly/", views.set_monthly_budget, name="set_monthly_budget"),
@@ -17,7 +19,11 @@ urlpatterns = [
     path("goals/<int:id>/delete/", views.delete_goal, name="delete_goal"),
     path("export/transactions/", views.export_transactions, name="export_transactions"),
     path("export/summary/", views.export_summary, name="export_summary"),
+    path("import/transactions/", views.import_transactions_csv, name="import_transactions"),
     path("transactions/reset/", views.reset_transactions, name="reset_transactions"),
+    path("staff/spans/", views.staff_spans, name="staff_spans"),
+    path("staff/profiles/", views.staff_profiles, name="staff_profiles"),
+    path("staff/profiles/<str:name>", views.staff_profile_download, name="staff_profile_download"),
     path('profile/', views.profile, name='profile'),
     path("edit-profile/", views.edit_profile, name="edit_profile"),
     path(
@@ -1,7 +1,9 @@
 from django.shortcuts import render, redirect, get_object_or_404
-from django.http import HttpResponse
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseNotModified, JsonResponse, StreamingHttpResponse
 from django.views.decorators.http import require_POST
 from django.contrib.auth.decorators import login_required
+from django.contrib.admin.views.decorators import staff_member_required
+from django.contrib import messages
 from django.contrib.auth import login, update_session_auth_hash
 from django.contrib.auth.models import User
 from django.utils import timezone
@@ -9,12 +11,16 @@ from django.conf import settings
 from django.contrib.auth.password_validation import validate_password
 from django.core.exceptions import ValidationError
 from django.db import DatabaseError
+from django.db import transaction as db_transaction
 from django.db.models import Sum
 from django.middleware.csrf import get_token
-from django.template.loader import get_template
+from django.template.loader import get_template, render_to_string
+from django.urls import reverse
+from django.utils.cache import patch_cache_control
 
 from datetime import date, timedelta
 import csv
+import hashlib
 import json
 import random
 
@@ -26,8 +32,10 @@ from .models import (
     Transaction,
     Profile,
     EmailOTP,
+    EmailOutbox,
 )
-from .services.email_sender import send_app_email
+from .services.outbox import queue_app_email
+from .services.imports import ImportFormatError, import_transactions, text_lines
 from .services.analytics import (
     aggregate_totals,
     build_budget_summary,
@@ -37,11 +45,33 @@ from .services.analytics import (
     build_insights,
     build_monthly_trend,
     category_expense_breakdown,
+    load_analytics_cube,
+)
+from .services.categorization import KEYWORD_CATEGORY_MAP
+from .services.learned_categorizer import (
+    learn_changed,
+    learn_created,
+    learn_deleted,
+    predict_category,
+    rebuild_model,
+)
+from .services.exports import iter_transaction_csv
+from .services.filters import apply_filters, parse_filters, resolve_budget_month
+from .services.money import format_currency, format_rupees, to_paise
+from .services.pagination import paginate_transactions
+from .services.recurring import generate_recurring_transactions, occurrence_dates, occurrence_filter
+from .services.rollups import (
+    affected_months,
+    rebuild_months,
+    record_changed,
+    record_created,
+    record_deleted,
+    rollup_key,
 )
-from .services.categorization import KEYWORD_CATEGORY_MAP, suggest_category
-from .services.filters import apply_filters, apply_sort, parse_filters, resolve_budget_month
-from .services.recurring import generate_recurring_transactions, iter_occurrence_dates
 from .services.prediction_service import build_prediction_summary
+from .services.instrumentation import recent_requests, span
+from .services.profiling import list_profiles, profile_file
+from .services.dashboard_cache import bump_data_version, dashboard_cache, dashboard_cache_key, get_data_version
 
 import logging
 
@@ -76,65 +106,127 @@ def _redirect_to_next(request, fallback="home"):
     return redirect(fallback)
 
 
-def _build_dashboard_context(request):
-    user = request.user
-    filters = parse_filters(request)
-    budget_month = resolve_budget_month(filters)
-    selected_month = filters.month.strftime("%Y-%m") if filters.month else ""
-    trend_anchor = filters.month or filters.end_date or timezone.localdate()
-
-    generate_recurring_transactions(user, timezone.localdate())
+def _transactions_page_url(request, cursor):
+    if not cursor:
+        return ""
+    query = request.GET.copy()
+    query["cursor"] = cursor
+    return f"{reverse('transactions_page')}?{query.urlencode()}"
 
-    base_qs = Transaction.objects.filter(user=user)
-    filtered_qs = apply_filters(base_qs, filters)
-    transactions = apply_sort(filtered_qs, filters)
 
-    totals = aggregate_totals(filtered_qs)
-    category_breakdown = category_expense_breakdown(filtered_qs)
-    category_chart = build_category_chart_data(category_breakdown)
+PREDICTION_RISK_LABELS = {
+    "high": "High Risk",
+    "under": "Under-utilizing",
+    "healthy": "Healthy",
+    "insufficient": "Insufficient Data",
+}
 
-    trend_qs = base_qs
-    if filters.category:
-        trend_qs = trend_qs.filter(category=filters.category)
-    if filters.payment_mode:
-        trend_qs = trend_qs.filter(payment_mode=filters.payment_mode)
-    trend_chart = build_monthly_trend(trend_qs, trend_anchor)
 
-    income_expense_chart = build_income_expense_chart(totals)
-    budget_summary = build_budget_summary(user, budget_month)
-    category_budget_rows = build_category_budget_rows(user, budget_month)
-    insights = build_insights(user, budget_month)
+def _build_dashboard_analytics(user, filters, budget_month):
+    # Charts, insights and the prediction load separately (dashboard_section).
+    cube = load_analytics_cube(user, filters)
+    totals = cube.totals(category=filters.category, payment_mode=filters.payment_mode, windowed=True)
 
-    overall_totals = aggregate_totals(base_qs)
-    current_savings = overall_totals.balance
-    goals = SavingsGoal.objects.filter(user=user).order_by("created_at")
+    current_savings = cube.totals().balance
     goal_rows = []
-    for goal in goals:
-        target = goal.target_amount or 0
-        progress = (current_savings / target * 100) if target else 0
-        progress = max(0, min(progress, 100))
-        remaining = max(target - current_savings, 0)
-        goal_rows.append({
-            "id": goal.id,
-            "name": goal.name,
-            "target": target,
-            "progress": progress,
-            "remaining": remaining,
-        })
-
-    recurring_items = RecurringTransaction.objects.filter(user=user).order_by("-created_at")
-    prediction_summary = build_prediction_summary(user, timezone.localdate())
+    with span("dashboard.goals"):
+        for goal in SavingsGoal.objects.filter(user=user).order_by("created_at"):
+            target = goal.target_amount or 0
+            progress = (current_savings / target * 100) if target else 0
+            progress = max(0, min(progress, 100))
+            remaining = max(target - current_savings, 0)
+            goal_rows.append({
+                "id": goal.id,
+                "name": goal.name,
+                "target": target,
+                "progress": progress,
+                "remaining": remaining,
+            })
 
     return {
-        "transactions": transactions,
         "total_income": totals.total_income,
         "total_expense": totals.total_expense,
         "balance": totals.balance,
         "online_balance": totals.online_balance,
         "cash_balance": totals.cash_balance,
+        "budget_summary": build_budget_summary(user, budget_month, cube),
+        "category_budget_rows": build_category_budget_rows(user, budget_month, cube),
+        "goals": goal_rows,
+        "current_savings": current_savings,
+    }
+
+
+def _build_dashboard_charts(user, filters, trend_anchor):
+    cube = load_analytics_cube(user, filters)
+    totals = cube.totals(category=filters.category, payment_mode=filters.payment_mode, windowed=True)
+    breakdown = category_expense_breakdown(cube, category=filters.category, payment_mode=filters.payment_mode)
+    return {
+        "category": build_category_chart_data(breakdown),
+        "trend": build_monthly_trend(cube, trend_anchor, category=filters.category, payment_mode=filters.payment_mode),
+        "income_expense": build_income_expense_chart(totals),
+    }
+
+
+def _build_dashboard_insights(user, filters, budget_month):
+    return {
+        "month": budget_month.isoformat(),
+        "items": build_insights(load_analytics_cube(user, filters), budget_month),
+    }
+
+
+def _build_dashboard_prediction(user, today):
+    prediction = build_prediction_summary(user, today)
+    return {
+        "month": prediction.month.isoformat(),
+        "month_label": prediction.month.strftime("%B %Y"),
+        "predicted_expense": prediction.predicted_expense,
+        "predicted_display": format_currency(prediction.predicted_expense),
+        "risk_level": prediction.risk_level,
+        "risk_label": PREDICTION_RISK_LABELS.get(prediction.risk_level, "Healthy"),
+        "explanation": prediction.explanation,
+    }
+
+
+def _section_query(request) -> str:
+    # Sections ignore the sort and the page cursor; dropping them lets the
+    # browser reuse one cached response across both.
+    query = request.GET.copy()
+    for name in ("sort", "cursor"):
+        query.pop(name, None)
+    return query.urlencode()
+
+
+def _build_dashboard_context(request):
+    user = request.user
+    filters = parse_filters(request)
+    budget_month = resolve_budget_month(filters)
+    selected_month = filters.month.strftime("%Y-%m") if filters.month else ""
+    today = timezone.localdate()
+
+    # The materialize_recurring job keeps watermarks current; this only
+    # catches up series that are still due, usually a single empty SELECT.
+    with span("dashboard.recurring"):
+        if getattr(settings, "RECURRING_GENERATE_ON_VIEW", True) and generate_recurring_transactions(user, today):
+            bump_data_version(user)
+
+    with span("dashboard.transactions"):
+        transaction_page = paginate_transactions(apply_filters(Transaction.objects.filter(user=user), filters), filters)
+    with span("dashboard.analytics"):
+        analytics = dashboard_cache.get_or_build(
+            dashboard_cache_key(user, filters, today),
+            lambda: _build_dashboard_analytics(user, filters, budget_month),
+        )
+
+    recurring_items = RecurringTransaction.objects.filter(user=user).order_by("-created_at")
+
+    return {
+        **analytics,
+        "transactions": transaction_page.rows,
+        "transactions_next_url": _transactions_page_url(request, transaction_page.next_cursor),
         "selected_month": selected_month,
         "filters": filters,
         "filter_query": request.GET.urlencode(),
+        "section_query": _section_query(request),
         "has_filters": any([
             filters.month,
             filters.start_date,
@@ -143,28 +235,12 @@ def _build_dashboard_context(request):
             filters.payment_mode,
             filters.sort != "date_desc",
         ]),
-        "category_chart": category_chart,
-        "trend_chart": trend_chart,
-        "income_expense_chart": income_expense_chart,
-        "category_breakdown": category_breakdown,
         "budget_month": budget_month,
-        "budget_summary": budget_summary,
-        "category_budget_rows": category_budget_rows,
-        "insights": insights,
-        "goals": goal_rows,
-        "current_savings": current_savings,
         "recurring_items": recurring_items,
         "category_options": Transaction.CATEGORY_CHOICES,
         "payment_options": Transaction.PAYMENT_CHOICES,
         "type_options": Transaction.TYPE_CHOICES,
         "keyword_map": KEYWORD_CATEGORY_MAP,
-        "prediction": prediction_summary,
-        "prediction_risk_label": {
-            "high": "High Risk",
-            "under": "Under-utilizing",
-            "healthy": "Healthy",
-            "insufficient": "Insufficient Data",
-        }.get(prediction_summary.risk_level, "Healthy"),
         "weekday_options": [
             (0, "Mon"),
             (1, "Tue"),
@@ -178,7 +254,8 @@ def _build_dashboard_context(request):
 
 
 def _send_email(to_email, subject, body):
-    return send_app_email(to_email, subject, body)
+    # OTPs jump the outbox queue ahead of behavior emails.
+    return queue_app_email(to_email, subject, body, priority=EmailOutbox.PRIORITY_OTP)
 
 
 def _temporary_data_error_message(exc):
@@ -324,7 +401,72 @@ def index(request):
     if not request.user.is_authenticated:
         return render(request, "index.html", _guest_context(selected_month))
 
-    return render(request, "index.html", _build_dashboard_context(request))
+    with span("dashboard.context"):
+        context = _build_dashboard_context(request)
+    with span("dashboard.render"):
+        return render(request, "index.html", context)
+
+
+DASHBOARD_SECTIONS = ("charts", "insights", "prediction")
+
+
+@login_required
+def dashboard_section(request, section):
+    """JSON for one deferred dashboard section, filtered like the dashboard.
+
+    The response carries an ETag derived from the user's data version, the
+    day and the filters, so a reload revalidates with a 304 instead of
+    recomputing or resending anything.
+    """
+    if section not in DASHBOARD_SECTIONS:
+        raise Http404("Unknown dashboard section")
+    user = request.user
+    filters = parse_filters(request)
+    today = timezone.localdate()
+    if section == "prediction":
+        # Independent of the filters: one entry per user and day.
+        key = (user.pk, get_data_version(user), today, section)
+    else:
+        key = (*dashboard_cache_key(user, filters, today), section)
+
+    etag = '"%s"' % hashlib.sha1(repr(key).encode()).hexdigest()[:24]
+    if etag in request.headers.get("If-None-Match", ""):
+        response = HttpResponseNotModified()
+    else:
+        builders = {
+            "charts": lambda: _build_dashboard_charts(user, filters, filters.month or filters.end_date or today),
+            "insights": lambda: _build_dashboard_insights(user, filters, resolve_budget_month(filters)),
+            "prediction": lambda: _build_dashboard_prediction(user, today),
+        }
+        with span(f"dashboard.{section}"):
+            data = dashboard_cache.get_or_build(key, builders[section])
+        response = JsonResponse(data, json_dumps_params={"separators": (",", ":"), "ensure_ascii": False})
+    response["ETag"] = etag
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+@staff_member_required
+def staff_spans(request):
+    """Span breakdowns of the most recent requests (needs REQUEST_SPANS)."""
+    return JsonResponse({"enabled": bool(getattr(settings, "REQUEST_SPANS", False)), "requests": recent_requests()})
+
+
+@staff_member_required
+def staff_profiles(request):
+    """Stored request profiles, newest first (profile with ?_profile=1)."""
+    profiles = list_profiles()
+    for entry in profiles:
+        entry["urls"] = [reverse("staff_profile_download", args=[name]) for name in entry["files"]]
+    return JsonResponse({"profiles": profiles})
+
+
+@staff_member_required
+def staff_profile_download(request, name):
+    path = profile_file(name)
+    if path is None:
+        raise Http404("No such profile")
+    return FileResponse(open(path, "rb"), as_attachment=True, filename=name)
 
 
 def get_started(request):
@@ -344,7 +486,7 @@ def get_started(request):
 def create_transaction(request):
     amount_raw = request.POST.get("amount") or "0"
     try:
-        amount = float(amount_raw)
+        amount = to_paise(amount_raw)
     except ValueError:
         amount = 0
 
@@ -354,7 +496,7 @@ def create_transaction(request):
     category = request.POST.get("category") or "other"
     description = (request.POST.get("description") or "").strip()
     if category == "auto":
-        category = suggest_category(description) or "other"
+        category = predict_category(request.user, description) or "other"
 
     valid_categories = {choice[0] for choice in Transaction.CATEGORY_CHOICES}
     if category not in valid_categories:
@@ -375,32 +517,54 @@ def create_transaction(request):
     except ValueError:
         trans_date = timezone.localdate()
 
-    Transaction.objects.create(
-        user=request.user,
-        type=trans_type,
-        amount=amount,
-        category=category,
-        payment_mode=payment_mode,
-        date=trans_date,
-        description=description,
-    )
+    with db_transaction.atomic():
+        item = Transaction.objects.create(
+            user=request.user,
+            type=trans_type,
+            amount=amount,
+            category=category,
+            payment_mode=payment_mode,
+            date=trans_date,
+            description=description,
+        )
+        record_created(item)
+        learn_created(item)
+    bump_data_version(request.user)
     return _redirect_to_next(request)
 
 
+@login_required
+def transactions_page(request):
+    filters = parse_filters(request)
+    page = paginate_transactions(
+        apply_filters(Transaction.objects.filter(user=request.user), filters),
+        filters,
+        cursor=request.GET.get("cursor"),
+    )
+    html = render_to_string("tracker/_transaction_rows.html", {"transactions": page.rows}, request=request)
+    return JsonResponse({
+        "html": html,
+        "next_url": _transactions_page_url(request, page.next_cursor),
+    })
+
+
 @login_required
 @require_POST
 def edit_transaction(request, id):
     transaction = get_object_or_404(Transaction, id=id, user=request.user)
-    amount_raw = request.POST.get("amount") or transaction.amount
+    old_key = rollup_key(transaction)
+    old_amount = transaction.amount
+    old_description, old_category = transaction.description, transaction.category
+    amount_raw = request.POST.get("amount")
     try:
-        amount = float(amount_raw)
+        amount = to_paise(amount_raw) if amount_raw else transaction.amount
     except ValueError:
         amount = transaction.amount
 
     category = request.POST.get("category") or transaction.category
     description = (request.POST.get("description") or transaction.description or "").strip()
     if category == "auto":
-        category = suggest_category(description) or transaction.category
+        category = predict_category(request.user, description) or transaction.category
 
     valid_categories = {choice[0] for choice in Transaction.CATEGORY_CHOICES}
     if category not in valid_categories:
@@ -427,7 +591,11 @@ def edit_transaction(request, id):
     transaction.payment_mode = payment_mode
     transaction.date = trans_date
     transaction.description = description
-    transaction.save()
+    with db_transaction.atomic():
+        transaction.save()
+        record_changed(request.user.id, old_key, old_amount, transaction)
+        learn_changed(request.user.id, old_description, old_category, transaction)
+    bump_data_version(request.user)
     return _redirect_to_next(request)
 
 
@@ -438,7 +606,12 @@ def edit_transaction(request, id):
 @login_required
 @require_POST
 def delete_transaction(request, id):
-    get_object_or_404(Transaction, id=id, user=request.user).delete()
+    item = get_object_or_404(Transaction, id=id, user=request.user)
+    with db_transaction.atomic():
+        item.delete()
+        record_deleted(item)
+        learn_deleted(item)
+    bump_data_version(request.user)
     return _redirect_to_next(request)
 
 
@@ -459,7 +632,7 @@ def set_monthly_budget(request):
 
     amount_raw = request.POST.get("total_budget") or "0"
     try:
-        amount = float(amount_raw)
+        amount = to_paise(amount_raw)
     except ValueError:
         amount = 0
 
@@ -471,6 +644,7 @@ def set_monthly_budget(request):
             month=budget_month,
             defaults={"total_amount": amount},
         )
+    bump_data_version(request.user)
     return _redirect_to_next(request)
 
 
@@ -492,7 +666,7 @@ def set_category_budget(request):
 
     amount_raw = request.POST.get("amount") or "0"
     try:
-        amount = float(amount_raw)
+        amount = to_paise(amount_raw)
     except ValueError:
         amount = 0
 
@@ -505,6 +679,7 @@ def set_category_budget(request):
             category=category,
             defaults={"amount": amount},
         )
+    bump_data_version(request.user)
     return _redirect_to_next(request)
 
 
@@ -517,7 +692,7 @@ def set_category_budget(request):
 def create_recurring(request):
     amount_raw = request.POST.get("amount") or "0"
     try:
-        amount = float(amount_raw)
+        amount = to_paise(amount_raw)
     except ValueError:
         amount = 0
     if amount <= 0:
@@ -572,6 +747,7 @@ def create_recurring(request):
         weekdays=weekdays_value,
         active=True,
     )
+    bump_data_version(request.user)
     return _redirect_to_next(request)
 
 
@@ -579,6 +755,7 @@ def create_recurring(request):
 @require_POST
 def edit_recurring(request, id):
     series = get_object_or_404(RecurringTransaction, id=id, user=request.user)
+    old_schedule = (series.start_date, series.repeat, series.weekdays)
     old_values = {
         "type": series.type,
         "amount": series.amount,
@@ -588,9 +765,9 @@ def edit_recurring(request, id):
         "start_date": series.start_date,
         "end_date": series.end_date,
     }
-    amount_raw = request.POST.get("amount") or series.amount
+    amount_raw = request.POST.get("amount")
     try:
-        amount = float(amount_raw)
+        amount = to_paise(amount_raw) if amount_raw else series.amount
     except ValueError:
         amount = series.amount
 
@@ -639,66 +816,72 @@ def edit_recurring(request, id):
     series.repeat = repeat
     series.description = description
     series.weekdays = weekdays_value
-    series.save()
-
-    generated = Transaction.objects.filter(user=request.user, recurring_source=series)
-
-    sync_end = series.end_date or timezone.localdate()
-    occurrence_dates = list(iter_occurrence_dates(series, series.start_date, sync_end))
-    if occurrence_dates:
-        legacy = Transaction.objects.filter(
-            user=request.user,
-            recurring_source__isnull=True,
-            date__in=occurrence_dates,
-            type=old_values["type"],
-            amount=old_values["amount"],
-            category=old_values["category"],
-            payment_mode=old_values["payment_mode"],
+    if (series.start_date, series.repeat, series.weekdays) != old_schedule:
+        # The watermark only covers the old schedule: rescan from the new
+        # start so moved or added dates before it are backfilled.
+        series.last_generated_on = None
+    with db_transaction.atomic():
+        series.save()
+
+        sync_end = series.end_date or timezone.localdate()
+        if occurrence_dates(series, series.start_date, sync_end).size:
+            legacy = Transaction.objects.filter(
+                occurrence_filter(series, series.start_date, sync_end),
+                user=request.user,
+                recurring_source__isnull=True,
+                type=old_values["type"],
+                amount=old_values["amount"],
+                category=old_values["category"],
+                payment_mode=old_values["payment_mode"],
+            )
+            legacy.update(recurring_source=series)
+
+        touched_months = affected_months(Transaction.objects.filter(user=request.user, recurring_source=series))
+
+        generated = Transaction.objects.filter(user=request.user, recurring_source=series)
+        if series.start_date:
+            generated = generated.exclude(date__lt=series.start_date)
+        if series.end_date:
+            generated = generated.exclude(date__gt=series.end_date)
+
+        generated.update(
+            type=series.type,
+            amount=series.amount,
+            category=series.category,
+            payment_mode=series.payment_mode,
+            description=series.description,
         )
-        legacy.update(recurring_source=series)
-
-    generated = Transaction.objects.filter(user=request.user, recurring_source=series)
-    if series.start_date:
-        generated = generated.exclude(date__lt=series.start_date)
-    if series.end_date:
-        generated = generated.exclude(date__gt=series.end_date)
-
-    generated.update(
-        type=series.type,
-        amount=series.amount,
-        category=series.category,
-        payment_mode=series.payment_mode,
-        description=series.description,
-    )
 
-    if series.repeat in ("daily", "weekly"):
-        allowed = set(allowed_weekdays)
-        if not allowed:
-            allowed = {str(series.start_date.weekday())} if series.repeat == "weekly" else {"0", "1", "2", "3", "4", "5", "6"}
-        disallowed = {str(day) for day in range(7)} - allowed
-        if disallowed:
-            django_days = [((int(day) + 1) % 7) + 1 for day in disallowed]
+        if series.repeat in ("daily", "weekly"):
+            allowed = set(allowed_weekdays)
+            if not allowed:
+                allowed = {str(series.start_date.weekday())} if series.repeat == "weekly" else {"0", "1", "2", "3", "4", "5", "6"}
+            disallowed = {str(day) for day in range(7)} - allowed
+            if disallowed:
+                django_days = [((int(day) + 1) % 7) + 1 for day in disallowed]
+                Transaction.objects.filter(
+                    user=request.user,
+                    recurring_source=series,
+                    date__week_day__in=django_days,
+                ).delete()
+
+        if series.start_date:
             Transaction.objects.filter(
                 user=request.user,
                 recurring_source=series,
-                date__week_day__in=django_days,
+                date__lt=series.start_date,
+            ).delete()
+        if series.end_date:
+            Transaction.objects.filter(
+                user=request.user,
+                recurring_source=series,
+                date__gt=series.end_date,
             ).delete()
 
-    if series.start_date:
-        Transaction.objects.filter(
-            user=request.user,
-            recurring_source=series,
-            date__lt=series.start_date,
-        ).delete()
-    if series.end_date:
-        Transaction.objects.filter(
-            user=request.user,
-            recurring_source=series,
-            date__gt=series.end_date,
-        ).delete()
-
+        rebuild_months(request.user, touched_months)
     generate_recurring_transactions(request.user, timezone.localdate())
 
+    bump_data_version(request.user)
     return _redirect_to_next(request)
 
 
@@ -708,12 +891,17 @@ def delete_recurring(request, id):
     series = get_object_or_404(RecurringTransaction, id=id, user=request.user)
     delete_future = request.POST.get("delete_future") == "on"
     if delete_future:
-        Transaction.objects.filter(
+        future = Transaction.objects.filter(
             user=request.user,
             recurring_source=series,
             date__gte=timezone.localdate(),
-        ).delete()
+        )
+        with db_transaction.atomic():
+            months = affected_months(future)
+            future.delete()
+            rebuild_months(request.user, months)
     series.delete()
+    bump_data_version(request.user)
     return _redirect_to_next(request)
 
 
@@ -727,13 +915,14 @@ def create_goal(request):
     name = (request.POST.get("name") or "").strip()
     amount_raw = request.POST.get("target_amount") or "0"
     try:
-        amount = float(amount_raw)
+        amount = to_paise(amount_raw)
     except ValueError:
         amount = 0
     if not name or amount <= 0:
         return _redirect_to_next(request)
 
     SavingsGoal.objects.create(user=request.user, name=name, target_amount=amount)
+    bump_data_version(request.user)
     return _redirect_to_next(request)
 
 
@@ -741,6 +930,7 @@ def create_goal(request):
 @require_POST
 def delete_goal(request, id):
     get_object_or_404(SavingsGoal, id=id, user=request.user).delete()
+    bump_data_version(request.user)
     return _redirect_to_next(request)
 
 
@@ -751,26 +941,67 @@ def delete_goal(request, id):
 @login_required
 def export_transactions(request):
     filters = parse_filters(request)
-    queryset = apply_filters(Transaction.objects.filter(user=request.user), filters).order_by("date")
+    queryset = apply_filters(Transaction.objects.filter(user=request.user), filters).order_by("date", "id")
 
-    response = HttpResponse(content_type="text/csv")
+    response = StreamingHttpResponse(iter_transaction_csv(queryset), content_type="text/csv")
     response["Content-Disposition"] = 'attachment; filename="transactions.csv"'
-    writer = csv.writer(response)
-    writer.writerow(["Date", "Type", "Category", "Payment", "Description", "Amount"])
-
-    for item in queryset:
-        writer.writerow([
-            item.date.isoformat(),
-            item.get_type_display(),
-            item.get_category_display(),
-            item.get_payment_mode_display(),
-            item.description,
-            f"{item.amount:.2f}",
-        ])
-
     return response
 
 
+# Row errors spelled out in the dashboard message; the rest are counted.
+IMPORT_MESSAGE_ERRORS = 5
+
+
+def _report_import(request, result) -> None:
+    messages.success(
+        request,
+        f"Imported {result.created} transactions ({result.auto_categorized} auto-categorized).",
+    )
+    if not result.skipped:
+        return
+    shown = "; ".join(f"line {line}: {message}" for line, message in result.errors[:IMPORT_MESSAGE_ERRORS])
+    more = result.skipped - min(len(result.errors), IMPORT_MESSAGE_ERRORS)
+    messages.warning(
+        request,
+        f"Skipped {result.skipped} of {result.rows} rows: {shown}" + (f" (and {more} more)" if more else ""),
+    )
+
+
+@login_required
+@require_POST
+def import_transactions_csv(request):
+    """Import an uploaded CSV; JSON for API clients, messages for the dashboard form.
+
+    The dashboard form posts ``next``, so the counts and row errors are
+    flashed and the user is sent back to the page they imported from.
+    """
+    from_form = bool(request.POST.get("next"))
+    upload = request.FILES.get("file")
+    error = None
+    if upload is None:
+        error = "Choose a CSV file to import."
+    else:
+        try:
+            result = import_transactions(request.user, text_lines(upload))
+        except (ImportFormatError, UnicodeDecodeError, csv.Error) as exc:
+            error = f"Could not read the CSV: {exc}"
+    if error:
+        if from_form:
+            messages.error(request, error)
+            return _redirect_to_next(request)
+        return JsonResponse({"error": error}, status=400)
+    if from_form:
+        _report_import(request, result)
+        return _redirect_to_next(request)
+    return JsonResponse({
+        "rows": result.rows,
+        "created": result.created,
+        "skipped": result.skipped,
+        "auto_categorized": result.auto_categorized,
+        "errors": [{"line": line, "error": message} for line, message in result.errors],
+    })
+
+
 @login_required
 def export_summary(request):
     filters = parse_filters(request)
@@ -793,9 +1024,9 @@ def export_summary(request):
     writer = csv.writer(response)
 
     writer.writerow(["Summary Type", "Value"])
-    writer.writerow(["Total Income", f"{totals.total_income:.2f}"])
-    writer.writerow(["Total Expense", f"{totals.total_expense:.2f}"])
-    writer.writerow(["Balance", f"{totals.balance:.2f}"])
+    writer.writerow(["Total Income", format_rupees(totals.total_income)])
+    writer.writerow(["Total Expense", format_rupees(totals.total_expense)])
+    writer.writerow(["Balance", format_rupees(totals.balance)])
     writer.writerow(["Savings Rate (%)", f"{savings_rate:.2f}"])
     if top_category:
         label_map = dict(Transaction.CATEGORY_CHOICES)
@@ -813,7 +1044,12 @@ def export_summary(request):
 def reset_transactions(request):
     filters = parse_filters(request)
     queryset = apply_filters(Transaction.objects.filter(user=request.user), filters)
-    queryset.delete()
+    with db_transaction.atomic():
+        months = affected_months(queryset)
+        queryset.delete()
+        rebuild_months(request.user, months)
+        rebuild_model(request.user.id)
+    bump_data_version(request.user)
     return _redirect_to_next(request)
 
 
@@ -877,7 +1113,7 @@ def edit_profile(request):
         if request.FILES.get("image"):
             profile_obj.image = request.FILES["image"]
         try:
-            profile_obj.save()
+            profile_obj.save(update_fields=["full_name", "image", "last_username_change_at"])
         except Exception:
             logger.exception("Profile update failed for user_id=%s", request.user.id)
             next_username_change_at = (